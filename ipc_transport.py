@@ -0,0 +1,788 @@
+"""真实进程间通信传输与基准测试（无Qt/Matplotlib依赖，供spawn子进程导入）
+
+生产者与消费者是两个独立的 multiprocessing 进程，可选五种传输方式：
+  pipe    multiprocessing.Pipe（send_bytes / recv_bytes_into）
+  queue   multiprocessing.Queue（每批pickle一次）
+  shm     multiprocessing.shared_memory 环形缓冲区（固定槽位 + 两个信号量，写入/读出各复制一次）
+  shm_zc  零拷贝共享内存环（生产者原地写槽位，只传递槽位下标，消费者经memoryview/NumPy视图直接读取）
+  socket  Unix域套接字（流式，8字节长度前缀分帧；仅在支持AF_UNIX的平台提供）
+
+每条消息定长 msg_size 字节，前16字节为头部：序号(u64) | 发送时刻(perf_counter_ns, u64)，
+其余为填充负载；batch 条消息拼成一帧发送。消费者按头部时间戳计算端到端延迟
+（perf_counter 基于系统单调时钟，同一台机器上跨进程可比）。
+
+实时模式下两端各自通过状态队列定期（约10次/秒）向界面汇报累计计数：
+  ("sent", 累计消息数, 累计字节数, 最后序号, 时刻ns)
+  ("recv", 累计消息数, 累计字节数, 本期首序号, 本期末序号, 本期延迟直方图计数, 时刻ns)
+时刻均为 perf_counter_ns；延迟直方图见 LatencyHistogram（每条消息都计入，不抽样）。
+"""
+import multiprocessing
+import queue
+import socket
+import struct
+import time
+from collections import deque
+from multiprocessing import shared_memory
+
+import numpy as np
+
+HEADER = struct.Struct("<QQ")  # 序号, 发送时刻ns
+MIN_MSG_SIZE = HEADER.size
+MAX_MSG_SIZE = 4 << 20
+# 一帧（一批消息）的最大字节数，限制共享内存环的槽位大小
+MAX_FRAME_BYTES = 64 << 20
+
+# 向界面汇报的间隔（秒）
+REPORT_INTERVAL = 0.1
+
+TRANSPORTS = ("pipe", "queue", "shm", "shm_zc") + (("socket",) if hasattr(socket, "AF_UNIX") else ())
+TRANSPORT_NAMES = {
+    "pipe": "管道 Pipe",
+    "queue": "队列 Queue",
+    "shm": "共享内存环",
+    "shm_zc": "零拷贝共享内存环",
+    "socket": "Unix套接字",
+}
+
+
+def header_view(buf, msg_size, count):
+    """把 count 条定长消息的缓冲区映射为 (count, 2) 的头部视图 [序号, 时刻ns]（不复制）"""
+    return np.ndarray((count, 2), dtype="<u8", buffer=buf, strides=(msg_size, 8))
+
+
+# ======================== 传输端点 ========================
+# 发送端：send(缓冲区) / close()；接收端：recv_into(缓冲区) → 字节数，对端关闭时抛出EOFError。
+# 帧接口（生产者/消费者进程统一使用）：
+#   发送端 claim(字节数) → 可写缓冲区，写好后 publish(字节数)
+#   接收端 acquire(最大字节数) → 本帧的只读视图，用完后 release_slot()
+# 复制型传输经私有缓冲区实现帧接口，零拷贝环直接返回共享内存槽位的视图。
+# 端点对象可随 Process 参数传给spawn子进程。
+
+POLL_INTERVAL = 0.1  # 阻塞收发的轮询间隔（秒），每次超时检查对端是否仍在
+JOIN_TIMEOUT = 3.0   # 等待子进程退出的上限（秒），超时则terminate
+
+
+class PeerLost(EOFError):
+    """对端进程（或父进程）已退出，或已请求停止，放弃阻塞中的收发"""
+
+
+class Endpoint:
+    """端点公共部分：peer_gone 为对端退出事件（由观察到对端进程结束的父进程置位），
+    stop_event 为停止请求（生产者发送数据时设置；通道满时不再等待消费者腾出空间）
+
+    对端正常结束前已把数据与结束标记送入通道，之后才会被观察到退出，置位不会丢数据。
+    停止请求只中断数据发送：关闭前须清除 stop_event，结束标记只因对端或父进程退出而放弃。
+    """
+    peer_gone = None
+    stop_event = None
+
+    def check_peer(self):
+        for event in (self.peer_gone, self.stop_event):
+            if event is not None and event.is_set():
+                raise PeerLost
+        parent = multiprocessing.parent_process()
+        if parent is not None and not parent.is_alive():
+            raise PeerLost
+
+    def wait_sem(self, sem):
+        while not sem.acquire(timeout=POLL_INTERVAL):
+            self.check_peer()
+
+
+class CopySender(Endpoint):
+    frame = None
+
+    def claim(self, nbytes):
+        if self.frame is None or len(self.frame) != nbytes:
+            self.frame = bytearray(nbytes)
+        return self.frame
+
+    def publish(self, nbytes):
+        self.send(self.frame)
+
+
+class CopyReceiver(Endpoint):
+    frame = None
+
+    def acquire(self, max_bytes):
+        if self.frame is None or len(self.frame) < max_bytes:
+            self.frame = bytearray(max_bytes)
+        return memoryview(self.frame)[:self.recv_into(self.frame)]
+
+    def release_slot(self):
+        pass
+
+
+class PipeSender(CopySender):
+    def __init__(self, conn):
+        self.conn = conn
+
+    def send(self, buf):
+        self.conn.send_bytes(buf)
+
+    def close(self):
+        self.conn.close()
+
+
+class PipeReceiver(CopyReceiver):
+    def __init__(self, conn):
+        self.conn = conn
+
+    def recv_into(self, buf):
+        return self.conn.recv_bytes_into(buf)
+
+    def close(self):
+        self.conn.close()
+
+
+class QueueSender(CopySender):
+    def __init__(self, q):
+        self.q = q
+
+    def put(self, item):
+        while True:
+            try:
+                return self.q.put(item, timeout=POLL_INTERVAL)
+            except queue.Full:
+                self.check_peer()
+
+    def send(self, buf):
+        self.put(bytes(buf))
+
+    def close(self):
+        try:
+            self.put(None)  # 结束标记
+        except PeerLost:
+            self.q.cancel_join_thread()  # 无人读取，不再等待缓冲数据写出
+        self.q.close()
+        self.q.join_thread()
+
+
+class QueueReceiver(CopyReceiver):
+    def __init__(self, q):
+        self.q = q
+
+    def recv_into(self, buf):
+        while True:
+            try:
+                data = self.q.get(timeout=POLL_INTERVAL)
+                break
+            except queue.Empty:
+                self.check_peer()
+        if data is None:
+            raise EOFError
+        buf[:len(data)] = data
+        return len(data)
+
+    def close(self):
+        self.q.close()
+
+
+_LENGTH = struct.Struct("<Q")
+_EOF_LENGTH = (1 << 64) - 1
+
+
+class SocketSender(CopySender):
+    def __init__(self, sock):
+        self.sock = sock
+
+    def send(self, buf):
+        self.sock.sendall(_LENGTH.pack(len(buf)))
+        self.sock.sendall(buf)
+
+    def close(self):
+        self.sock.close()
+
+
+class SocketReceiver(CopyReceiver):
+    def __init__(self, sock):
+        self.sock = sock
+        self.length = bytearray(_LENGTH.size)
+
+    def _recv_exact(self, view):
+        while len(view):
+            n = self.sock.recv_into(view)
+            if not n:
+                raise EOFError
+            view = view[n:]
+
+    def recv_into(self, buf):
+        self._recv_exact(memoryview(self.length))
+        nbytes, = _LENGTH.unpack(self.length)
+        self._recv_exact(memoryview(buf)[:nbytes])
+        return nbytes
+
+    def close(self):
+        self.sock.close()
+
+
+class ShmRing(Endpoint):
+    """共享内存环形缓冲区：slots 个定长槽位，每槽 8字节长度 + slot_size 数据
+
+    empty/full 两个信号量计数空槽与满槽（单生产者单消费者，读写下标各自私有）。
+    """
+
+    def __init__(self, name, slots, slot_size, empty, full):
+        self.name = name
+        self.slots = slots
+        self.slot_size = slot_size
+        self.stride = _LENGTH.size + slot_size
+        self.empty = empty
+        self.full = full
+        self.shm = None
+        self.index = 0
+
+    @staticmethod
+    def nbytes(slots, slot_size):
+        return slots * (_LENGTH.size + slot_size)
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state["shm"] = None
+        return state
+
+    def attach(self):
+        # 子进程与父进程共用资源跟踪器，按名称挂接即可；由创建方负责unlink
+        if self.shm is None:
+            self.shm = shared_memory.SharedMemory(name=self.name)
+        return self.shm.buf
+
+    def slot(self, index):
+        """第index个槽位的起始偏移（长度字段），数据紧随其后"""
+        return index * self.stride
+
+    def release(self):
+        if self.shm is not None:
+            self.shm.close()
+            self.shm = None
+
+
+class ShmSender(CopySender, ShmRing):
+    def send(self, buf):
+        self.wait_sem(self.empty)
+        shm_buf = self.attach()
+        base = self.slot(self.index)
+        start = base + _LENGTH.size
+        shm_buf[start:start + len(buf)] = buf
+        _LENGTH.pack_into(shm_buf, base, len(buf))
+        self.index = (self.index + 1) % self.slots
+        self.full.release()
+
+    def close(self):
+        try:
+            self.wait_sem(self.empty)
+            _LENGTH.pack_into(self.attach(), self.slot(self.index), _EOF_LENGTH)
+            self.full.release()
+        except PeerLost:
+            pass
+        self.release()
+
+
+class ShmReceiver(CopyReceiver, ShmRing):
+    def recv_into(self, buf):
+        self.wait_sem(self.full)
+        shm_buf = self.attach()
+        base = self.slot(self.index)
+        nbytes, = _LENGTH.unpack_from(shm_buf, base)
+        if nbytes == _EOF_LENGTH:
+            raise EOFError
+        start = base + _LENGTH.size
+        buf[:nbytes] = shm_buf[start:start + nbytes]
+        self.index = (self.index + 1) % self.slots
+        self.empty.release()
+        return nbytes
+
+    def close(self):
+        self.release()
+
+
+# 零拷贝环的控制块：累计发布槽数 | 累计归还槽数（各自单写者），供界面读取槽位占用
+_COUNTERS = struct.Struct("<QQ")
+_INDEX = struct.Struct("<QQ")  # 槽位下标, 字节数
+ZC_CONTROL_SIZE = 64
+
+
+class ZeroCopyRing(ShmRing):
+    """零拷贝共享内存环：生产者在槽位内原地写消息，跨进程只传递 (槽位下标, 字节数)
+
+    空槽由 empty 信号量计数，已发布的下标经单向管道按序送达消费者；
+    管道关闭即为EOF。槽位按64字节对齐，数据区前为控制块（发布/归还计数）。
+    """
+
+    def __init__(self, name, slots, slot_size, empty, conn):
+        super().__init__(name, slots, slot_size, empty, None)
+        self.stride = -(-slot_size // 64) * 64
+        self.conn = conn
+        self.count = 0
+
+    @staticmethod
+    def nbytes(slots, slot_size):
+        return ZC_CONTROL_SIZE + slots * (-(-slot_size // 64) * 64)
+
+    def slot(self, index):
+        return ZC_CONTROL_SIZE + index * self.stride
+
+    def close(self):
+        self.conn.close()
+        self.release()
+
+
+class ZeroCopySender(ZeroCopyRing):
+    def claim(self, nbytes):
+        """等待空闲槽位，返回其前nbytes字节的可写视图（写好后调用publish，之后不可再写）"""
+        self.wait_sem(self.empty)
+        base = self.slot(self.index)
+        return self.attach()[base:base + nbytes]
+
+    def publish(self, nbytes):
+        # 先计数再发下标，保证界面读到的 发布数 >= 归还数
+        self.count += 1
+        _LENGTH.pack_into(self.attach(), 0, self.count)
+        self.conn.send_bytes(_INDEX.pack(self.index, nbytes))
+        self.index = (self.index + 1) % self.slots
+
+    def send(self, buf):
+        self.claim(len(buf))[:] = buf
+        self.publish(len(buf))
+
+
+class ZeroCopyReceiver(ZeroCopyRing):
+    def __init__(self, name, slots, slot_size, empty, conn):
+        super().__init__(name, slots, slot_size, empty, conn)
+        self.message = bytearray(_INDEX.size)
+
+    def acquire(self, max_bytes=None):
+        """等待下一个已发布槽位，返回其只读视图（对端关闭时抛出EOFError）"""
+        self.conn.recv_bytes_into(self.message)
+        self.index, nbytes = _INDEX.unpack(self.message)
+        base = self.slot(self.index)
+        return self.attach()[base:base + nbytes].toreadonly()
+
+    def release_slot(self):
+        """归还当前槽位（此前取得的视图不可再用）"""
+        self.count += 1
+        _LENGTH.pack_into(self.attach(), _LENGTH.size, self.count)
+        self.empty.release()
+
+    def recv_into(self, buf):
+        view = self.acquire()
+        nbytes = len(view)
+        buf[:nbytes] = view
+        view.release()
+        self.release_slot()
+        return nbytes
+
+
+class Transport:
+    """在父进程中创建一对端点：sender/receiver 交给子进程，
+
+    子进程启动后调用 detach() 关闭父进程持有的副本（管道/套接字依赖它产生EOF），
+    两端都结束后调用 release() 释放共享内存。父进程观察到某一端的进程退出后置位
+    sender_gone/receiver_gone，另一端阻塞中的收发随即放弃（对端被终止时不会永久挂起）。
+    """
+
+    def __init__(self, kind, frame_bytes, slots=8):
+        if kind not in TRANSPORTS:
+            raise ValueError(f"不支持的传输方式：{kind}（可选：{', '.join(TRANSPORTS)}）")
+        if frame_bytes > MAX_FRAME_BYTES:
+            raise ValueError(f"单帧{frame_bytes}字节超过上限{MAX_FRAME_BYTES}字节，请减小消息大小或批量")
+        self.kind = kind
+        self.slots = slots
+        self.shm = None
+        if kind == "pipe":
+            recv_conn, send_conn = multiprocessing.Pipe(duplex=False)
+            self.sender, self.receiver = PipeSender(send_conn), PipeReceiver(recv_conn)
+        elif kind == "queue":
+            q = multiprocessing.Queue(maxsize=slots)
+            self.sender, self.receiver = QueueSender(q), QueueReceiver(q)
+        elif kind == "socket":
+            a, b = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sender, self.receiver = SocketSender(a), SocketReceiver(b)
+        elif kind == "shm":
+            self.shm = shared_memory.SharedMemory(create=True, size=ShmRing.nbytes(slots, frame_bytes))
+            args = (self.shm.name, slots, frame_bytes,
+                    multiprocessing.Semaphore(slots), multiprocessing.Semaphore(0))
+            self.sender, self.receiver = ShmSender(*args), ShmReceiver(*args)
+        else:
+            self.shm = shared_memory.SharedMemory(create=True, size=ZeroCopyRing.nbytes(slots, frame_bytes))
+            _COUNTERS.pack_into(self.shm.buf, 0, 0, 0)
+            recv_conn, send_conn = multiprocessing.Pipe(duplex=False)
+            empty = multiprocessing.Semaphore(slots)
+            self.sender = ZeroCopySender(self.shm.name, slots, frame_bytes, empty, send_conn)
+            self.receiver = ZeroCopyReceiver(self.shm.name, slots, frame_bytes, empty, recv_conn)
+        self.sender_gone = multiprocessing.Event()
+        self.receiver_gone = multiprocessing.Event()
+        self.sender.peer_gone = self.receiver_gone
+        self.receiver.peer_gone = self.sender_gone
+
+    def detach(self):
+        if self.kind in ("pipe", "socket", "shm_zc"):
+            self.sender.close()
+            self.receiver.close()
+
+    def occupancy(self):
+        """零拷贝环的 (累计发布槽数, 累计归还槽数)；其他传输方式返回None"""
+        if self.kind != "shm_zc" or self.shm is None:
+            return None
+        return _COUNTERS.unpack_from(self.shm.buf, 0)
+
+    def release(self):
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+
+# ======================== 计量：滑动窗口速率与延迟直方图 ========================
+class SlidingRate:
+    """滑动窗口速率：记录 (时刻ns, 累计计数)，速率按窗口内首尾样本计算"""
+
+    def __init__(self, window):
+        self.window_ns = int(window * 1e9)
+        self.samples = deque()
+
+    def add(self, t_ns, count):
+        samples = self.samples
+        samples.append((t_ns, count))
+        # 保留一个不晚于窗口起点的样本作为基准
+        while len(samples) > 2 and samples[1][0] <= t_ns - self.window_ns:
+            samples.popleft()
+
+    def rate(self):
+        if len(self.samples) < 2:
+            return 0.0
+        (t0, c0), (t1, c1) = self.samples[0], self.samples[-1]
+        return (c1 - c0) * 1e9 / (t1 - t0) if t1 > t0 else 0.0
+
+
+class LatencyHistogram:
+    """HDR风格对数-线性直方图（纳秒）
+
+    小于 2·SUB 的值逐一计数；其上每个2的幂区间均分为 SUB 个子桶，相对误差不超过 1/SUB。
+    计数为固定长度的int64数组，可跨进程传递后直接相加。
+    """
+    SUB_BITS = 5
+    SUB = 1 << SUB_BITS
+    MAX_BITS = 40  # 约18分钟，更大的值计入最后一个桶
+    SIZE = SUB * (MAX_BITS - SUB_BITS + 1)
+
+    def __init__(self):
+        self.counts = np.zeros(self.SIZE, dtype=np.int64)
+
+    @classmethod
+    def bucket_counts(cls, values):
+        """把一批纳秒值映射为直方图计数数组"""
+        v = np.clip(np.asarray(values, dtype=np.int64), 0, (1 << cls.MAX_BITS) - 1)
+        bits = np.frexp(v.astype(np.float64))[1]
+        shift = np.maximum(bits - cls.SUB_BITS - 1, 0)
+        return np.bincount(cls.SUB * shift + (v >> shift), minlength=cls.SIZE)
+
+    @classmethod
+    def bucket_bounds(cls):
+        """各桶的 (下界, 宽度)，单位纳秒"""
+        idx = np.arange(cls.SIZE)
+        shift = np.maximum(idx // cls.SUB - 1, 0)
+        return (idx - cls.SUB * shift) << shift, 1 << shift
+
+    def record(self, values):
+        self.counts += self.bucket_counts(values)
+
+    def add(self, counts):
+        self.counts += counts
+
+    def subtract(self, counts):
+        self.counts -= counts
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    def percentiles(self, qs):
+        """分位数（qs为0~100），取所在桶的中点；无数据时返回全0"""
+        total = self.counts.sum()
+        if not total:
+            return np.zeros(len(qs))
+        low, width = self.bucket_bounds()
+        cum = np.cumsum(self.counts)
+        idx = np.searchsorted(cum, np.asarray(qs, dtype=np.float64) / 100 * total)
+        idx = np.minimum(idx, self.SIZE - 1)
+        return low[idx] + width[idx] / 2
+
+
+# ======================== 实时模式：生产者/消费者进程 ========================
+def close_quietly(endpoint):
+    """关闭端点；对端已退出时忽略"""
+    try:
+        endpoint.close()
+    except (EOFError, OSError):
+        pass
+
+
+def producer_main(endpoint, msg_size, batch, pace, stop, status):
+    """生产者进程：按 pace.value（批/秒，0为不限速）节奏发送，直到 stop 置位后关闭端点"""
+    frame = msg_size * batch
+    buf = headers = None
+    offsets = np.arange(batch, dtype=np.uint64)
+    seq = sent = sent_bytes = 0
+    next_due = time.perf_counter()
+    last_report = 0.0
+    endpoint.stop_event = stop
+    try:
+        while not stop.is_set():
+            rate = pace.value
+            if rate > 0:
+                now = time.perf_counter()
+                if now < next_due:
+                    time.sleep(min(next_due - now, 0.05))
+                    continue
+                # 落后超过1秒时不再追赶，避免倍速调低后集中突发
+                next_due = max(next_due + 1 / rate, now - 1)
+            # 只写头部：零拷贝环中负载原地留在槽位，不经过任何复制
+            buf = endpoint.claim(frame)
+            headers = header_view(buf, msg_size, batch)
+            headers[:, 0] = offsets + seq
+            headers[:, 1] = time.perf_counter_ns()
+            buf = headers = None
+            endpoint.publish(frame)
+            seq += batch
+            sent += batch
+            sent_bytes += frame
+            now = time.perf_counter()
+            if now - last_report >= REPORT_INTERVAL:
+                status.put(("sent", sent, sent_bytes, seq - 1, time.perf_counter_ns()))
+                last_report = now
+    except (BrokenPipeError, EOFError, OSError):
+        pass  # 消费者已退出
+    finally:
+        buf = headers = None
+        # 停止请求不等于对端丢失：已发送的数据与结束标记仍须送达消费者
+        endpoint.stop_event = None
+        close_quietly(endpoint)
+        status.put(("sent", sent, sent_bytes, seq - 1, time.perf_counter_ns()))
+
+
+def consumer_main(endpoint, msg_size, batch, status):
+    """消费者进程：接收直到对端关闭（EOF），用头部时间戳统计延迟并定期汇报"""
+    frame = msg_size * batch
+    received = received_bytes = 0
+    first_seq = None
+    last_seq = -1
+    hist = LatencyHistogram()
+    last_report = 0.0
+
+    def report():
+        status.put(("recv", received, received_bytes, first_seq, last_seq, hist.counts.copy(),
+                    time.perf_counter_ns()))
+        hist.counts[:] = 0
+
+    try:
+        while True:
+            try:
+                view = endpoint.acquire(frame)
+            except EOFError:
+                break
+            now_ns = time.perf_counter_ns()
+            nbytes = len(view)
+            count = nbytes // msg_size
+            headers = header_view(view, msg_size, count)
+            hist.record(now_ns - headers[:, 1].astype(np.int64))
+            if first_seq is None:
+                first_seq = int(headers[0, 0])
+            last_seq = int(headers[count - 1, 0])
+            view = headers = None
+            endpoint.release_slot()
+            received += count
+            received_bytes += nbytes
+            now = time.perf_counter()
+            if now - last_report >= REPORT_INTERVAL:
+                report()
+                first_seq = None
+                last_report = now
+    finally:
+        endpoint.close()
+        report()
+
+
+# ======================== 基准测试 ========================
+DEFAULT_SIZES = (64, 512, 4 << 10, 32 << 10, 256 << 10, 1 << 20, 4 << 20)
+DEFAULT_BATCHES = (1, 16, 256)
+# 每个用例的发送量：约 BENCH_BYTES 字节，批数限制在 [BENCH_MIN_FRAMES, BENCH_MAX_FRAMES]
+BENCH_BYTES = 32 << 20
+BENCH_MIN_FRAMES = 20
+BENCH_MAX_FRAMES = 5000
+# 基准测试中单帧上限（超过的 消息大小×批量 组合跳过）
+BENCH_MAX_FRAME_BYTES = 4 << 20
+
+
+def bench_cases(sizes=DEFAULT_SIZES, batches=DEFAULT_BATCHES):
+    """[(消息大小, 批量, 帧数)]，两端按同一列表依次收发"""
+    cases = []
+    for size in sizes:
+        for batch in batches:
+            frame = size * batch
+            if frame > BENCH_MAX_FRAME_BYTES:
+                continue
+            frames = min(max(BENCH_BYTES // frame, BENCH_MIN_FRAMES), BENCH_MAX_FRAMES)
+            cases.append((size, batch, frames))
+    return cases
+
+
+def bench_producer(endpoint, cases):
+    """基准生产者：不限速依次发送每个用例的全部帧"""
+    buf = headers = None
+    try:
+        for size, batch, frames in cases:
+            frame = size * batch
+            offsets = np.arange(batch, dtype=np.uint64)
+            for i in range(frames):
+                buf = endpoint.claim(frame)
+                headers = header_view(buf, size, batch)
+                headers[:, 0] = offsets + i * batch
+                headers[:, 1] = time.perf_counter_ns()
+                buf = headers = None
+                endpoint.publish(frame)
+    except (EOFError, OSError):
+        pass  # 消费者已退出
+    finally:
+        buf = headers = None
+        close_quietly(endpoint)
+
+
+def bench_consumer(endpoint, cases, status):
+    """基准消费者：逐用例计时（首帧到末帧）并汇报吞吐量与延迟分位数"""
+    try:
+        for size, batch, frames in cases:
+            latencies = np.empty(frames, dtype=np.int64)
+            nbytes = 0
+            start = None
+            for i in range(frames):
+                view = endpoint.acquire(size * batch)
+                now_ns = time.perf_counter_ns()
+                if start is None:
+                    start = now_ns
+                # 同一帧内的消息同时发送，取首条的时间戳
+                latencies[i] = now_ns - HEADER.unpack_from(view)[1]
+                nbytes += len(view)
+                view = None
+                endpoint.release_slot()
+            seconds = max((now_ns - start) / 1e9, 1e-9)
+            msgs = frames * batch
+            # 首帧在计时起点到达，吞吐按其余帧计算
+            rate_frames = max(frames - 1, 1)
+            p50, p95, p99 = np.percentile(latencies, (50, 95, 99)) / 1000
+            status.put(("case", size, batch, msgs, nbytes,
+                        rate_frames * batch / seconds, rate_frames * size * batch / seconds,
+                        p50, p95, p99))
+    except EOFError:
+        pass
+    finally:
+        endpoint.close()
+        status.put(("done",))
+
+
+def run_benchmark(transports=TRANSPORTS, sizes=DEFAULT_SIZES, batches=DEFAULT_BATCHES,
+                  progress=None, should_stop=None):
+    """依次对每种传输方式运行全部用例，返回结果行列表
+
+    每行：transport, msg_size, batch, msgs, bytes, msgs_per_sec, bytes_per_sec, p50_us, p95_us, p99_us。
+    progress(行) 在每个用例完成时回调；should_stop() 为True时在当前传输方式结束后停止。
+    """
+    cases = bench_cases(sizes, batches)
+    if not cases:
+        raise ValueError("没有可运行的用例（消息大小×批量均超过单帧上限）")
+    frame_bytes = max(size * batch for size, batch, _ in cases)
+    keys = ("msg_size", "batch", "msgs", "bytes", "msgs_per_sec", "bytes_per_sec",
+            "p50_us", "p95_us", "p99_us")
+    rows = []
+    for kind in transports:
+        if should_stop is not None and should_stop():
+            break
+        transport = Transport(kind, frame_bytes)
+        status = multiprocessing.Queue()
+        consumer = multiprocessing.Process(target=bench_consumer,
+                                           args=(transport.receiver, cases, status), daemon=True)
+        producer = multiprocessing.Process(target=bench_producer,
+                                           args=(transport.sender, cases), daemon=True)
+        consumer.start()
+        producer.start()
+        transport.detach()
+        try:
+            while True:
+                try:
+                    msg = status.get(timeout=POLL_INTERVAL)
+                except queue.Empty:
+                    # 一端异常退出：通知另一端放弃等待；消费者退出且汇报取完则结束本传输方式
+                    if not producer.is_alive():
+                        transport.sender_gone.set()
+                    if not consumer.is_alive():
+                        transport.receiver_gone.set()
+                        if status.empty():
+                            break
+                    continue
+                if msg[0] == "done":
+                    break
+                row = dict(transport=kind, **dict(zip(keys, msg[1:])))
+                rows.append(row)
+                if progress is not None:
+                    progress(row)
+        finally:
+            for process in (producer, consumer):
+                process.join(JOIN_TIMEOUT)
+                if process.is_alive():
+                    process.terminate()
+                    process.join(JOIN_TIMEOUT)
+                if process.is_alive():
+                    process.kill()
+                    process.join()
+            transport.release()
+    return rows
+
+
+def format_benchmark_table(rows):
+    """基准结果转制表符分隔的文本表格"""
+    lines = ["传输\t消息大小\t批量\t消息/秒\tMB/秒\tP50延迟µs\tP99延迟µs"]
+    for r in rows:
+        lines.append(
+            f"{r['transport']}\t{r['msg_size']}\t{r['batch']}\t{r['msgs_per_sec']:.0f}\t"
+            f"{r['bytes_per_sec'] / (1 << 20):.1f}\t{r['p50_us']:.0f}\t{r['p99_us']:.0f}"
+        )
+    return "\n".join(lines)
+
+
+# ======================== 命令行：无界面基准测试 ========================
+def main(argv=None):
+    import argparse
+    import csv
+
+    def msg_size(text):
+        size = int(text)
+        if not MIN_MSG_SIZE <= size <= MAX_MSG_SIZE:
+            raise argparse.ArgumentTypeError(f"消息大小须在{MIN_MSG_SIZE}~{MAX_MSG_SIZE}字节之间：{size}")
+        return size
+
+    def batch_size(text):
+        batch = int(text)
+        if batch < 1:
+            raise argparse.ArgumentTypeError(f"批量须至少为1：{batch}")
+        return batch
+
+    parser = argparse.ArgumentParser(description="IPC传输方式基准测试（管道/队列/共享内存/套接字）")
+    parser.add_argument("--transports", nargs="+", default=list(TRANSPORTS), choices=TRANSPORTS)
+    parser.add_argument("--sizes", nargs="+", type=msg_size, default=list(DEFAULT_SIZES), help="消息大小（字节）")
+    parser.add_argument("--batches", nargs="+", type=batch_size, default=list(DEFAULT_BATCHES), help="每帧消息条数")
+    parser.add_argument("--csv", help="把结果写入该CSV文件")
+    args = parser.parse_args(argv)
+    if not bench_cases(args.sizes, args.batches):
+        parser.error(f"没有可运行的用例（消息大小×批量均超过单帧上限{BENCH_MAX_FRAME_BYTES}字节）")
+
+    rows = run_benchmark(args.transports, args.sizes, args.batches)
+    print(format_benchmark_table(rows))
+    if args.csv and rows:
+        with open(args.csv, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,38 @@
 import sys
 import os
 import time
+import heapq
 import random
+import itertools
+import queue
 import threading
 import multiprocessing
+from collections import OrderedDict, deque
 # 强制绑定Matplotlib Qt5后端（Windows绘图核心适配）
 import matplotlib
 matplotlib.use('Qt5Agg')
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
 import matplotlib.patches as patches
+import matplotlib.colors as mcolors
+from matplotlib.artist import Artist
+from matplotlib.transforms import Bbox
+from matplotlib.collections import PolyCollection
+from matplotlib.ticker import FuncFormatter, MaxNLocator
+import numpy as np
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QTabWidget, QVBoxLayout, 
-    QPushButton, QLabel, QListWidget, QTextEdit, QHBoxLayout
+    QPushButton, QLabel, QListWidget, QTextEdit, QHBoxLayout, QFileDialog, QSpinBox, QComboBox,
+    QPlainTextEdit, QDoubleSpinBox
 )
 from PyQt5.QtCore import QTimer, Qt, QThread, pyqtSignal
-from PyQt5.QtGui import QColor, QTextCharFormat, QFont
+from PyQt5.QtGui import QColor, QTextCharFormat, QTextCursor, QFont
+import scheduler_engine
+import scheduler_io
+import scheduler_workload
+import ipc_transport
+import sync_primitives
 
 # ======================== 全局适配配置（Windows核心） ========================
 # 1. 打包后路径适配（EXE运行时的资源路径）
@@ -36,67 +53,381 @@ def setup_matplotlib_font():
 
 setup_matplotlib_font()
 
+# 3. 通用日志组件：有界 + 按帧批量写入
+class LogView(QPlainTextEdit):
+    """有界、批量刷新的日志视图（各模块共用）
+
+    append() 只把记录放入环形缓冲区，定时器按帧把缓冲区内容在一次编辑中
+    写入文档；文档最多保留max_lines行，最早的行自动丢弃。一帧内到达的
+    记录超过max_lines时，只保留最新的部分并注明省略条数。
+    """
+
+    def __init__(self, colors=None, max_lines=2000, fps=30, parent=None):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setMaximumBlockCount(max_lines)
+        self.pending = deque(maxlen=max_lines)  # 待写入的 (文字, 颜色键)
+        self.dropped = 0                        # 因缓冲区满而省略的条数
+        # 颜色键 → 字符格式（只构造一次）
+        self.formats = {}
+        for key, color in dict({"black": QColor(0, 0, 0)}, **(colors or {})).items():
+            fmt = QTextCharFormat()
+            fmt.setForeground(color)
+            self.formats[key] = fmt
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(1000 // fps)
+        self.flush_timer.timeout.connect(self.flush)
+
+    def append(self, text, color="black"):
+        """追加一条带时间戳的记录（实际写入延后到下一帧）"""
+        if len(self.pending) == self.pending.maxlen:
+            self.dropped += 1
+        self.pending.append((f"[{time.strftime('%H:%M:%S')}] {text}\n", color))
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
+
+    def flush(self):
+        """把缓冲区中的记录一次性写入文档；用户向上翻看时不强制滚动到底部"""
+        if not self.pending:
+            return
+        entries = list(self.pending)
+        self.pending.clear()
+        bar = self.verticalScrollBar()
+        at_bottom = bar.value() >= bar.maximum() - 2
+        default = self.formats["black"]
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.beginEditBlock()
+        if self.dropped:
+            cursor.insertText(f"……省略{self.dropped}条日志……\n", default)
+            self.dropped = 0
+        for text, color in entries:
+            cursor.insertText(text, self.formats.get(color, default))
+        cursor.endEditBlock()
+        if at_bottom:
+            bar.setValue(bar.maximum())
+
+# 4. 全局模拟时钟：倍速与不限速模式（各模块的模拟线程共用）
+class SimClock:
+    """全局模拟时钟：虚拟时间 = 基准虚拟时间 + 实际流逝时间 × 倍速
+
+    倍速可在0.1×～1000×之间调整；不限速模式下sleep()立即返回，
+    事件驱动的模拟（进程模拟驱动）直接跳到下一个事件，虚拟时间至少按最高倍速推进。
+    """
+    MIN_SPEED = 0.1
+    MAX_SPEED = 1000.0
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.speed = 1.0
+        self.unthrottled = False
+        # (基准虚拟时间, 基准实际时间, 当前速率) 整体替换，读取无需加锁
+        self.base = (0.0, time.monotonic(), 1.0)
+
+    def now(self):
+        """当前虚拟时间（秒）"""
+        sim, real, rate = self.base
+        return sim + (time.monotonic() - real) * rate
+
+    def set_speed(self, speed=None, unthrottled=None):
+        """调整倍速/不限速（虚拟时间保持连续）"""
+        with self.lock:
+            if speed is not None:
+                self.speed = min(max(speed, self.MIN_SPEED), self.MAX_SPEED)
+            if unthrottled is not None:
+                self.unthrottled = unthrottled
+            rate = self.MAX_SPEED if self.unthrottled else self.speed
+            self.base = (self.now(), time.monotonic(), rate)
+
+    def advance_to(self, t):
+        """不限速时由事件驱动方把虚拟时间直接推进到t（不会倒退）"""
+        with self.lock:
+            if t > self.now():
+                self.base = (t, time.monotonic(), self.base[2])
+
+    def to_real(self, seconds):
+        """虚拟时长 → 当前倍速下的实际时长"""
+        return 0.0 if self.unthrottled else seconds / self.speed
+
+    def sleep(self, seconds, running=None):
+        """按当前倍速睡眠seconds虚拟秒；分段睡眠以便及时响应停止和倍速调整"""
+        remaining = seconds
+        while remaining > 0:
+            if self.unthrottled or (running is not None and not running()):
+                time.sleep(0)  # 只让出GIL
+                return
+            speed = self.speed
+            step = min(remaining / speed, 0.05)
+            time.sleep(step)
+            remaining -= step * speed
+
+SIM_CLOCK = SimClock()
+
+# 工作线程向界面发信号的最小间隔（秒）：高倍速时合并为每帧一次
+UI_EMIT_INTERVAL = 1 / 30
+
+class RateMeter:
+    """由累计计数求每秒操作数（界面定时取样）"""
+
+    def __init__(self):
+        self.last = None  # (取样时刻, 累计计数)
+
+    def sample(self, count):
+        now = time.monotonic()
+        last, self.last = self.last, (now, count)
+        if last is None or count < last[1] or now <= last[0]:
+            return 0.0
+        return (count - last[1]) / (now - last[0])
+
+class SpeedControl(QWidget):
+    """全局模拟速度控件：倍速输入 + 不限速开关"""
+
+    def __init__(self, clock, parent=None):
+        super().__init__(parent)
+        self.clock = clock
+        layout = QHBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(QLabel("模拟速度："))
+        self.speed_spin = QDoubleSpinBox()
+        self.speed_spin.setRange(clock.MIN_SPEED, clock.MAX_SPEED)
+        self.speed_spin.setDecimals(1)
+        self.speed_spin.setStepType(QDoubleSpinBox.AdaptiveDecimalStepType)
+        self.speed_spin.setSuffix("×")
+        self.speed_spin.setValue(clock.speed)
+        self.speed_spin.valueChanged.connect(lambda v: self.clock.set_speed(speed=v))
+        layout.addWidget(self.speed_spin)
+        self.unthrottled_btn = QPushButton("不限速")
+        self.unthrottled_btn.setCheckable(True)
+        self.unthrottled_btn.toggled.connect(self.set_unthrottled)
+        layout.addWidget(self.unthrottled_btn)
+        layout.addStretch()
+        self.setLayout(layout)
+
+    def set_unthrottled(self, enabled):
+        self.clock.set_speed(unthrottled=enabled)
+        self.speed_spin.setEnabled(not enabled)
+
 # ======================== 模块1：进程与线程的创建与管理 ========================
-class ProcessThread(QThread):
-    """模拟进程运行线程（触发状态变更信号）"""
+class ProcessSimulator(QThread):
+    """进程模拟驱动：单个线程按到期时间维护事件堆，推进任意数量的模拟进程
+
+    每次调度运行生成一个令牌，阻塞/终止时作废令牌即可使堆中旧事件失效，
+    无需为每个进程创建线程；进程终止后不再保留任何对象。
+    """
     state_change_signal = pyqtSignal(int, str)  # (进程ID, 新状态)
     finished_signal = pyqtSignal(int)           # (进程ID)
+    blocked_signal = pyqtSignal(int)            # (进程ID) 运行中自行发起I/O而阻塞
+    woken_signal = pyqtSignal(int)              # (进程ID) I/O完成回到就绪
 
-    def __init__(self, pid, parent=None):
+    def __init__(self, parent=None):
         super().__init__(parent)
-        self.pid = pid
-        self.running = False
-        self.current_state = "就绪"  # 初始状态：就绪
+        self.cond = threading.Condition()
+        self.events = []              # 事件堆 [(到期虚拟时间, 令牌, 进程ID, 新状态)]
+        self.tokens = {}              # 运行中/等待I/O进程的有效令牌 {pid: 令牌}
+        self.token_counter = itertools.count()
+        self.stopped = False
+
+    def dispatch(self, pid, run_time=None, end_state="终止"):
+        """进程开始运行：立即进入运行态，run_time秒后进入end_state（终止/阻塞）
+
+        run_time默认3-5秒随机。
+        """
+        if run_time is None:
+            run_time = random.randint(3, 5)
+        self.push_events(pid, ((0, "运行"), (run_time, end_state)))
+
+    def sleep(self, pid, io_time):
+        """阻塞进程等待I/O：io_time秒后自动回到就绪"""
+        self.push_events(pid, ((io_time, "就绪"),))
+
+    def push_events(self, pid, events):
+        """为进程签发新令牌并压入 [(延迟虚拟秒数, 新状态)] 事件"""
+        now = SIM_CLOCK.now()
+        with self.cond:
+            token = next(self.token_counter)
+            self.tokens[pid] = token
+            for delay, state in events:
+                heapq.heappush(self.events, (now + delay, token, pid, state))
+            self.cond.notify()
+        if not self.isRunning():
+            self.stopped = False
+            self.start()
+
+    def cancel(self, pid):
+        """作废进程的运行令牌（不发信号），返回进程此前是否在运行"""
+        with self.cond:
+            return self.tokens.pop(pid, None) is not None
+
+    def block(self, pid):
+        """阻塞进程：作废其运行令牌"""
+        if self.cancel(pid):
+            self.state_change_signal.emit(pid, "阻塞")
+
+    def wake(self, pid):
+        """唤醒进程（作废尚未完成的I/O事件）"""
+        self.cancel(pid)
+        self.state_change_signal.emit(pid, "就绪")
+
+    @property
+    def live_count(self):
+        """运行中或等待I/O的模拟进程数"""
+        return len(self.tokens)
 
     def run(self):
-        """模拟进程运行逻辑"""
-        self.running = True
-        self.current_state = "运行"
-        self.state_change_signal.emit(self.pid, self.current_state)
-        # 模拟运行3-5秒后自动终止（可根据需要调整）
-        run_time = random.randint(3, 5)
-        for i in range(run_time):
-            if not self.running:
-                break
-            self.msleep(1000)
-        if self.running:
-            self.current_state = "终止"
-            self.state_change_signal.emit(self.pid, self.current_state)
-            self.finished_signal.emit(self.pid)
-
-    def block(self):
-        """阻塞进程"""
-        if self.current_state == "运行":
-            self.current_state = "阻塞"
-            self.state_change_signal.emit(self.pid, self.current_state)
-            self.running = False
-
-    def wake(self):
-        """唤醒进程"""
-        if self.current_state == "阻塞":
-            self.current_state = "就绪"
-            self.state_change_signal.emit(self.pid, self.current_state)
+        """事件循环：睡眠到最近的到期事件，批量取出后在锁外发信号"""
+        while True:
+            due = []
+            with self.cond:
+                while not self.stopped:
+                    if not self.events:
+                        self.cond.wait()
+                        continue
+                    if SIM_CLOCK.unthrottled:
+                        # 不限速：虚拟时间直接跳到下一个事件
+                        SIM_CLOCK.advance_to(self.events[0][0])
+                        break
+                    delay = SIM_CLOCK.to_real(self.events[0][0] - SIM_CLOCK.now())
+                    if delay <= 0:
+                        break
+                    # 分段等待，及时响应倍速调整
+                    self.cond.wait(min(delay, 0.1))
+                if self.stopped:
+                    return
+                now = SIM_CLOCK.now()
+                while self.events and self.events[0][0] <= now:
+                    _, token, pid, state = heapq.heappop(self.events)
+                    if self.tokens.get(pid) != token:
+                        continue  # 已阻塞/唤醒进程的过期事件
+                    if state != "运行":
+                        del self.tokens[pid]
+                    due.append((pid, state))
+            for pid, state in due:
+                self.state_change_signal.emit(pid, state)
+                if state == "终止":
+                    self.finished_signal.emit(pid)
+                elif state == "阻塞":
+                    self.blocked_signal.emit(pid)
+                elif state == "就绪":
+                    self.woken_signal.emit(pid)
 
     def stop(self):
-        """强制停止进程"""
-        self.running = False
+        """停止驱动线程并清空全部事件"""
+        with self.cond:
+            self.stopped = True
+            self.events.clear()
+            self.tokens.clear()
+            self.cond.notify()
+        self.wait()
+
+def dispatch_fifo(ready_queue, free_cores, last_core):
+    """先来先服务：就绪队列队首依次分配到编号最小的空闲核，返回 [(核, 进程ID)]"""
+    return [(core, ready_queue.popleft()) for core in free_cores[:len(ready_queue)]]
+
+def dispatch_affinity(ready_queue, free_cores, last_core, window=8):
+    """核亲和：在队首window个进程中优先挑上次在该核运行过的，找不到再取队首"""
+    plan = []
+    for core in free_cores:
+        if not ready_queue:
+            break
+        pick = 0
+        for i, pid in enumerate(itertools.islice(ready_queue, window)):
+            if last_core.get(pid) == core:
+                pick = i
+                break
+        pid = ready_queue[pick]
+        del ready_queue[pick]
+        plan.append((core, pid))
+    return plan
+
+# 可选的分派策略：f(就绪队列deque, 空闲核列表, {pid: 上次运行的核}) → [(核, 进程ID)]
+DISPATCHERS = {
+    "先来先服务": dispatch_fifo,
+    "核亲和": dispatch_affinity,
+}
 
 class ProcessManagement(QWidget):
     def __init__(self):
         super().__init__()
         # 进程状态管理
         self.process_id_counter = 0  # 进程ID计数器
-        self.ready_queue = []        # 就绪队列
-        self.running_process = None  # 运行中的进程（单核仅1个）
-        self.blocked_queue = []      # 阻塞队列
-        self.terminated_processes = []  # 终止进程
-        self.process_threads = {}    # 进程线程映射 {pid: thread}
+        self.ready_queue = deque()   # 就绪队列
+        self.cores = [None]          # 各核上运行的进程（None为空闲），默认单核
+        # 阻塞队列：I/O完成的顺序任意，用OrderedDict兼顾FIFO唤醒与O(1)删除
+        self.blocked_queue = OrderedDict()
+        self.terminated_processes = deque(maxlen=1000)  # 最近终止的进程
+        self.terminated_count = 0
+        # 多核分派
+        self.dispatcher = dispatch_fifo
+        self.auto_dispatch = False   # 核空闲/进程就绪时自动从就绪队列分派
+        self.last_core = {}          # {pid: 上次运行的核}（核亲和策略使用）
+        # 就绪队列等待时间统计（虚拟秒）
+        self.ready_since = {}        # {pid: 进入就绪队列的时刻}
+        self.ready_waits = deque(maxlen=1000)
+        self.dispatch_count = 0
+        # 进程模拟驱动（所有进程共用一个线程）
+        self.simulator = ProcessSimulator()
+        self.simulator.state_change_signal.connect(self.on_process_state_change)
+        self.simulator.finished_signal.connect(self.on_process_finished)
+        self.simulator.blocked_signal.connect(self.on_process_blocked)
+        self.simulator.woken_signal.connect(self.on_process_woken)
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.simulator.stop)
+        # 文字标签中每个队列最多列出的进程ID数
+        self.max_label_pids = 10
         # 可视化画布
         self.figure = plt.Figure(figsize=(10, 4), dpi=100)
         self.canvas = FigureCanvas(self.figure)
+        self.history_figure = plt.Figure(figsize=(10, 1.5), dpi=100)
+        self.history_canvas = FigureCanvas(self.history_figure)
+        self.history_canvas.setMaximumHeight(150)
+        self.history_canvas.setVisible(False)
+        # 状态颜色映射
+        self.state_colors = {
+            "就绪": '#4169E1',
+            "运行": '#228B22',
+            "阻塞": '#FF8C00',
+            "终止": '#808080'
+        }
+        # 每个队列/终止区最多显示的卡片数（其余只计数）
+        self.max_queue_cards = 8
+        self.max_terminated_cards = 9
+        # 负载生成（概率模型：泊松到达、指数运行时间、按概率阻塞、指数I/O时间）
+        self.rng = np.random.default_rng()
+        self.load_running = False
+        self.load_spawned = 0
+        self.load_rejected = 0  # 超出进程上限而被拒绝的到达（按虚拟时间到达计数）
+        self.load_backlog = 0  # 已准入但受单次创建上限限制、顺延到下一次创建的到达
+        self.load_last_tick = 0.0
+        self.load_timer = QTimer(self)
+        self.load_timer.setInterval(20)
+        self.load_timer.timeout.connect(self.load_tick)
+        self.max_spawn_per_tick = 20000
+        # 吞吐统计：状态转换计数与队列长度历史 [(时刻, 就绪, 阻塞, 忙碌核)]
+        self.transition_count = 0
+        self.load_start_time = 0.0
+        self.rate_samples = deque(maxlen=6)    # [(时刻, 累计转换数)]，约1秒窗口
+        self.history = deque(maxlen=300)
+        self.stats_timer = QTimer(self)
+        self.stats_timer.setInterval(200)
+        self.stats_timer.timeout.connect(self.sample_stats)
+        # 每秒实测一次状态转换速率（受全局模拟速度影响）
+        self.ops_meter = RateMeter()
+        self.ops_timer = QTimer(self)
+        self.ops_timer.setInterval(1000)
+        self.ops_timer.timeout.connect(self.update_ops_label)
+        self.ops_timer.start()
+        # 限帧重绘：状态变更只标记，最多每秒render_fps帧
+        self.render_fps = 30
+        self.redraw_timer = QTimer(self)
+        self.redraw_timer.setSingleShot(True)
+        self.redraw_timer.setInterval(1000 // self.render_fps)
+        self.redraw_timer.timeout.connect(self.refresh_view)
         # 初始化UI
         self.init_ui()
-        # 初始绘制可视化界面
+        # 初始绘制可视化界面（静态图元只创建一次）
+        self.init_process_plot()
         self.plot_process_states()
 
     def init_ui(self):
@@ -104,29 +435,90 @@ class ProcessManagement(QWidget):
         
         # 1. 控制按钮区域
         btn_layout = QHBoxLayout()
+        self.create_spin = QSpinBox()
+        self.create_spin.setRange(1, 100000)
+        self.create_spin.setValue(5)
+        self.create_spin.valueChanged.connect(
+            lambda n: self.create_btn.setText(f"创建{n}个进程")
+        )
         self.create_btn = QPushButton("创建5个进程")
         self.create_btn.clicked.connect(self.create_processes)
         self.schedule_btn = QPushButton("调度运行（就绪→运行）")
         self.schedule_btn.clicked.connect(self.schedule_process)
-        self.block_btn = QPushButton("阻塞当前进程（运行→阻塞）")
+        self.block_btn = QPushButton("阻塞运行进程（运行→阻塞）")
         self.block_btn.clicked.connect(self.block_running_process)
         self.wake_btn = QPushButton("唤醒首个阻塞进程（阻塞→就绪）")
         self.wake_btn.clicked.connect(self.wake_blocked_process)
+        btn_layout.addWidget(self.create_spin)
         btn_layout.addWidget(self.create_btn)
         btn_layout.addWidget(self.schedule_btn)
         btn_layout.addWidget(self.block_btn)
         btn_layout.addWidget(self.wake_btn)
         layout.addLayout(btn_layout)
 
+        # 多核设置：核数、分派策略、自动分派
+        core_layout = QHBoxLayout()
+        core_layout.addWidget(QLabel("CPU核数："))
+        self.core_spin = QSpinBox()
+        self.core_spin.setRange(1, 16)
+        self.core_spin.setValue(len(self.cores))
+        self.core_spin.valueChanged.connect(self.set_core_count)
+        core_layout.addWidget(self.core_spin)
+        core_layout.addWidget(QLabel("分派策略："))
+        self.dispatcher_combo = QComboBox()
+        self.dispatcher_combo.addItems(list(DISPATCHERS))
+        self.dispatcher_combo.currentTextChanged.connect(self.set_dispatcher)
+        core_layout.addWidget(self.dispatcher_combo)
+        self.auto_btn = QPushButton("自动分派：关")
+        self.auto_btn.setCheckable(True)
+        self.auto_btn.toggled.connect(self.set_auto_dispatch)
+        core_layout.addWidget(self.auto_btn)
+        self.wait_label = QLabel("就绪等待：暂无数据")
+        core_layout.addWidget(self.wait_label)
+        core_layout.addStretch()
+        layout.addLayout(core_layout)
+
+        # 负载生成：到达率、总数、平均运行时间、阻塞概率、平均I/O时间
+        load_layout = QHBoxLayout()
+        self.load_spins = {}
+        for key, label, lo, hi, value, suffix in (
+            ("rate", "到达率", 1, 100000, 200, "个/秒"),
+            ("total", "总数", 0, 10000000, 0, "（0=不限）"),
+            ("max_live", "进程上限", 100, 1000000, 10000, "个"),
+            ("run_ms", "平均运行", 1, 10000, 20, "ms"),
+            ("block_pct", "阻塞概率", 0, 100, 30, "%"),
+            ("io_ms", "平均I/O", 1, 10000, 50, "ms"),
+        ):
+            load_layout.addWidget(QLabel(f"{label}："))
+            spin = QSpinBox()
+            spin.setRange(lo, hi)
+            spin.setValue(value)
+            spin.setSuffix(suffix)
+            load_layout.addWidget(spin)
+            self.load_spins[key] = spin
+        self.load_btn = QPushButton("开始负载")
+        self.load_btn.setCheckable(True)
+        self.load_btn.toggled.connect(self.toggle_load)
+        load_layout.addWidget(self.load_btn)
+        load_layout.addStretch()
+        layout.addLayout(load_layout)
+        stats_layout = QHBoxLayout()
+        self.throughput_label = QLabel("吞吐：暂无数据")
+        self.ops_label = QLabel("实测：0 次状态转换/秒")
+        stats_layout.addWidget(self.throughput_label)
+        stats_layout.addStretch()
+        stats_layout.addWidget(self.ops_label)
+        layout.addLayout(stats_layout)
+
         # 2. 进程状态文字展示区
         state_text_layout = QHBoxLayout()
-        self.ready_label = QLabel(f"就绪队列：{self.ready_queue}")
+        self.ready_label = QLabel(f"就绪队列：{list(self.ready_queue)}")
         self.ready_label.setStyleSheet("color: #4169E1; font-size: 14px;")
-        self.running_label = QLabel(f"运行进程：{self.running_process if self.running_process else '无'}")
+        self.running_label = QLabel(f"运行进程：{self.format_running()}")
         self.running_label.setStyleSheet("color: #228B22; font-size: 14px;")
-        self.blocked_label = QLabel(f"阻塞队列：{self.blocked_queue}")
+        self.blocked_label = QLabel(f"阻塞队列：{list(self.blocked_queue)}")
         self.blocked_label.setStyleSheet("color: #FF8C00; font-size: 14px;")
-        self.terminated_label = QLabel(f"终止进程：{self.terminated_processes}")
+        self.terminated_label = QLabel(f"终止进程：{list(self.terminated_processes)}")
         self.terminated_label.setStyleSheet("color: #808080; font-size: 14px;")
         state_text_layout.addWidget(self.ready_label)
         state_text_layout.addWidget(self.running_label)
@@ -138,256 +530,716 @@ class ProcessManagement(QWidget):
         plot_title = QLabel("<b>进程状态流转可视化（就绪=蓝/运行=绿/阻塞=橙/终止=灰）</b>")
         layout.addWidget(plot_title)
         layout.addWidget(self.canvas)
+        layout.addWidget(self.history_canvas)
 
         # 4. 操作日志区
         self.log_label = QLabel("<b>进程操作日志</b>")
-        self.log = QTextEdit()
-        self.log.setReadOnly(True)
+        self.log = LogView({
+            "就绪": QColor(65, 105, 225),
+            "运行": QColor(34, 139, 34),
+            "阻塞": QColor(255, 140, 0),
+            "终止": QColor(128, 128, 128),
+        })
         self.log.setMaximumHeight(120)
         layout.addWidget(self.log_label)
         layout.addWidget(self.log)
 
         self.setLayout(layout)
 
-    def plot_process_states(self):
-        """绘制进程状态可视化图形（Windows适配）"""
-        self.figure.clear()
+    def init_process_plot(self):
+        """创建静态图元（区域标题、分隔线），只执行一次；进程卡片按pid增量维护"""
         ax = self.figure.add_subplot(111)
         ax.set_xlim(0, 100)
         ax.set_ylim(0, 20)
         ax.axis('off')  # 关闭坐标轴
-
-        # 绘制区域标题（Windows字体适配）
-        ax.text(15, 18, "就绪队列", fontsize=12, fontweight='bold', ha='center')
-        ax.text(50, 18, "运行区", fontsize=12, fontweight='bold', ha='center')
-        ax.text(85, 18, "阻塞队列", fontsize=12, fontweight='bold', ha='center')
+        self.process_ax = ax
+
+        # 负载模式下的队列长度曲线：独立小画布，随吞吐采样刷新，不拖慢状态图的帧率
+        self.history_ax = self.history_figure.add_subplot(111)
+        self.history_lines = {
+            state: self.history_ax.plot([], [], color=self.state_colors[state], linewidth=1,
+                                        label=f"{state}数")[0]
+            for state in ("就绪", "阻塞", "运行")
+        }
+        self.history_ax.set_xlabel("时间（秒）", fontsize=8)
+        self.history_ax.tick_params(labelsize=7)
+        self.history_ax.legend(loc="upper left", fontsize=7, ncol=3)
+        self.history_figure.subplots_adjust(left=0.06, right=0.98, top=0.95, bottom=0.3)
+
+        # 绘制区域标题（Windows字体适配；队列溢出时显示总数）
+        self.region_titles = {
+            "就绪": ax.text(15, 18, "就绪队列", fontsize=12, fontweight='bold', ha='center'),
+            "运行": ax.text(50, 18, "运行区", fontsize=12, fontweight='bold', ha='center'),
+            "阻塞": ax.text(85, 18, "阻塞队列", fontsize=12, fontweight='bold', ha='center'),
+        }
+        self.terminated_more = ax.text(99, 3, "", fontsize=8, ha='right', va='center', color='#808080')
         # 绘制区域分隔线
         ax.axvline(x=30, ymin=0.1, ymax=0.9, color='black', linestyle='--', linewidth=1)
         ax.axvline(x=70, ymin=0.1, ymax=0.9, color='black', linestyle='--', linewidth=1)
 
-        # 状态颜色映射
-        color_map = {
-            "就绪": '#4169E1',
-            "运行": '#228B22',
-            "阻塞": '#FF8C00',
-            "终止": '#808080'
-        }
-
-        # 1. 绘制就绪队列进程（左侧区域）
-        ready_y = 15
-        for pid in self.ready_queue:
-            # 进程卡片：矩形+进程ID文字
-            rect = patches.Rectangle((5, ready_y-2), 20, 3, 
-                                   facecolor=color_map["就绪"], edgecolor='black', linewidth=2)
-            ax.add_patch(rect)
-            ax.text(15, ready_y-0.5, f"进程{pid}", ha='center', va='center', 
-                   fontsize=10, color='white', fontweight='bold')
-            ready_y -= 4  # 向下排列
-
-        # 2. 绘制运行进程（中间区域）
-        if self.running_process is not None:
-            rect = patches.Rectangle((35, 8), 30, 4, 
-                                   facecolor=color_map["运行"], edgecolor='black', linewidth=2)
-            ax.add_patch(rect)
-            ax.text(50, 10, f"进程{self.running_process}", ha='center', va='center', 
-                   fontsize=12, color='white', fontweight='bold')
-
-        # 3. 绘制阻塞队列进程（右侧区域）
-        blocked_y = 15
-        for pid in self.blocked_queue:
-            rect = patches.Rectangle((75, blocked_y-2), 20, 3, 
-                                   facecolor=color_map["阻塞"], edgecolor='black', linewidth=2)
-            ax.add_patch(rect)
-            ax.text(85, blocked_y-0.5, f"进程{pid}", ha='center', va='center', 
-                   fontsize=10, color='white', fontweight='bold')
-            blocked_y -= 4
-
-        # 4. 绘制终止进程（底部区域）
-        terminated_x = 5
-        for pid in self.terminated_processes:
-            rect = patches.Rectangle((terminated_x, 2), 8, 2, 
-                                   facecolor=color_map["终止"], edgecolor='black', linewidth=1)
-            ax.add_patch(rect)
-            ax.text(terminated_x+4, 3, f"进程{pid}", ha='center', va='center', 
-                   fontsize=8, color='white')
-            terminated_x += 10
-
-        # 刷新画布（Windows强制刷新）
-        self.canvas.draw()
-        self.canvas.flush_events()
+        # 多核时运行区各核的编号标签（核数变化时重建）
+        self.core_labels = []
+
+        # 进程卡片 {pid: (矩形, 文字, 当前几何/状态)}；离开显示区的卡片回收复用
+        self.process_cards = {}
+        self.free_cards = []
+
+    def card_geometry(self, state, slot, shown):
+        """卡片几何：(x, y, 宽, 高, 线宽, 文字x, 文字y, 字号, 字重)"""
+        if state == "运行":
+            if shown == 1:
+                return (35, 8, 30, 4, 2, 50, 10, 12, 'bold')
+            # 多核：各核一行，在运行区内等分（不低于终止区）
+            spacing = min(4.0, 11.5 / shown)
+            height = spacing * 0.8
+            top = 16 - spacing * slot
+            fontsize = 10 if height >= 2.5 else max(6, 10 * height / 3)
+            return (35, top - height, 30, height, 2, 50, top - height / 2, fontsize, 'bold')
+        if state == "终止":
+            x = 5 + 10 * slot
+            return (x, 2, 8, 2, 1, x + 4, 3, 8, 'normal')
+        # 就绪/阻塞队列：不超过3个时沿用原间距，更多时在区域内压缩排列
+        x = 5 if state == "就绪" else 75
+        spacing = min(4.0, 12.0 / shown)
+        height = min(3.0, spacing * 0.8)
+        top = 16 - spacing * slot
+        fontsize = 10 if height >= 2.5 else max(6, 10 * height / 3)
+        return (x, top - height, 20, height, 2, x + 10, top - height / 2, fontsize, 'bold')
+
+    def process_layout(self):
+        """当前状态 → {pid: (状态, 槽位, 同区显示数)}；各区域只显示有限个卡片"""
+        layout = {}
+        for state, members in (("就绪", self.ready_queue), ("阻塞", self.blocked_queue)):
+            shown = min(len(members), self.max_queue_cards)
+            for slot, pid in enumerate(itertools.islice(members, shown)):
+                layout[pid] = (state, slot, shown)
+        for core, pid in enumerate(self.cores):
+            if pid is not None:
+                layout[pid] = ("运行", core, len(self.cores))
+        # 终止区只显示最近终止的若干个
+        recent = self.recent_terminated(self.max_terminated_cards)
+        for slot, pid in enumerate(recent):
+            layout[pid] = ("终止", slot, len(recent))
+        return layout
+
+    def plot_process_states(self, sync=False):
+        """增量更新进程状态图：只移动/重着色/隐藏发生变化的卡片，重绘合并到draw_idle
+
+        sync为True时立即绘制（按帧刷新时用于测量绘制耗时）。
+        """
+        ax = self.process_ax
+        layout = self.process_layout()
+
+        # 1. 回收不再显示的卡片
+        for pid in [pid for pid in self.process_cards if pid not in layout]:
+            rect, text, _ = self.process_cards.pop(pid)
+            rect.set_visible(False)
+            text.set_visible(False)
+            self.free_cards.append((rect, text))
+
+        # 2. 新增/移动/重着色
+        for pid, (state, slot, shown) in layout.items():
+            geometry = self.card_geometry(state, slot, shown)
+            card = self.process_cards.get(pid)
+            if card is not None and card[2] == (state, geometry):
+                continue  # 未变化
+            if card is None:
+                if self.free_cards:
+                    rect, text = self.free_cards.pop()
+                else:
+                    rect = patches.Rectangle((0, 0), 1, 1, edgecolor='black')
+                    ax.add_patch(rect)
+                    text = ax.text(0, 0, "", ha='center', va='center', color='white')
+                text.set_text(f"进程{pid}")
+            else:
+                rect, text, _ = card
+            x, y, w, h, lw, tx, ty, fontsize, weight = geometry
+            rect.set_bounds(x, y, w, h)
+            rect.set_linewidth(lw)
+            rect.set_facecolor(self.state_colors[state])
+            text.set_position((tx, ty))
+            text.set_fontsize(fontsize)
+            text.set_fontweight(weight)
+            rect.set_visible(True)
+            text.set_visible(True)
+            self.process_cards[pid] = (rect, text, (state, geometry))
+
+        # 3. 溢出计数
+        for state, members, name in (("就绪", self.ready_queue, "就绪队列"),
+                                     ("阻塞", self.blocked_queue, "阻塞队列")):
+            title = name if len(members) <= self.max_queue_cards else f"{name}（共{len(members)}个）"
+            if self.region_titles[state].get_text() != title:
+                self.region_titles[state].set_text(title)
+        run_title = "运行区" if len(self.cores) == 1 else f"运行区（{len(self.cores)}核）"
+        if self.region_titles["运行"].get_text() != run_title:
+            self.region_titles["运行"].set_text(run_title)
+        if len(self.core_labels) != (len(self.cores) if len(self.cores) > 1 else 0):
+            self.update_core_labels()
+        hidden = self.terminated_count - self.max_terminated_cards
+        self.terminated_more.set_text(f"共终止{self.terminated_count}个" if hidden > 0 else "")
+
+        if sync:
+            self.canvas.draw()
+        else:
+            # 合并重绘：同一事件循环内的多次状态变更只绘制一次
+            self.canvas.draw_idle()
+
+    def update_core_labels(self):
+        """重建运行区左侧的核编号标签（单核时不显示）"""
+        for label in self.core_labels:
+            label.remove()
+        self.core_labels = []
+        n = len(self.cores)
+        if n == 1:
+            return
+        for core in range(n):
+            _, y, _, h, *_ = self.card_geometry("运行", core, n)
+            self.core_labels.append(self.process_ax.text(
+                34, y + h / 2, f"CPU{core}", fontsize=7, ha='right', va='center', color='#228B22'
+            ))
+
+    def format_running(self):
+        """运行区文字：单核显示进程ID，多核显示忙碌核数与运行进程"""
+        running = [pid for pid in self.cores if pid is not None]
+        if len(self.cores) == 1:
+            return running[0] if running else '无'
+        return f"{len(running)}/{len(self.cores)}核忙 {self.format_pids(running)}"
+
+    def recent_terminated(self, n):
+        """最近终止的n个进程（按终止先后）"""
+        return list(itertools.islice(reversed(self.terminated_processes), n))[::-1]
+
+    def format_pids(self, pids, tail=False, total=None):
+        """进程ID列表转文字：过长时只列出前（或最近）若干个并附总数"""
+        limit = self.max_label_pids
+        total = len(pids) if total is None else total
+        if total <= limit:
+            return str(list(pids))
+        if tail:
+            recent = itertools.islice(reversed(pids), limit)
+            return f"[..., {', '.join(map(str, list(recent)[::-1]))}]（共{total}个）"
+        return f"[{', '.join(map(str, itertools.islice(pids, limit)))}, ...]（共{total}个）"
 
     def update_text_labels(self):
         """更新进程状态文字标签"""
-        self.ready_label.setText(f"就绪队列：{self.ready_queue}")
-        self.running_label.setText(f"运行进程：{self.running_process if self.running_process else '无'}")
-        self.blocked_label.setText(f"阻塞队列：{self.blocked_queue}")
-        self.terminated_label.setText(f"终止进程：{self.terminated_processes}")
+        self.ready_label.setText(f"就绪队列：{self.format_pids(self.ready_queue)}")
+        self.running_label.setText(f"运行进程：{self.format_running()}")
+        self.blocked_label.setText(f"阻塞队列：{self.format_pids(self.blocked_queue)}")
+        self.terminated_label.setText(
+            f"终止进程：{self.format_pids(self.terminated_processes, tail=True, total=self.terminated_count)}"
+        )
+        self.update_wait_label()
 
     def add_log(self, text, color="black"):
-        """添加操作日志（带时间戳，Windows线程安全）"""
-        format_char = QTextCharFormat()
-        color_map = {
-            "就绪": QColor(65, 105, 225),
-            "运行": QColor(34, 139, 34),
-            "阻塞": QColor(255, 140, 0),
-            "终止": QColor(128, 128, 128),
-            "black": QColor(0, 0, 0)
-        }
-        format_char.setForeground(color_map.get(color, QColor(0,0,0)))
-        cursor = self.log.textCursor()
-        cursor.movePosition(cursor.End)
-        cursor.insertText(f"[{time.strftime('%H:%M:%S')}] {text}\n", format_char)
-        self.log.setTextCursor(cursor)
-        self.log.ensureCursorVisible()
+        """添加操作日志（带时间戳，按帧批量写入）"""
+        self.log.append(text, color)
 
     def create_processes(self):
-        """创建5个进程，加入就绪队列"""
-        new_pids = []
-        for _ in range(5):
-            self.process_id_counter += 1
-            pid = self.process_id_counter
+        """批量创建进程（数量由输入框指定），加入就绪队列"""
+        n = self.create_spin.value()
+        new_pids = self.spawn_processes(n)
+        self.request_redraw()
+        self.add_log(f"创建{n}个进程：{self.format_pids(new_pids)}，加入就绪队列", "就绪")
+        self.auto_schedule()
+
+    def spawn_processes(self, n):
+        """分配n个新进程ID并加入就绪队列（只记录ID，运行时才交给模拟驱动）"""
+        first = self.process_id_counter + 1
+        self.process_id_counter += n
+        new_pids = range(first, first + n)
+        for pid in new_pids:
+            self.enqueue_ready(pid)
+        self.transition_count += n
+        return new_pids
+
+    def enqueue_ready(self, pid, front=False):
+        """进程进入就绪队列（记录入队时刻，用于统计就绪等待时间）"""
+        if front:
+            self.ready_queue.appendleft(pid)
+        else:
             self.ready_queue.append(pid)
-            # 创建进程线程（初始就绪，未运行）
-            self.process_threads[pid] = ProcessThread(pid)
-            # 绑定状态变更信号
-            self.process_threads[pid].state_change_signal.connect(self.on_process_state_change)
-            self.process_threads[pid].finished_signal.connect(self.on_process_finished)
-            new_pids.append(pid)
-        # 更新UI
-        self.update_text_labels()
-        self.plot_process_states()
-        self.add_log(f"创建5个进程：{new_pids}，加入就绪队列", "就绪")
+        self.ready_since[pid] = SIM_CLOCK.now()
+
+    def next_burst(self):
+        """本次运行的 (运行秒数, 结束状态)：负载模式按概率模型抽样，否则沿用默认3-5秒后终止"""
+        if not self.load_running:
+            return None, "终止"
+        spins = self.load_spins
+        run_time = self.rng.exponential(spins["run_ms"].value() / 1000)
+        blocked = self.rng.random() * 100 < spins["block_pct"].value()
+        return run_time, "阻塞" if blocked else "终止"
+
+    def dispatch_ready(self, max_count=None):
+        """按当前分派策略把就绪进程分配到空闲核，返回 [(核, 进程ID)]"""
+        free_cores = [core for core, pid in enumerate(self.cores) if pid is None]
+        if max_count is not None:
+            free_cores = free_cores[:max_count]
+        if not free_cores or not self.ready_queue:
+            return []
+        plan = self.dispatcher(self.ready_queue, free_cores, self.last_core)
+        now = SIM_CLOCK.now()
+        for core, pid in plan:
+            self.cores[core] = pid
+            self.last_core[pid] = core
+            self.ready_waits.append(now - self.ready_since.pop(pid, now))
+            self.dispatch_count += 1
+            # 交给模拟驱动运行
+            self.simulator.dispatch(pid, *self.next_burst())
+        self.transition_count += len(plan)
+        return plan
+
+    def auto_schedule(self):
+        """自动分派模式：有空闲核就从就绪队列补齐"""
+        if not self.auto_dispatch:
+            return
+        plan = self.dispatch_ready()
+        if not plan:
+            return
+        self.request_redraw()
+        if not self.load_running:
+            for core, pid in plan:
+                self.add_log(f"自动分派进程{pid}到CPU{core}：就绪→运行", "运行")
 
     def schedule_process(self):
-        """调度就绪队列首个进程到运行区"""
+        """调度就绪队列中的一个进程到空闲核"""
         if not self.ready_queue:
             self.add_log("就绪队列为空，无法调度！", "black")
             return
-        if self.running_process is not None:
-            self.add_log(f"当前已有运行进程{self.running_process}，无法调度！", "black")
+        if None not in self.cores:
+            if len(self.cores) == 1:
+                self.add_log(f"当前已有运行进程{self.cores[0]}，无法调度！", "black")
+            else:
+                self.add_log(f"{len(self.cores)}个核均在运行，无法调度！", "black")
             return
-        # 取出就绪队列首个进程
-        pid = self.ready_queue.pop(0)
-        self.running_process = pid
-        # 启动进程线程
-        self.process_threads[pid].start()
+        (core, pid), = self.dispatch_ready(max_count=1)
         # 更新UI
-        self.update_text_labels()
-        self.plot_process_states()
-        self.add_log(f"调度进程{pid}：就绪→运行", "运行")
+        self.request_redraw()
+        where = "" if len(self.cores) == 1 else f"到CPU{core}"
+        self.add_log(f"调度进程{pid}{where}：就绪→运行", "运行")
 
     def block_running_process(self):
-        """阻塞当前运行进程"""
-        if self.running_process is None:
+        """阻塞编号最小的忙碌核上的运行进程"""
+        busy = [core for core, pid in enumerate(self.cores) if pid is not None]
+        if not busy:
             self.add_log("无运行进程，无法阻塞！", "black")
             return
-        pid = self.running_process
-        # 阻塞进程线程
-        self.process_threads[pid].block()
+        core = busy[0]
+        pid = self.cores[core]
+        # 作废进程的运行事件
+        self.simulator.block(pid)
         # 从运行区移到阻塞队列
-        self.running_process = None
-        self.blocked_queue.append(pid)
+        self.cores[core] = None
+        self.blocked_queue[pid] = None
+        self.transition_count += 1
         # 更新UI
-        self.update_text_labels()
-        self.plot_process_states()
+        self.request_redraw()
         self.add_log(f"阻塞进程{pid}：运行→阻塞", "阻塞")
+        self.auto_schedule()
 
     def wake_blocked_process(self):
         """唤醒阻塞队列首个进程"""
         if not self.blocked_queue:
             self.add_log("阻塞队列为空，无法唤醒！", "black")
             return
-        pid = self.blocked_queue.pop(0)
-        # 唤醒进程线程
-        self.process_threads[pid].wake()
+        pid, _ = self.blocked_queue.popitem(last=False)
+        # 唤醒进程
+        self.simulator.wake(pid)
         # 移到就绪队列
-        self.ready_queue.append(pid)
+        self.enqueue_ready(pid)
+        self.transition_count += 1
         # 更新UI
-        self.update_text_labels()
-        self.plot_process_states()
+        self.request_redraw()
         self.add_log(f"唤醒进程{pid}：阻塞→就绪", "就绪")
+        self.auto_schedule()
+
+    def set_core_count(self, n):
+        """调整核数：减少时被移除核上的进程被抢占，放回就绪队列队首"""
+        removed = [pid for pid in self.cores[n:] if pid is not None]
+        for pid in reversed(removed):
+            self.simulator.cancel(pid)
+            self.enqueue_ready(pid, front=True)
+        self.transition_count += len(removed)
+        self.cores = self.cores[:n] + [None] * (n - len(self.cores))
+        self.request_redraw()
+        msg = f"CPU核数设为{n}"
+        if removed:
+            msg += f"，进程{removed}被抢占回就绪队列"
+        self.add_log(msg, "black")
+        self.auto_schedule()
+
+    def set_dispatcher(self, name):
+        """切换分派策略"""
+        self.dispatcher = DISPATCHERS[name]
+        self.add_log(f"分派策略：{name}", "black")
+
+    def set_auto_dispatch(self, enabled):
+        """开关自动分派"""
+        self.auto_dispatch = enabled
+        self.auto_btn.setText(f"自动分派：{'开' if enabled else '关'}")
+        self.auto_schedule()
+
+    def update_wait_label(self):
+        """就绪等待时间统计（最近1000次分派）"""
+        if not self.ready_waits:
+            self.wait_label.setText("就绪等待：暂无数据")
+            return
+        waits = np.fromiter(self.ready_waits, dtype=np.float64) * 1000
+        self.wait_label.setText(
+            f"就绪等待：平均{waits.mean():.0f}ms  P95 {np.percentile(waits, 95):.0f}ms"
+            f"（共分派{self.dispatch_count}次）"
+        )
+
+    def update_ops_label(self):
+        rate = self.ops_meter.sample(self.transition_count)
+        self.ops_label.setText(f"实测：{rate:.0f} 次状态转换/秒")
+
+    # ---------------- 限帧重绘 ----------------
+    def request_redraw(self):
+        """标记界面需要刷新；同一帧内的多次状态变更合并为一次重绘"""
+        if not self.redraw_timer.isActive():
+            self.redraw_timer.start()
 
+    def refresh_view(self):
+        """按帧刷新文字标签与状态图"""
+        start = time.perf_counter()
+        self.update_text_labels()
+        self.plot_process_states(sync=True)
+        # 绘制耗时超过帧预算时拉长帧间隔，绘制最多占用约一半的界面线程时间
+        cost_ms = (time.perf_counter() - start) * 1000
+        self.redraw_timer.setInterval(max(1000 // self.render_fps, int(cost_ms * 2)))
+
+    # ---------------- 负载生成 ----------------
+    def toggle_load(self, enabled):
+        """开始/停止负载生成"""
+        if enabled:
+            self.start_load()
+        else:
+            self.stop_load()
+
+    def start_load(self):
+        """开始负载生成：自动分派，按到达率批量创建进程，定时采样吞吐"""
+        self.load_running = True
+        self.load_spawned = 0
+        self.load_rejected = 0
+        self.load_backlog = 0
+        self.load_start_time = time.monotonic()
+        self.load_last_tick = SIM_CLOCK.now()
+        self.history.clear()
+        self.rate_samples.clear()
+        self.rate_samples.append((self.load_start_time, self.transition_count))
+        self.auto_btn.setChecked(True)
+        self.history_canvas.setVisible(True)
+        self.load_timer.start()
+        self.stats_timer.start()
+        self.load_btn.setText("停止负载")
+        spins = self.load_spins
+        self.add_log(
+            f"负载生成开始：到达率{spins['rate'].value()}个/秒，平均运行{spins['run_ms'].value()}ms，"
+            f"阻塞概率{spins['block_pct'].value()}%，平均I/O{spins['io_ms'].value()}ms，"
+            f"进程上限{spins['max_live'].value()}个", "black"
+        )
+
+    def stop_load(self):
+        """停止负载生成（已在运行/等待I/O的进程照常推进）"""
+        if not self.load_running:
+            return
+        self.load_running = False
+        self.load_timer.stop()
+        self.stats_timer.stop()
+        self.sample_stats()
+        if self.load_btn.isChecked():
+            self.load_btn.setChecked(False)
+        self.load_btn.setText("开始负载")
+        elapsed = time.monotonic() - self.load_start_time
+        self.add_log(f"负载生成停止：{elapsed:.1f}秒内创建{self.load_spawned}个进程，"
+                     f"拒绝{self.load_rejected}个到达（超出进程上限，按虚拟时间计），"
+                     f"累计{self.transition_count}次状态转换", "black")
+
+    def load_tick(self):
+        """按泊松过程生成本时间片（虚拟时间）内到达的进程
+
+        准入控制：存活进程（就绪+运行+等待I/O）达到进程上限后拒绝新到达并计数，
+        到达率超过调度吞吐时总量不会无限增长。到达数按虚拟时间计算，
+        高倍速/不限速时拒绝数反映的是虚拟时间内的超额到达。
+        """
+        now = SIM_CLOCK.now()
+        dt = now - self.load_last_tick
+        self.load_last_tick = now
+        arrivals = int(self.rng.poisson(self.load_spins["rate"].value() * dt))
+        total = self.load_spins["total"].value()
+        if total:
+            arrivals = min(arrivals, total - self.load_spawned - self.load_backlog)
+            if (arrivals <= 0 and not self.load_backlog
+                    and not self.simulator.live_count and not self.ready_queue):
+                self.stop_load()  # 已达总数且全部进程结束
+                return
+        pending = self.load_backlog + max(arrivals, 0)
+        room = self.load_spins["max_live"].value() - self.simulator.live_count - len(self.ready_queue)
+        admitted = min(pending, max(room, 0))
+        self.load_rejected += pending - admitted
+        # 高倍速/不限速时单次创建数封顶，避免一次性压入过多进程卡住界面；
+        # 超出部分已被准入，顺延到下一次创建而不计入拒绝
+        n = min(admitted, self.max_spawn_per_tick)
+        self.load_backlog = admitted - n
+        if n > 0:
+            self.spawn_processes(n)
+            self.load_spawned += n
+            self.auto_schedule()
+            self.request_redraw()
+
+    def sample_stats(self):
+        """采样吞吐（约1秒窗口的状态转换速率）与队列长度"""
+        now = time.monotonic()
+        self.rate_samples.append((now, self.transition_count))
+        t0, c0 = self.rate_samples[0]
+        rate = (self.transition_count - c0) / (now - t0) if now > t0 else 0.0
+        busy = sum(pid is not None for pid in self.cores)
+        self.history.append((now - self.load_start_time, len(self.ready_queue),
+                             len(self.blocked_queue), busy))
+        self.throughput_label.setText(
+            f"吞吐：{rate:.0f}次状态转换/秒  就绪{len(self.ready_queue)}  阻塞{len(self.blocked_queue)}  "
+            f"运行{busy}/{len(self.cores)}核  累计转换{self.transition_count}次  终止{self.terminated_count}个  "
+            f"拒绝{self.load_rejected}个（虚拟时间到达）"
+        )
+        self.update_history_plot()
+
+    def update_history_plot(self):
+        """更新队列长度曲线（只改数据与坐标范围）"""
+        if not self.history:
+            return
+        data = np.array(self.history, dtype=np.float64)
+        t = data[:, 0]
+        for col, state in enumerate(("就绪", "阻塞", "运行"), 1):
+            self.history_lines[state].set_data(t, data[:, col])
+        self.history_ax.set_xlim(t[0], max(t[-1], t[0] + 1))
+        self.history_ax.set_ylim(0, max(data[:, 1:].max() * 1.1, 1))
+        self.history_canvas.draw_idle()
+
+    # ---------------- 模拟驱动回调 ----------------
     def on_process_state_change(self, pid, new_state):
-        """进程状态变更回调（更新UI）"""
+        """进程状态变更回调（负载模式下不逐条记录）"""
+        if self.load_running:
+            return
         self.add_log(f"进程{pid}状态变更：{new_state}", new_state)
-        self.update_text_labels()
-        self.plot_process_states()
+        self.request_redraw()
+
+    def on_process_blocked(self, pid):
+        """运行中进程发起I/O：让出核，进入阻塞队列等待I/O完成"""
+        if pid not in self.cores:
+            return
+        self.cores[self.cores.index(pid)] = None
+        self.blocked_queue[pid] = None
+        self.transition_count += 1
+        self.simulator.sleep(pid, self.rng.exponential(self.load_spins["io_ms"].value() / 1000))
+        self.request_redraw()
+        if not self.load_running:
+            self.add_log(f"进程{pid}等待I/O：运行→阻塞", "阻塞")
+        self.auto_schedule()
+
+    def on_process_woken(self, pid):
+        """I/O完成：阻塞→就绪"""
+        if pid not in self.blocked_queue:
+            return  # 已被手动唤醒
+        del self.blocked_queue[pid]
+        self.enqueue_ready(pid)
+        self.transition_count += 1
+        self.request_redraw()
+        if not self.load_running:
+            self.add_log(f"进程{pid}I/O完成：阻塞→就绪", "就绪")
+        self.auto_schedule()
 
     def on_process_finished(self, pid):
         """进程终止回调"""
+        if pid not in self.cores:
+            return  # 已被阻塞/抢占
         # 从运行区移除，加入终止列表
-        self.running_process = None
+        self.cores[self.cores.index(pid)] = None
+        self.last_core.pop(pid, None)
         self.terminated_processes.append(pid)
-        # 停止进程线程
-        self.process_threads[pid].stop()
+        self.terminated_count += 1
+        self.transition_count += 1
         # 更新UI
-        self.update_text_labels()
-        self.plot_process_states()
-        self.add_log(f"进程{pid}运行结束：运行→终止", "终止")
+        self.request_redraw()
+        if not self.load_running:
+            self.add_log(f"进程{pid}运行结束：运行→终止", "终止")
+        self.auto_schedule()
+
+# ======================== 模块2：进程间通信（IPC）- 管道/队列/共享内存/套接字 ========================
+def format_bytes(n):
+    """字节数转可读字符串"""
+    for unit in ("B", "KB", "MB"):
+        if abs(n) < 1024:
+            return f"{n:.1f} {unit}" if unit != "B" else f"{n:.0f} B"
+        n /= 1024
+    return f"{n:.1f} GB"
 
-# ======================== 模块2：进程间通信（IPC）- 管道（修复除以0错误） ========================
 class IPCProducerThread(QThread):
-    """生产者线程（通过信号传递数据到主线程）"""
+    """生产者监控线程：管理生产者进程，把它的汇报通过信号传递到主线程"""
     send_signal = pyqtSignal(str)  # 发送数据信号
     count_signal = pyqtSignal(int) # 计数更新信号
-    speed_signal = pyqtSignal(str) # 速率更新信号
+    rate_signal = pyqtSignal(float, float, float)  # 发送速率：1秒窗口/10秒窗口/全程平均（条/秒）
     finished_signal = pyqtSignal() # 结束信号
 
-    def __init__(self, parent=None):
+    def __init__(self, endpoint, msg_size, batch, stop_event, exited_event, parent=None):
         super().__init__(parent)
         self.running = False
         self.data_count = 0
-        self.start_time = 0
+        self.exited_event = exited_event  # 进程退出后置位，通知消费者端点不再等待
+        self.start_ns = 0
+        # 速率按生产者进程汇报中的 perf_counter_ns 时刻计算（单调时钟，跨进程可比）
+        self.rate_1s = ipc_transport.SlidingRate(1)
+        self.rate_10s = ipc_transport.SlidingRate(10)
+        self.stop_event = stop_event
+        # 发送节奏（批/秒，0为不限速），由全局模拟时钟换算后共享给子进程
+        self.pace = multiprocessing.Value("d", 0.0, lock=False)
+        self.status = multiprocessing.Queue()
+        self.process = multiprocessing.Process(
+            target=ipc_transport.producer_main,
+            args=(endpoint, msg_size, batch, self.pace, stop_event, self.status),
+            daemon=True,
+        )
+
+    def sync_pace(self):
+        """1×时每模拟秒发送1批；不限速时尽快发送"""
+        self.pace.value = 0.0 if SIM_CLOCK.unthrottled else SIM_CLOCK.speed
+
+    def start_process(self):
+        self.sync_pace()
+        self.process.start()
 
     def run(self):
-        """线程执行逻辑（修复除以0错误）"""
+        """转发生产者进程的汇报，直到进程退出且汇报取完"""
         self.running = True
-        self.start_time = time.time()
-        count = 0
-        while self.running:
-            count += 1
-            data = f"Data-{count}"
-            # 发送数据信号（主线程处理）
-            self.send_signal.emit(f"生产者发送：{data}")
-            self.data_count += 1
+        self.start_ns = time.perf_counter_ns()
+        self.rate_1s.add(self.start_ns, 0)
+        self.rate_10s.add(self.start_ns, 0)
+        last_seq = -1
+        while True:
+            try:
+                _, sent, _, seq, t_ns = self.status.get(timeout=0.1)
+            except queue.Empty:
+                if not self.process.is_alive() and self.status.empty():
+                    break
+                self.sync_pace()
+                continue
+            self.sync_pace()
+            self.data_count = sent
+            self.rate_1s.add(t_ns, sent)
+            self.rate_10s.add(t_ns, sent)
+            elapsed_ns = t_ns - self.start_ns
+            self.rate_signal.emit(
+                self.rate_1s.rate(), self.rate_10s.rate(), sent * 1e9 / elapsed_ns if elapsed_ns > 0 else 0.0
+            )
+            if seq == last_seq:
+                continue
+            if seq == last_seq + 1:
+                self.send_signal.emit(f"生产者发送：Data-{seq + 1}")
+            else:
+                self.send_signal.emit(f"生产者发送：Data-{last_seq + 2} ~ Data-{seq + 1}（共{seq - last_seq}条）")
+            last_seq = seq
             # 更新计数
             self.count_signal.emit(self.data_count)
-            
-            # ========== 核心修复：避免除以0 ==========
-            elapsed = time.time() - self.start_time
-            # 防止elapsed为0，设置极小值兜底
-            if elapsed <= 1e-6:
-                speed = "传输速率：0.0 条/秒"
-            else:
-                speed = f"传输速率：{self.data_count/elapsed:.1f} 条/秒"
-            self.speed_signal.emit(speed)
-            
-            time.sleep(1)
+        self.process.join()
+        self.exited_event.set()
         self.finished_signal.emit()
 
     def stop(self):
+        """通知生产者进程停止（进程关闭传输端点后消费者随之结束）"""
         self.running = False
+        self.stop_event.set()
 
 class IPCConsumerThread(QThread):
-    """消费者线程"""
+    """消费者监控线程：管理消费者进程，统计真实吞吐量与端到端延迟"""
     recv_signal = pyqtSignal(str)  # 接收数据信号
+    throughput_signal = pyqtSignal(float, float, float)  # 1秒窗口 (消息/秒, 字节/秒)，10秒窗口消息/秒
+    latency_signal = pyqtSignal(float, float, float)  # 最近5秒延迟 P50/P95/P99（微秒）
+    histogram_signal = pyqtSignal(object)  # 最近5秒延迟直方图计数（LatencyHistogram桶）
     finished_signal = pyqtSignal() # 结束信号
 
-    def __init__(self, parent=None):
+    def __init__(self, endpoint, msg_size, batch, exited_event, parent=None):
         super().__init__(parent)
         self.running = False
+        self.exited_event = exited_event  # 进程退出后置位，通知生产者端点不再等待
+        self.recv_count = 0
+        self.recv_bytes = 0
+        self.status = multiprocessing.Queue()
+        self.process = multiprocessing.Process(
+            target=ipc_transport.consumer_main,
+            args=(endpoint, msg_size, batch, self.status),
+            daemon=True,
+        )
+        self.rate_1s = ipc_transport.SlidingRate(1)
+        self.bytes_1s = ipc_transport.SlidingRate(1)
+        self.rate_10s = ipc_transport.SlidingRate(10)
+        # 延迟直方图：全程累计 + 最近50次汇报（约5秒）的滑动窗口
+        self.latency_hist = ipc_transport.LatencyHistogram()
+        self.window_hist = ipc_transport.LatencyHistogram()
+        self.window_deltas = deque()
+
+    def start_process(self):
+        self.process.start()
 
     def run(self):
+        """转发消费者进程的汇报，直到对端关闭后进程退出"""
         self.running = True
-        count = 0
-        while self.running:
-            count += 1
-            data = f"Data-{count}"  # 模拟从管道接收（保留核心逻辑）
-            self.recv_signal.emit(f"消费者接收：{data}")
-            time.sleep(1)
+        while True:
+            try:
+                _, received, nbytes, first, last, lat, t_ns = self.status.get(timeout=0.1)
+            except queue.Empty:
+                if not self.process.is_alive() and self.status.empty():
+                    break
+                continue
+            self.rate_1s.add(t_ns, received)
+            self.bytes_1s.add(t_ns, nbytes)
+            self.rate_10s.add(t_ns, received)
+            if first is not None:
+                if first == last:
+                    self.recv_signal.emit(f"消费者接收：Data-{last + 1}")
+                else:
+                    self.recv_signal.emit(f"消费者接收：Data-{first + 1} ~ Data-{last + 1}（共{last - first + 1}条）")
+            self.recv_count, self.recv_bytes = received, nbytes
+            self.throughput_signal.emit(self.rate_1s.rate(), self.bytes_1s.rate(), self.rate_10s.rate())
+            self.latency_hist.add(lat)
+            self.window_hist.add(lat)
+            self.window_deltas.append(lat)
+            if len(self.window_deltas) > 50:
+                self.window_hist.subtract(self.window_deltas.popleft())
+            if self.window_hist.total:
+                p50, p95, p99 = self.window_hist.percentiles((50, 95, 99)) / 1000
+                self.latency_signal.emit(p50, p95, p99)
+                self.histogram_signal.emit(self.window_hist.counts.copy())
+        self.process.join()
+        self.exited_event.set()
         self.finished_signal.emit()
 
     def stop(self):
+        # 消费者在对端关闭（EOF）后自行结束，保证取完所有在途数据
+        self.running = False
+
+class IPCBenchmarkThread(QThread):
+    """传输基准测试线程：在后台依次启动各传输方式的生产者/消费者进程，逐用例回报结果"""
+    row_signal = pyqtSignal(dict)      # 单个用例结果
+    result_signal = pyqtSignal(list)   # 全部结果
+    error_signal = pyqtSignal(str)
+
+    def __init__(self, transports, parent=None):
+        super().__init__(parent)
+        self.transports = transports
+        self.running = False
+
+    def run(self):
+        self.running = True
+        try:
+            rows = ipc_transport.run_benchmark(
+                self.transports, progress=self.row_signal.emit, should_stop=lambda: not self.running
+            )
+        except Exception as e:
+            self.error_signal.emit(str(e))
+            return
+        self.result_signal.emit(rows)
+
+    def stop(self):
+        """当前传输方式的用例跑完后停止"""
         self.running = False
 
 class IPCVisualization(QWidget):
@@ -397,7 +1249,37 @@ class IPCVisualization(QWidget):
         self.data_count = 0
         self.producer_thread = None
         self.consumer_thread = None
+        self.transport = None
+        self.ipc_active = False  # 已启动且尚未停止（进程异常退出后仍需停止以释放传输通道）
+        self.bench_thread = None
+        self.bench_rows = []
+        # 零拷贝环槽位占用图（按帧读取共享内存控制块，仅在发布/归还计数变化时重绘）
+        self.ring_rects = []
+        self.ring_state = None
+        self.ring_timer = QTimer(self)
+        self.ring_timer.setInterval(int(UI_EMIT_INTERVAL * 1000))
+        self.ring_timer.timeout.connect(self.update_ring_view)
+        # 速率曲线/延迟分布：信号只记录数据，按5帧/秒合并重绘
+        self.rate_history = {"sent": deque(maxlen=600), "recv": deque(maxlen=600)}
+        self.latency_counts = None
+        self.metrics_dirty = False
+        self.metrics_start = 0.0
+        self.metrics_timer = QTimer(self)
+        self.metrics_timer.setInterval(200)
+        self.metrics_timer.timeout.connect(self.update_metrics_plot)
         self.flow_timer = QTimer()
+        # 每秒实测生产/消费速率
+        self.produce_meter = RateMeter()
+        self.consume_meter = RateMeter()
+        self.ops_timer = QTimer(self)
+        self.ops_timer.setInterval(1000)
+        self.ops_timer.timeout.connect(self.update_ops_label)
+        # 停止过程：定时检查监控线程是否退出，超时则terminate再kill进程（不阻塞界面）
+        self.stop_requested = 0.0
+        self.stop_escalation = 0  # 0 正常等待，1 已terminate，2 已kill
+        self.stop_timer = QTimer(self)
+        self.stop_timer.setInterval(20)
+        self.stop_timer.timeout.connect(self.poll_stop)
         # 初始化UI
         self.init_ui()
 
@@ -406,7 +1288,7 @@ class IPCVisualization(QWidget):
         
         # 控制按钮
         btn_layout = QHBoxLayout()
-        self.start_btn = QPushButton("启动生产者-消费者（管道IPC）")
+        self.start_btn = QPushButton("启动生产者-消费者（进程IPC）")
         self.start_btn.clicked.connect(self.start_ipc)
         self.stop_btn = QPushButton("停止IPC")
         self.stop_btn.clicked.connect(self.stop_ipc)
@@ -414,6 +1296,37 @@ class IPCVisualization(QWidget):
         btn_layout.addWidget(self.stop_btn)
         layout.addLayout(btn_layout)
 
+        # 传输参数：传输方式、消息大小与批量（每次发送的消息条数）
+        param_layout = QHBoxLayout()
+        param_layout.addWidget(QLabel("传输方式："))
+        self.transport_combo = QComboBox()
+        for kind in ipc_transport.TRANSPORTS:
+            self.transport_combo.addItem(ipc_transport.TRANSPORT_NAMES[kind], kind)
+        param_layout.addWidget(self.transport_combo)
+        param_layout.addWidget(QLabel("消息大小："))
+        self.msg_size_spin = QSpinBox()
+        self.msg_size_spin.setRange(ipc_transport.MIN_MSG_SIZE, ipc_transport.MAX_MSG_SIZE)
+        self.msg_size_spin.setValue(64)
+        self.msg_size_spin.setSuffix(" B")
+        param_layout.addWidget(self.msg_size_spin)
+        param_layout.addWidget(QLabel("批量："))
+        self.batch_spin = QSpinBox()
+        self.batch_spin.setRange(1, 10000)
+        self.batch_spin.setValue(1)
+        self.batch_spin.setSuffix(" 条/次")
+        param_layout.addWidget(self.batch_spin)
+        param_layout.addWidget(QLabel("槽位数："))
+        self.slots_spin = QSpinBox()
+        self.slots_spin.setRange(2, 64)
+        self.slots_spin.setValue(8)
+        self.slots_spin.setToolTip("队列容量 / 共享内存环的槽位数")
+        param_layout.addWidget(self.slots_spin)
+        param_layout.addStretch()
+        self.bench_btn = QPushButton("运行传输基准测试")
+        self.bench_btn.clicked.connect(self.toggle_benchmark)
+        param_layout.addWidget(self.bench_btn)
+        layout.addLayout(param_layout)
+
         # 数据流可视化区
         flow_layout = QHBoxLayout()
         self.producer_label = QLabel("生产者：等待启动")
@@ -429,14 +1342,41 @@ class IPCVisualization(QWidget):
 
         # 统计区
         self.data_label = QLabel(f"已传输数据量：{self.data_count} 条")
-        self.speed_label = QLabel("传输速率：0 条/秒")
+        self.speed_label = QLabel("发送速率：1秒窗口 0 条/秒  10秒窗口 0 条/秒  全程平均 0 条/秒")
+        self.ops_label = QLabel("实测：生产 0 条/秒  消费 0 条/秒")
+        self.throughput_label = QLabel("传输吞吐（消费端实测）：0 条/秒  0 B/秒")
+        self.latency_label = QLabel("端到端延迟：暂无数据")
         layout.addWidget(self.data_label)
         layout.addWidget(self.speed_label)
+        layout.addWidget(self.ops_label)
+        layout.addWidget(self.throughput_label)
+        layout.addWidget(self.latency_label)
+
+        # 实时速率曲线（发送/接收的1秒窗口速率，最近60秒）与最近5秒的延迟分布
+        self.metrics_figure = plt.Figure(figsize=(10, 2), dpi=100)
+        self.metrics_canvas = FigureCanvas(self.metrics_figure)
+        self.setup_metrics_plot()
+        layout.addWidget(self.metrics_canvas)
+
+        # 零拷贝环槽位占用（仅零拷贝共享内存环运行时显示）
+        self.ring_figure = plt.Figure(figsize=(10, 1.2), dpi=100)
+        self.ring_canvas = FigureCanvas(self.ring_figure)
+        self.ring_canvas.setVisible(False)
+        layout.addWidget(self.ring_canvas)
+
+        # 基准测试曲线（左：吞吐量，右：P50延迟；颜色区分传输方式，线型区分批量），首次运行时显示
+        self.bench_figure = plt.Figure(figsize=(10, 3), dpi=100)
+        self.bench_canvas = FigureCanvas(self.bench_figure)
+        self.bench_canvas.setVisible(False)
+        layout.addWidget(self.bench_canvas)
 
         # 日志区
         self.log_label = QLabel("<b>IPC传输日志</b>")
-        self.log = QTextEdit()
-        self.log.setReadOnly(True)
+        self.log = LogView({
+            "green": QColor(0, 128, 0),
+            "blue": QColor(0, 0, 255),
+            "red": QColor(255, 0, 0),
+        })
         layout.addWidget(self.log_label)
         layout.addWidget(self.log)
 
@@ -446,20 +1386,8 @@ class IPCVisualization(QWidget):
         self.setLayout(layout)
 
     def add_log(self, text, color="black"):
-        """主线程安全更新日志（Windows兼容）"""
-        format_char = QTextCharFormat()
-        color_map = {
-            "green": QColor(0, 128, 0),
-            "blue": QColor(0, 0, 255),
-            "red": QColor(255, 0, 0),
-            "black": QColor(0, 0, 0)
-        }
-        format_char.setForeground(color_map.get(color, QColor(0,0,0)))
-        cursor = self.log.textCursor()
-        cursor.movePosition(cursor.End)
-        cursor.insertText(f"[{time.strftime('%H:%M:%S')}] {text}\n", format_char)
-        self.log.setTextCursor(cursor)
-        self.log.ensureCursorVisible()
+        """主线程更新日志（按帧批量写入）"""
+        self.log.append(text, color)
 
     def update_flow_ani(self):
         """数据流动画：切换箭头样式"""
@@ -470,116 +1398,434 @@ class IPCVisualization(QWidget):
 
     def start_ipc(self):
         """启动IPC（主线程安全创建线程，Windows兼容）"""
-        if self.producer_thread and self.producer_thread.isRunning():
+        if self.ipc_active:
             self.add_log("IPC已在运行中！", "red")
             return
         
-        # 初始化线程
-        self.producer_thread = IPCProducerThread()
-        self.consumer_thread = IPCConsumerThread()
+        if self.bench_thread and self.bench_thread.isRunning():
+            self.add_log("基准测试运行中，请等待结束后再启动！", "red")
+            return
+
+        # 创建传输通道与生产者/消费者进程（各由一个监控线程管理）
+        msg_size, batch = self.msg_size_spin.value(), self.batch_spin.value()
+        kind = self.transport_combo.currentData()
+        try:
+            self.transport = ipc_transport.Transport(kind, msg_size * batch, self.slots_spin.value())
+        except (ValueError, OSError) as e:
+            self.add_log(f"创建传输通道失败：{e}", "red")
+            return
+        self.producer_thread = IPCProducerThread(
+            self.transport.sender, msg_size, batch, multiprocessing.Event(), self.transport.sender_gone
+        )
+        self.consumer_thread = IPCConsumerThread(
+            self.transport.receiver, msg_size, batch, self.transport.receiver_gone
+        )
 
         # 绑定信号槽（核心：线程信号触发主线程UI更新）
         self.producer_thread.send_signal.connect(lambda msg: self.add_log(msg, "green"))
         self.producer_thread.count_signal.connect(self.update_data_count)
-        self.producer_thread.speed_signal.connect(self.update_speed)
+        self.producer_thread.rate_signal.connect(self.update_speed)
         self.consumer_thread.recv_signal.connect(lambda msg: self.add_log(msg, "blue"))
-
-        # 启动线程
+        self.consumer_thread.throughput_signal.connect(self.update_throughput)
+        self.consumer_thread.latency_signal.connect(self.update_latency)
+        self.consumer_thread.histogram_signal.connect(self.update_latency_histogram)
+
+        # 启动进程后关闭本进程持有的端点副本，生产者关闭时消费者才能收到EOF
+        self.consumer_thread.start_process()
+        self.producer_thread.start_process()
+        self.transport.detach()
         self.producer_thread.start()
         self.consumer_thread.start()
+        self.ipc_active = True
+        self.set_params_enabled(False)
         self.flow_timer.start(500)
+        self.produce_meter = RateMeter()
+        self.consume_meter = RateMeter()
+        self.update_ops_label()
+        self.ops_timer.start()
+        for history in self.rate_history.values():
+            history.clear()
+        self.latency_counts = None
+        self.metrics_start = time.perf_counter()
+        self.metrics_timer.start()
+        if kind == "shm_zc":
+            self.setup_ring_view(self.transport.slots)
+            self.ring_timer.start()
+        self.ring_canvas.setVisible(kind == "shm_zc")
         
         # 更新UI
         self.producer_label.setText("生产者：运行中")
         self.consumer_label.setText("消费者：运行中")
-        self.add_log("启动生产者-消费者IPC（管道）", "black")
+        self.add_log(
+            f"启动生产者-消费者IPC（{ipc_transport.TRANSPORT_NAMES[kind]}，消息{msg_size}B，每批{batch}条）", "black"
+        )
 
     def stop_ipc(self):
-        """停止IPC（Windows线程安全停止）"""
-        if not self.producer_thread or not self.producer_thread.isRunning():
+        """停止IPC（Windows线程安全停止）：通知停止后由 stop_timer 等待退出，界面不阻塞"""
+        if self.stop_timer.isActive():
+            return
+        if not self.ipc_active:
             self.add_log("IPC未运行！", "red")
             return
-        
-        # 停止线程
+
+        self.stop_requested = time.perf_counter()
+        self.stop_escalation = 0
         self.producer_thread.stop()
         self.consumer_thread.stop()
+        self.start_btn.setEnabled(False)
+        self.stop_btn.setEnabled(False)
+        self.stop_timer.start()
+
+    def poll_stop(self):
+        """等待两个监控线程退出；进程超过 JOIN_TIMEOUT 仍未退出则terminate，再超时则kill"""
+        running = [(role, thread) for role, thread in (("生产者", self.producer_thread),
+                                                       ("消费者", self.consumer_thread))
+                   if thread.isRunning()]
+        if running:
+            level = int((time.perf_counter() - self.stop_requested) // ipc_transport.JOIN_TIMEOUT)
+            if level > self.stop_escalation and self.stop_escalation < 2:
+                self.stop_escalation += 1
+                for role, thread in running:
+                    self.add_log(f"{role}进程未在{ipc_transport.JOIN_TIMEOUT:g}秒内退出，已强制终止", "red")
+                    if self.stop_escalation == 2:
+                        thread.process.kill()
+                    else:
+                        thread.process.terminate()
+            return
+        self.stop_timer.stop()
         self.producer_thread.wait()
         self.consumer_thread.wait()
+        self.start_btn.setEnabled(True)
+        self.stop_btn.setEnabled(True)
+        self.finish_stop()
+
+    def finish_stop(self):
+        """两端进程均已退出：释放传输通道并输出本次统计"""
+        self.ring_timer.stop()
+        self.update_ring_view()
+        self.metrics_timer.stop()
+        self.update_metrics_plot()
+        self.transport.release()
+        self.ipc_active = False
         self.flow_timer.stop()
+        self.ops_timer.stop()
+        self.set_params_enabled(True)
         
         # 更新UI
         self.producer_label.setText("生产者：已停止")
         self.consumer_label.setText("消费者：已停止")
-        self.add_log(f"停止IPC模拟，总计传输：{self.data_count} 条数据", "red")
+        self.add_log(
+            f"停止IPC：生产者发送{self.producer_thread.data_count}条，消费者接收"
+            f"{self.consumer_thread.recv_count}条（{format_bytes(self.consumer_thread.recv_bytes)}）", "red"
+        )
+        hist = self.consumer_thread.latency_hist
+        if hist.total:
+            p50, p99, p999 = hist.percentiles((50, 99, 99.9)) / 1000
+            self.add_log(f"全程端到端延迟（{hist.total}条）：P50 {p50:,.0f}µs  P99 {p99:,.0f}µs  P99.9 {p999:,.0f}µs", "red")
+
+    def set_params_enabled(self, enabled):
+        self.transport_combo.setEnabled(enabled)
+        self.msg_size_spin.setEnabled(enabled)
+        self.batch_spin.setEnabled(enabled)
+        self.slots_spin.setEnabled(enabled)
+
+    def setup_ring_view(self, slots):
+        """创建零拷贝环的槽位图形（之后只改颜色与文字）"""
+        self.ring_figure.clear()
+        ax = self.ring_figure.add_subplot(111)
+        ax.set_xlim(0, slots * 2)
+        ax.set_ylim(0, 2.4)
+        ax.axis('off')
+        self.ring_rects = []
+        for idx in range(slots):
+            rect = patches.Rectangle((idx * 2 + 0.2, 0.3), 1.6, 1.2,
+                                     facecolor='#D3D3D3', edgecolor='black', linewidth=1)
+            ax.add_patch(rect)
+            self.ring_rects.append(rect)
+        self.ring_text = ax.text(slots, 2.0, '', ha='center', va='center', fontsize=10)
+        self.ring_state = None
+
+    def update_ring_view(self):
+        """零拷贝环槽位占用：读取发布/归还计数，已发布未归还的槽位标绿"""
+        occupancy = self.transport.occupancy() if self.transport else None
+        if occupancy is None or not self.ring_rects:
+            return
+        written, read = occupancy
+        slots = len(self.ring_rects)
+        state = (written, read)
+        if state == self.ring_state:
+            return
+        self.ring_state = state
+        filled = written - read
+        occupied = {(read + k) % slots for k in range(filled)}
+        for idx, rect in enumerate(self.ring_rects):
+            rect.set_facecolor('#90EE90' if idx in occupied else '#D3D3D3')
+        self.ring_text.set_text(
+            f"零拷贝环：占用 {filled}/{slots} 槽  写指针 {written % slots}  读指针 {read % slots}  累计发布 {written} 帧"
+        )
+        self.ring_canvas.draw_idle()
+
+    def toggle_benchmark(self):
+        """启动/停止传输基准测试（各传输方式 × 消息大小 × 批量，不限速）"""
+        if self.bench_thread and self.bench_thread.isRunning():
+            self.bench_thread.stop()
+            self.bench_btn.setEnabled(False)
+            self.add_log("基准测试将在当前传输方式完成后停止", "red")
+            return
+        if self.ipc_active:
+            self.add_log("请先停止IPC再运行基准测试！", "red")
+            return
+        self.bench_rows = []
+        self.bench_thread = IPCBenchmarkThread(ipc_transport.TRANSPORTS)
+        self.bench_thread.row_signal.connect(self.on_bench_row)
+        self.bench_thread.result_signal.connect(self.on_bench_finished)
+        self.bench_thread.error_signal.connect(self.on_bench_error)
+        self.bench_thread.start()
+        self.start_btn.setEnabled(False)
+        self.set_params_enabled(False)
+        self.bench_btn.setText("停止基准测试")
+        self.bench_canvas.setVisible(True)
+        self.add_log(
+            f"开始传输基准测试：{'/'.join(ipc_transport.TRANSPORT_NAMES[k] for k in ipc_transport.TRANSPORTS)}，"
+            f"消息{format_bytes(ipc_transport.DEFAULT_SIZES[0])}~{format_bytes(ipc_transport.DEFAULT_SIZES[-1])}，"
+            f"批量{'/'.join(map(str, ipc_transport.DEFAULT_BATCHES))}", "black"
+        )
+
+    def on_bench_row(self, row):
+        self.bench_rows.append(row)
+        self.add_log(
+            f"[{ipc_transport.TRANSPORT_NAMES[row['transport']]}] {format_bytes(row['msg_size'])} × {row['batch']}："
+            f"{row['msgs_per_sec']:,.0f} 条/秒  {format_bytes(row['bytes_per_sec'])}/秒  "
+            f"P50 {row['p50_us']:,.0f}µs  P99 {row['p99_us']:,.0f}µs", "blue"
+        )
+        self.plot_benchmark()
+
+    def on_bench_finished(self, rows):
+        self.finish_benchmark()
+        self.add_log(f"基准测试完成，共{len(rows)}个用例", "green")
+
+    def on_bench_error(self, message):
+        self.finish_benchmark()
+        self.add_log(f"基准测试失败：{message}", "red")
+
+    def finish_benchmark(self):
+        self.bench_btn.setText("运行传输基准测试")
+        self.bench_btn.setEnabled(True)
+        self.start_btn.setEnabled(True)
+        self.set_params_enabled(True)
+
+    def plot_benchmark(self):
+        """吞吐量/延迟随消息大小变化的曲线（双对数坐标）"""
+        self.bench_figure.clear()
+        ax_rate = self.bench_figure.add_subplot(1, 2, 1)
+        ax_lat = self.bench_figure.add_subplot(1, 2, 2)
+        styles = ("-", "--", ":", "-.")
+        colors = plt.rcParams["axes.prop_cycle"].by_key()["color"]
+        series = {}
+        for row in self.bench_rows:
+            series.setdefault((row["transport"], row["batch"]), []).append(row)
+        batches = sorted({batch for _, batch in series})
+        for (kind, batch), rows in series.items():
+            sizes = [r["msg_size"] for r in rows]
+            style = dict(
+                color=colors[ipc_transport.TRANSPORTS.index(kind) % len(colors)],
+                linestyle=styles[batches.index(batch) % len(styles)], marker="o", markersize=3,
+                label=f"{ipc_transport.TRANSPORT_NAMES[kind]} ×{batch}",
+            )
+            ax_rate.plot(sizes, [r["bytes_per_sec"] / (1 << 20) for r in rows], **style)
+            ax_lat.plot(sizes, [r["p50_us"] for r in rows], **style)
+        for ax, ylabel in ((ax_rate, "吞吐量（MB/秒）"), (ax_lat, "P50延迟（µs）")):
+            ax.set_xscale("log", base=2)
+            ax.set_yscale("log")
+            ax.set_xlabel("消息大小（字节）")
+            ax.set_ylabel(ylabel)
+            ax.grid(True, alpha=0.3)
+        ax_lat.legend(fontsize=7, ncol=2, loc="upper left")
+        self.bench_figure.tight_layout()
+        self.bench_canvas.draw_idle()
+
+    def update_ops_label(self):
+        """实测生产/消费速率（每秒取样）"""
+        produced = self.produce_meter.sample(self.producer_thread.data_count)
+        consumed = self.consume_meter.sample(self.consumer_thread.recv_count)
+        self.ops_label.setText(f"实测：生产 {produced:.0f} 条/秒  消费 {consumed:.0f} 条/秒")
+
+    def update_throughput(self, msgs_per_sec, bytes_per_sec, msgs_per_sec_10s):
+        """消费端实测吞吐（1秒/10秒滑动窗口）"""
+        self.throughput_label.setText(
+            f"{ipc_transport.TRANSPORT_NAMES[self.transport.kind]}吞吐（消费端实测）：1秒窗口 {msgs_per_sec:,.0f} 条/秒"
+            f"  {format_bytes(bytes_per_sec)}/秒  10秒窗口 {msgs_per_sec_10s:,.0f} 条/秒"
+        )
+        self.record_rate("recv", msgs_per_sec)
+
+    def record_rate(self, key, rate):
+        self.rate_history[key].append((time.perf_counter() - self.metrics_start, rate))
+        self.metrics_dirty = True
+
+    def update_latency_histogram(self, counts):
+        self.latency_counts = counts
+        self.metrics_dirty = True
+
+    def setup_metrics_plot(self):
+        """创建速率曲线与延迟分布的坐标轴和线条（之后只更新数据）"""
+        self.metrics_figure.clear()
+        self.rate_ax = self.metrics_figure.add_subplot(1, 2, 1)
+        self.hist_ax = self.metrics_figure.add_subplot(1, 2, 2)
+        self.rate_lines = {
+            "sent": self.rate_ax.plot([], [], color="#2E8B57", label="发送")[0],
+            "recv": self.rate_ax.plot([], [], color="#4169E1", label="接收")[0],
+        }
+        self.rate_ax.set_ylabel("条/秒（1秒窗口）", fontsize=8)
+        self.rate_ax.legend(fontsize=7, loc="upper left")
+        self.rate_ax.tick_params(labelsize=7)
+        self.hist_line = self.hist_ax.step([], [], where="post", color="#FF8C00")[0]
+        self.hist_ax.set_xscale("log")
+        self.hist_ax.set_xlabel("端到端延迟（µs，最近5秒）", fontsize=8)
+        self.hist_ax.tick_params(labelsize=7)
+        self.metrics_figure.tight_layout()
+        self.bucket_low, self.bucket_width = ipc_transport.LatencyHistogram.bucket_bounds()
+
+    def update_metrics_plot(self):
+        """按帧合并重绘：速率曲线滚动显示最近60秒，延迟分布只画有数据的桶区间"""
+        if not self.metrics_dirty:
+            return
+        self.metrics_dirty = False
+        now = time.perf_counter() - self.metrics_start
+        top = 1.0
+        for key, line in self.rate_lines.items():
+            history = self.rate_history[key]
+            if history:
+                xs, ys = zip(*history)
+                line.set_data(xs, ys)
+                top = max(top, max(ys))
+            else:
+                line.set_data([], [])
+        self.rate_ax.set_xlim(max(0.0, now - 60), max(now, 1.0))
+        self.rate_ax.set_ylim(0, top * 1.1)
+        counts = self.latency_counts
+        if counts is not None and counts.any():
+            nonzero = np.flatnonzero(counts)
+            lo, hi = max(nonzero[0], 1), nonzero[-1] + 1
+            edges = np.append(self.bucket_low[lo:hi], self.bucket_low[hi - 1] + self.bucket_width[hi - 1]) / 1000
+            # 桶宽随数值增长，按宽度归一化为密度，形状不受分桶方式影响
+            density = counts[lo:hi] / self.bucket_width[lo:hi]
+            self.hist_line.set_data(edges, np.append(density, density[-1]))
+            self.hist_ax.set_xlim(edges[0], edges[-1])
+            self.hist_ax.set_ylim(0, density.max() * 1.1)
+        self.metrics_canvas.draw_idle()
+
+    def update_latency(self, p50, p95, p99):
+        """端到端延迟分位数（由消息头时间戳计算，单位微秒）"""
+        self.latency_label.setText(f"端到端延迟：P50 {p50:,.0f}µs  P95 {p95:,.0f}µs  P99 {p99:,.0f}µs")
 
     def update_data_count(self, count):
         """更新数据计数（信号触发）"""
         self.data_count = count
         self.data_label.setText(f"已传输数据量：{self.data_count} 条")
 
-    def update_speed(self, speed):
-        """更新速率（信号触发）"""
-        self.speed_label.setText(speed)
+    def update_speed(self, rate_1s, rate_10s, rate_avg):
+        """更新发送速率（信号触发）：滑动窗口速率能看出突发与停顿，全程平均仅供参考"""
+        self.speed_label.setText(
+            f"发送速率：1秒窗口 {rate_1s:,.0f} 条/秒  10秒窗口 {rate_10s:,.0f} 条/秒  全程平均 {rate_avg:,.0f} 条/秒"
+        )
+        self.record_rate("sent", rate_1s)
 
 # ======================== 模块3：基于信号量的进程同步（图形+文字结合） ========================
+class SharedRingBuffer:
+    """所有生产者/消费者共享的有界环形缓冲区，兼作界面取样的状态快照
+
+    槽位与读写下标只在持有mutex信号量时修改；信号量数值由计数器跟踪，
+    计数器的增减与快照读取在同一把短锁内完成，界面读到的 (empty, full, mutex)
+    总是某一时刻的一致值。日志用deque追加（GIL下原子），界面定时器按固定帧率
+    调用snapshot()取样，更新频率与模拟速度无关；两次取样之间日志超过上限时
+    丢弃最早的记录并计数，取样时一并返回。
+    """
+
+    def __init__(self, size, max_logs=2000):
+        self.size = size
+        self.slots = [None] * size
+        self.in_idx = 0
+        self.out_idx = 0
+        self.counters = {"empty": size, "full": 0, "mutex": 1}
+        self.lock = threading.Lock()
+        self.sem_version = 0
+        self.buffer_version = 0
+        self.logs = deque(maxlen=max_logs)  # 待界面取走的 (日志内容, 颜色)
+        self.dropped = 0                    # 界面取走前因超过上限而丢弃的条数
+
+    def adjust(self, which, delta):
+        """跟踪一次P/V操作，返回信号量的新值
+
+        P操作在acquire成功后调用，V操作在release之前调用，显示值不会低于0。
+        """
+        with self.lock:
+            self.counters[which] += delta
+            self.sem_version += 1
+            return self.counters[which]
+
+    def put(self, item):
+        """写入下一个空槽位（调用方持有mutex），返回槽位下标"""
+        index = self.in_idx
+        self.slots[index] = item
+        self.in_idx = (index + 1) % self.size
+        self.buffer_version += 1
+        return index
+
+    def get(self):
+        """取出下一个满槽位（调用方持有mutex），返回 (槽位下标, 数据)"""
+        index = self.out_idx
+        item, self.slots[index] = self.slots[index], None
+        self.out_idx = (index + 1) % self.size
+        self.buffer_version += 1
+        return index, item
+
+    @staticmethod
+    def label(item):
+        return item
+
+    def log(self, text, color="black"):
+        if len(self.logs) == self.logs.maxlen:
+            with self.lock:
+                self.dropped += 1
+        self.logs.append((text, color))
+
+    def snapshot(self):
+        """取样：(信号量版本, (empty, full, mutex), 缓冲区版本, 缓冲区副本, 新日志列表, 丢弃条数)"""
+        logs = []
+        while self.logs:
+            logs.append(self.logs.popleft())
+        with self.lock:
+            sem_version = self.sem_version
+            sems = (self.counters["empty"], self.counters["full"], self.counters["mutex"])
+            dropped, self.dropped = self.dropped, 0
+        buffer_version = self.buffer_version
+        return sem_version, sems, buffer_version, list(self.slots), logs, dropped
+
 class SemaphoreProducerThread(QThread):
     """信号量生产者线程（Windows兼容）"""
-    log_signal = pyqtSignal(str, str)  # (日志内容, 颜色)
-    sem_update_signal = pyqtSignal(int, int, int)  # (empty_val, full_val, mutex_val)
-    buffer_signal = pyqtSignal(list)  # 缓冲区数据
     finished_signal = pyqtSignal()
 
-    def __init__(self, empty, full, mutex, buffer_size, parent=None):
+    def __init__(self, index, empty, full, mutex, ring, parent=None):
         super().__init__(parent)
         self.running = False
-        self.empty = empty
-        self.full = full
-        self.mutex = mutex
-        self.buffer_size = buffer_size
-        self.buffer = [None]*buffer_size
-        self.in_idx = 0
-        # 手动跟踪信号量数值
-        self.empty_val = buffer_size
-        self.full_val = 0
-        self.mutex_val = 1
+        self.index = index
+        self.name = f"生产者{index}"
+        self.ring = ring    # 共享环形缓冲区（同时是界面取样的状态快照）
+        self.stats = sync_primitives.WorkerStats(self.name)
+        self.ops = 0        # 完成的生产/消费次数
+        self.sems = (empty, full, mutex)
 
     def run(self):
         self.running = True
+        running = lambda: self.running
         count = 0
         while self.running:
             count += 1
-            # P(empty)：申请空缓冲区
-            self.empty.acquire()
-            self.empty_val -= 1
-            self.log_signal.emit(f"生产者P(empty) → empty={self.empty_val}", "P")
-            self.sem_update_signal.emit(self.empty_val, self.full_val, self.mutex_val)
-
-            # P(mutex)：申请互斥锁
-            self.mutex.acquire()
-            self.mutex_val -= 1
-            self.log_signal.emit(f"生产者P(mutex) → mutex={self.mutex_val}", "P")
-            self.sem_update_signal.emit(self.empty_val, self.full_val, self.mutex_val)
-
-            # 生产数据并写入缓冲区
-            data = f"Item-{count}"
-            self.buffer[self.in_idx] = data
-            self.in_idx = (self.in_idx + 1) % self.buffer_size
-            self.log_signal.emit(f"生产者写入缓冲区[{self.in_idx-1}]：{data}", "black")
-            self.buffer_signal.emit(self.buffer.copy())
-
-            # V(mutex)：释放互斥锁
-            self.mutex.release()
-            self.mutex_val += 1
-            self.log_signal.emit(f"生产者V(mutex) → mutex={self.mutex_val}", "V")
-            self.sem_update_signal.emit(self.empty_val, self.full_val, self.mutex_val)
-
-            # V(full)：释放满缓冲区
-            self.full.release()
-            self.full_val += 1
-            self.log_signal.emit(f"生产者V(full) → full={self.full_val}", "V")
-            self.sem_update_signal.emit(self.empty_val, self.full_val, self.mutex_val)
-
-            time.sleep(1)
+            if not sync_primitives.produce_one(self.name, f"Item-{self.index}.{count}", self.sems,
+                                               self.ring, self.stats, running, self.ring.log):
+                break
+            self.ops += 1
+            self.stats.idle(lambda: SIM_CLOCK.sleep(1, running))
         self.finished_signal.emit()
 
     def stop(self):
@@ -587,91 +1833,175 @@ class SemaphoreProducerThread(QThread):
 
 class SemaphoreConsumerThread(QThread):
     """信号量消费者线程（Windows兼容）"""
-    log_signal = pyqtSignal(str, str)  # (日志内容, 颜色)
-    sem_update_signal = pyqtSignal(int, int, int)  # (empty_val, full_val, mutex_val)
-    buffer_signal = pyqtSignal(list)  # 缓冲区数据
     finished_signal = pyqtSignal()
 
-    def __init__(self, empty, full, mutex, buffer_size, parent=None):
+    def __init__(self, index, empty, full, mutex, ring, parent=None):
         super().__init__(parent)
         self.running = False
-        self.empty = empty
-        self.full = full
-        self.mutex = mutex
-        self.buffer_size = buffer_size
-        self.buffer = [None]*buffer_size  # 初始化缓冲区
-        self.out_idx = 0
-        # 手动跟踪信号量数值
-        self.empty_val = buffer_size
-        self.full_val = 0
-        self.mutex_val = 1
+        self.index = index
+        self.name = f"消费者{index}"
+        self.ring = ring    # 共享环形缓冲区（同时是界面取样的状态快照）
+        self.stats = sync_primitives.WorkerStats(self.name)
+        self.ops = 0        # 完成的生产/消费次数
+        self.sems = (empty, full, mutex)
 
     def run(self):
         self.running = True
+        running = lambda: self.running
         while self.running:
-            # P(full)：申请满缓冲区
-            self.full.acquire()
-            self.full_val -= 1
-            self.log_signal.emit(f"消费者P(full) → full={self.full_val}", "P")
-            self.sem_update_signal.emit(self.empty_val, self.full_val, self.mutex_val)
-
-            # P(mutex)：申请互斥锁
-            self.mutex.acquire()
-            self.mutex_val -= 1
-            self.log_signal.emit(f"消费者P(mutex) → mutex={self.mutex_val}", "P")
-            self.sem_update_signal.emit(self.empty_val, self.full_val, self.mutex_val)
-
-            # 从缓冲区读取数据（修复Windows下索引越界）
-            current_idx = self.out_idx % self.buffer_size
-            data = self.buffer[current_idx]
-            if data:
-                self.buffer[current_idx] = None
-                self.log_signal.emit(f"消费者读取缓冲区[{current_idx}]：{data}", "black")
-                self.buffer_signal.emit(self.buffer.copy())
-            self.out_idx = (self.out_idx + 1) % self.buffer_size
-
-            # V(mutex)：释放互斥锁
-            self.mutex.release()
-            self.mutex_val += 1
-            self.log_signal.emit(f"消费者V(mutex) → mutex={self.mutex_val}", "V")
-            self.sem_update_signal.emit(self.empty_val, self.full_val, self.mutex_val)
-
-            # V(empty)：释放空缓冲区
-            self.empty.release()
-            self.empty_val += 1
-            self.log_signal.emit(f"消费者V(empty) → empty={self.empty_val}", "V")
-            self.sem_update_signal.emit(self.empty_val, self.full_val, self.mutex_val)
-
-            time.sleep(1)
+            if not sync_primitives.consume_one(self.name, self.sems, self.ring, self.stats, running,
+                                               self.ring.log):
+                break
+            self.ops += 1
+            self.stats.idle(lambda: SIM_CLOCK.sleep(1, running))
         self.finished_signal.emit()
 
     def stop(self):
         self.running = False
 
+class SemaphoreProcessWorker:
+    """进程模式的生产者/消费者：包装 multiprocessing.Process，对界面提供与工作线程相同的接口
+
+    完成次数与计量由工作进程经状态队列汇报，界面取样时调用 apply_report() 合并。
+    """
+
+    def __init__(self, role, index, sems, ring, pace, stop_event, status, gate):
+        self.name = sync_primitives.ROLE_NAMES[role] + str(index)
+        self.stats = sync_primitives.WorkerStats(self.name)
+        self.ops = 0
+        self.stop_event = stop_event
+        self.process = multiprocessing.Process(
+            target=sync_primitives.worker_main,
+            args=(role, index, sems, ring, pace, stop_event, status, gate),
+            daemon=True,
+        )
+
+    def start(self):
+        self.process.start()
+
+    def isRunning(self):
+        return self.process.is_alive()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def wait(self):
+        self.process.join()
+
+    def terminate(self, force=False):
+        if force:
+            self.process.kill()
+        else:
+            self.process.terminate()
+
+    def apply_report(self, ops, report):
+        self.ops = ops
+        self.stats.apply(report)
+
+# 缓冲区图形：槽位数不超过该值时逐槽绘制方框与文字，更大的缓冲区绘制为单张图像
+BUFFER_TEXT_LIMIT = 32
+SLOT_EMPTY_COLOR = '#D3D3D3'
+SLOT_FULL_COLOR = '#90EE90'
+# 线程时间线：显示最近若干秒，各状态的颜色（片段之间的空白为运行中）
+TIMELINE_SECONDS = 5
+TIMELINE_COLORS = {
+    "等待empty": '#228B22',
+    "等待full": '#DC143C',
+    "等待mutex": '#4169E1',
+    "持有mutex": '#FF8C00',
+    "休眠": '#D3D3D3',
+}
+
+class SyncBenchmarkThread(QThread):
+    """同步原语基准测试线程：同一有界缓冲区负载依次用各同步方式不限速运行，逐用例回报结果"""
+    row_signal = pyqtSignal(dict)      # 单个用例结果
+    result_signal = pyqtSignal(list)   # 全部结果
+    error_signal = pyqtSignal(str)
+
+    def __init__(self, configs, buffer_size, parent=None):
+        super().__init__(parent)
+        self.configs = configs
+        self.buffer_size = buffer_size
+        self.running = False
+
+    def run(self):
+        self.running = True
+        try:
+            rows = sync_primitives.run_benchmark(
+                configs=self.configs, size=self.buffer_size,
+                progress=self.row_signal.emit, should_stop=lambda: not self.running
+            )
+        except Exception as e:
+            self.error_signal.emit(str(e))
+            return
+        self.result_signal.emit(rows)
+
+    def stop(self):
+        """当前用例跑完后停止"""
+        self.running = False
+
 class SemaphoreSync(QWidget):
     def __init__(self):
         super().__init__()
-        # 信号量配置（Windows multiprocessing适配）
+        # 信号量配置（Windows multiprocessing适配），每次启动按配置重新创建
         self.buffer_size = 5
-        self.empty = multiprocessing.Semaphore(self.buffer_size)
-        self.full = multiprocessing.Semaphore(0)
-        self.mutex = multiprocessing.Semaphore(1)
+        self.num_producers = 1
+        self.num_consumers = 1
+        self.empty = self.full = self.mutex = None
+        self.bench_thread = None
+        # 进程模式：状态队列、停止事件、倍速（共享给工作进程）
+        self.status = None
+        self.stop_event = None
+        self.pace = None
+        self.start_gate = None
+        self.run_mode = "thread"
+        self.run_started = 0.0
+        # 停止过程：定时取走汇报并检查工作进程/线程是否全部退出（不阻塞界面）
+        self.stop_requested = 0.0
+        self.stop_escalation = 0  # 0 正常等待，1 已terminate，2 已kill
+        self.stop_timer = QTimer(self)
+        self.stop_timer.setInterval(20)
+        self.stop_timer.timeout.connect(self.poll_stop)
         # 手动跟踪信号量数值
         self.empty_val = self.buffer_size
         self.full_val = 0
         self.mutex_val = 1
         # 缓冲区
         self.buffer = [None]*self.buffer_size
-        # 线程对象
-        self.producer_thread = None
-        self.consumer_thread = None
+        # 线程对象（M个生产者、N个消费者）
+        self.producer_threads = []
+        self.consumer_threads = []
+        # 竞争计量：互斥锁持有时间直方图与上次取样的累计值
+        self.hold_hist = ipc_transport.LatencyHistogram()
+        self.contention_base = None
+        # 共享环形缓冲区与界面取样定时器（约30帧/秒）
+        self.ring = SharedRingBuffer(self.buffer_size)
+        self.seen_versions = (0, 0)
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(33)
+        self.refresh_timer.timeout.connect(self.refresh_from_state)
+        # 每秒实测生产/消费速率
+        self.produce_meter = RateMeter()
+        self.consume_meter = RateMeter()
+        self.ops_timer = QTimer(self)
+        self.ops_timer.setInterval(1000)
+        self.ops_timer.timeout.connect(self.update_ops_label)
         # 初始化Matplotlib画布（Windows绘图适配）
         self.figure = plt.Figure(figsize=(8, 3), dpi=100)
         self.canvas = FigureCanvas(self.figure)
+        # 缓冲区图形的缓存背景（每次完整重绘后重新截取，增量更新时只blit变化的动态图元）
+        self.buffer_background = None
+        self.canvas.mpl_connect('draw_event', self.on_buffer_draw)
+        # 线程时间线与互斥锁持有时间分布（5帧/秒）
+        self.timeline_figure = plt.Figure(figsize=(8, 2.5), dpi=100)
+        self.timeline_canvas = FigureCanvas(self.timeline_figure)
+        self.timeline_timer = QTimer(self)
+        self.timeline_timer.setInterval(200)
+        self.timeline_timer.timeout.connect(self.update_timeline)
         # 初始化UI
         self.init_ui()
         # 初始绘制缓冲区图形
-        self.plot_buffer(self.buffer)
+        self.setup_buffer_view()
 
     def init_ui(self):
         layout = QVBoxLayout()
@@ -682,10 +2012,35 @@ class SemaphoreSync(QWidget):
         self.start_btn.clicked.connect(self.start_sync)
         self.stop_btn = QPushButton("停止模拟")
         self.stop_btn.clicked.connect(self.stop_sync)
+        self.bench_btn = QPushButton("运行同步原语基准测试")
+        self.bench_btn.clicked.connect(self.toggle_benchmark)
         btn_layout.addWidget(self.start_btn)
         btn_layout.addWidget(self.stop_btn)
+        btn_layout.addWidget(self.bench_btn)
         layout.addLayout(btn_layout)
 
+        # 模拟配置：生产者数、消费者数、缓冲区大小、信号量实现（启动时生效）
+        config_layout = QHBoxLayout()
+        self.producer_spin = self.add_config_spin(config_layout, "生产者数：", 1, 32, self.num_producers)
+        self.consumer_spin = self.add_config_spin(config_layout, "消费者数：", 1, 32, self.num_consumers)
+        self.buffer_spin = self.add_config_spin(config_layout, "缓冲区大小：", 1, 5000, self.buffer_size)
+        config_layout.addWidget(QLabel("信号量实现："))
+        self.primitive_combo = QComboBox()
+        for kind in sync_primitives.SEMAPHORE_PRIMITIVES:
+            self.primitive_combo.addItem(sync_primitives.PRIMITIVE_NAMES[kind], kind)
+        self.primitive_combo.setCurrentIndex(
+            sync_primitives.SEMAPHORE_PRIMITIVES.index(sync_primitives.DEFAULT_PRIMITIVE)
+        )
+        config_layout.addWidget(self.primitive_combo)
+        config_layout.addWidget(QLabel("运行模式："))
+        self.mode_combo = QComboBox()
+        self.mode_combo.addItem("线程（QThread）", "thread")
+        self.mode_combo.addItem("进程（multiprocessing.Process）", "process")
+        self.mode_combo.currentIndexChanged.connect(self.on_mode_changed)
+        config_layout.addWidget(self.mode_combo)
+        config_layout.addStretch()
+        layout.addLayout(config_layout)
+
         # 2. 信号量数值文字展示区
         sem_layout = QHBoxLayout()
         self.empty_label = QLabel(f"空缓冲区信号量（empty）：{self.empty_val}")
@@ -698,6 +2053,10 @@ class SemaphoreSync(QWidget):
         sem_layout.addWidget(self.full_label)
         sem_layout.addWidget(self.mutex_label)
         layout.addLayout(sem_layout)
+        self.ops_label = QLabel("实测：生产 0 次/秒  消费 0 次/秒")
+        layout.addWidget(self.ops_label)
+        self.contention_label = QLabel("竞争：暂无数据")
+        layout.addWidget(self.contention_label)
 
         # 3. 缓冲区图形+文字结合展示区
         buffer_title = QLabel("<b>缓冲区状态（图形化）</b>")
@@ -709,69 +2068,133 @@ class SemaphoreSync(QWidget):
 
         # 4. 操作日志文字展示区
         self.log_label = QLabel("<b>信号量操作日志（P=红色/V=绿色）</b>")
-        self.log = QTextEdit()
-        self.log.setReadOnly(True)
+        self.log = LogView({
+            "P": QColor(255, 0, 0),    # P操作红色
+            "V": QColor(0, 128, 0),    # V操作绿色
+        })
         self.log.setMaximumHeight(150)  # 限制日志高度
         layout.addWidget(self.log_label)
         layout.addWidget(self.log)
 
+        # 5. 线程时间线（等待/持有锁/休眠）与互斥锁持有时间分布
+        layout.addWidget(QLabel("<b>线程时间线与互斥锁持有时间</b>"))
+        layout.addWidget(self.timeline_canvas)
+        self.setup_timeline([])
+
         self.setLayout(layout)
 
-    def plot_buffer(self, buffer):
-        """绘制缓冲区图形（Windows适配）"""
+    def add_config_spin(self, layout, label, low, high, value):
+        layout.addWidget(QLabel(label))
+        spin = QSpinBox()
+        spin.setRange(low, high)
+        spin.setValue(value)
+        layout.addWidget(spin)
+        return spin
+
+    def setup_buffer_view(self):
+        """按缓冲区大小一次性创建图形：槽位方框与文字（大缓冲区为单张图像），之后只做增量更新"""
         self.figure.clear()
         ax = self.figure.add_subplot(111)
-        ax.set_xlim(0, self.buffer_size * 2)
-        ax.set_ylim(0, 3)
         ax.axis('off')  # 关闭坐标轴
+        self.buffer_ax = ax
+        self.shown_buffer = [None] * self.buffer_size
+        self.buffer_background = None
+        self.slot_regions = []
+        n = self.buffer_size
+        if n <= BUFFER_TEXT_LIMIT:
+            ax.set_xlim(0, n * 2)
+            ax.set_ylim(0, 3)
+            slot_width, slot_height, y = 1.5, 1.8, 0.5
+            fontsize = 10 if n <= 8 else 7
+            self.slot_rects, self.slot_texts = [], []
+            for idx in range(n):
+                x = idx * 2
+                rect = patches.Rectangle((x, y), slot_width, slot_height, facecolor=SLOT_EMPTY_COLOR,
+                                         edgecolor='black', linewidth=2, animated=True)
+                ax.add_patch(rect)
+                # 槽位内文字裁剪在方框内，保证每个槽位的重绘区域互不重叠
+                text = ax.text(x + slot_width / 2, y + slot_height / 2, '空', ha='center', va='center',
+                               fontsize=fontsize, color='#666', animated=True)
+                text.set_clip_path(rect)
+                text.set_clip_on(True)
+                self.slot_rects.append(rect)
+                self.slot_texts.append(text)
+                # 槽位下方标注索引（静态，进入缓存背景）
+                ax.text(x + slot_width / 2, 0.2, f'槽位{idx}', ha='center', va='center', fontsize=9 if n <= 8 else 6)
+            ax.text(n, 2.8, '生产者-消费者缓冲区可视化',
+                    ha='center', va='center', fontsize=12, fontweight='bold')
+            self.slot_image = None
+        else:
+            # 每格一个槽位（按行优先排列），颜色表：-1补齐格 / 0空 / 1有数据
+            cols = int(np.ceil(np.sqrt(n * 8 / 3)))
+            rows = -(-n // cols)
+            self.slot_cells = np.full(rows * cols, -1, dtype=np.int8)
+            self.slot_cells[:n] = 0
+            self.slot_grid = (rows, cols)
+            cmap = mcolors.ListedColormap(['white', SLOT_EMPTY_COLOR, SLOT_FULL_COLOR])
+            self.slot_image = ax.imshow(self.slot_cells.reshape(rows, cols), cmap=cmap, vmin=-1, vmax=1,
+                                        interpolation='nearest', aspect='auto', animated=True)
+            self.slot_rects, self.slot_texts = [], []
+            ax.set_title(f'生产者-消费者缓冲区可视化（{n}个槽位，绿色=有数据）', fontsize=12, fontweight='bold')
+        self.canvas.draw_idle()
+
+    def on_buffer_draw(self, event):
+        """完整重绘（初次显示/缩放）后截取不含动态图元的背景，记录各槽位的重绘区域，再画上动态图元"""
+        self.buffer_background = self.canvas.copy_from_bbox(self.figure.bbox)
+        renderer = self.canvas.get_renderer()
+        height = self.figure.bbox.height
+        self.slot_regions = []
+        for rect in self.slot_rects:
+            box = rect.get_window_extent(renderer).padded(2)
+            # restore_region 使用自上而下的像素坐标，blit 使用显示坐标
+            self.slot_regions.append(((box.x0, height - box.y1, box.x1, height - box.y0), box))
+        ax = self.buffer_ax
+        if self.slot_image is not None:
+            ax.draw_artist(self.slot_image)
+        for rect, text in zip(self.slot_rects, self.slot_texts):
+            ax.draw_artist(rect)
+            ax.draw_artist(text)
 
-        # 绘制每个缓冲区槽位
-        slot_width = 1.5
-        slot_height = 1.8
-        for idx in range(self.buffer_size):
-            # 计算槽位位置
-            x = idx * 2
-            y = 0.5
-            # 根据是否有数据设置颜色
-            if buffer[idx] is not None:
-                # 有数据：绿色背景
-                rect = patches.Rectangle((x, y), slot_width, slot_height, 
-                                       facecolor='#90EE90', edgecolor='black', linewidth=2)
-                # 槽位内显示数据文字（Windows字体）
-                ax.text(x + slot_width/2, y + slot_height/2, buffer[idx], 
-                       ha='center', va='center', fontsize=10, fontweight='bold')
-            else:
-                # 空槽位：灰色背景
-                rect = patches.Rectangle((x, y), slot_width, slot_height, 
-                                       facecolor='#D3D3D3', edgecolor='black', linewidth=2)
-                # 槽位内显示“空”
-                ax.text(x + slot_width/2, y + slot_height/2, '空', 
-                       ha='center', va='center', fontsize=10, color='#666')
-            ax.add_patch(rect)
-            # 槽位下方标注索引（Windows字体）
-            ax.text(x + slot_width/2, 0.2, f'槽位{idx}', ha='center', va='center', fontsize=9)
-
-        # 图形标题（Windows字体）
-        ax.text(self.buffer_size, 2.8, '生产者-消费者缓冲区可视化', 
-               ha='center', va='center', fontsize=12, fontweight='bold')
-        # 强制刷新画布（Windows关键）
-        self.canvas.draw()
-        self.canvas.flush_events()
+    def plot_buffer(self, buffer):
+        """增量更新缓冲区图形：只恢复并重绘发生变化的槽位区域，再blit这些区域"""
+        changed = [idx for idx, (old, new) in enumerate(zip(self.shown_buffer, buffer)) if old != new]
+        if not changed:
+            return
+        self.shown_buffer = list(buffer)
+        ax = self.buffer_ax
+        if self.slot_image is not None:
+            for idx in changed:
+                self.slot_cells[idx] = buffer[idx] is not None
+            self.slot_image.set_data(self.slot_cells.reshape(self.slot_grid))
+        else:
+            for idx in changed:
+                data = buffer[idx]
+                text = self.slot_texts[idx]
+                self.slot_rects[idx].set_facecolor(SLOT_FULL_COLOR if data is not None else SLOT_EMPTY_COLOR)
+                text.set_text(data if data is not None else '空')
+                text.set_color('black' if data is not None else '#666')
+                text.set_fontweight('bold' if data is not None else 'normal')
+        if self.buffer_background is None:
+            self.canvas.draw_idle()  # 尚未完整绘制过，由draw_event截取背景
+            return
+        if self.slot_image is not None:
+            # 单张图像：一次绘制即覆盖全部槽位
+            self.canvas.restore_region(self.buffer_background)
+            ax.draw_artist(self.slot_image)
+            self.canvas.blit(ax.bbox)
+            return
+        boxes = []
+        for idx in changed:
+            restore_box, blit_box = self.slot_regions[idx]
+            self.canvas.restore_region(self.buffer_background, bbox=restore_box, xy=(0, 0))
+            ax.draw_artist(self.slot_rects[idx])
+            ax.draw_artist(self.slot_texts[idx])
+            boxes.append(blit_box)
+        self.canvas.blit(Bbox.union(boxes))
 
     def add_log(self, text, color="black"):
-        """主线程安全更新日志（Windows兼容）"""
-        format_char = QTextCharFormat()
-        color_map = {
-            "P": QColor(255, 0, 0),    # P操作红色
-            "V": QColor(0, 128, 0),    # V操作绿色
-            "black": QColor(0, 0, 0)
-        }
-        format_char.setForeground(color_map.get(color, QColor(0,0,0)))
-        cursor = self.log.textCursor()
-        cursor.movePosition(cursor.End)
-        cursor.insertText(f"[{time.strftime('%H:%M:%S')}] {text}\n", format_char)
-        self.log.setTextCursor(cursor)
-        self.log.ensureCursorVisible()
+        """主线程更新日志（按帧批量写入）"""
+        self.log.append(text, color)
 
     def update_sem_labels(self, empty_val, full_val, mutex_val):
         """更新信号量数值文字标签"""
@@ -785,17 +2208,166 @@ class SemaphoreSync(QWidget):
     def update_buffer(self, buffer):
         """同步更新缓冲区图形和文字（Windows兼容）"""
         self.buffer = buffer
-        # 更新文字标签
-        self.buffer_text_label.setText(f"缓冲区文字状态：{[x if x else '空' for x in self.buffer]}")
+        # 更新文字标签（大缓冲区只显示占用数）
+        if len(buffer) <= BUFFER_TEXT_LIMIT:
+            self.buffer_text_label.setText(f"缓冲区文字状态：{[x if x else '空' for x in self.buffer]}")
+        else:
+            used = sum(x is not None for x in buffer)
+            self.buffer_text_label.setText(f"缓冲区文字状态：已占用 {used}/{len(buffer)} 个槽位")
         # 更新图形
         self.plot_buffer(buffer)
 
+    def refresh_from_state(self):
+        """按帧取样共享状态：只在版本变化时更新标签/缓冲区，日志批量写入"""
+        sem_version, sems, buffer_version, buffer, logs, dropped = self.ring.snapshot()
+        if dropped:
+            self.add_log(f"……省略{dropped}条日志……", "black")
+        for text, color in logs:
+            self.add_log(text, color)
+        self.drain_status()
+        if sem_version != self.seen_versions[0]:
+            self.update_sem_labels(*sems)
+        if buffer_version != self.seen_versions[1]:
+            self.update_buffer(buffer)
+        self.seen_versions = (sem_version, buffer_version)
+
+    def drain_status(self):
+        """进程模式：取走工作进程的汇报（完成次数、计量增量、日志）"""
+        if self.status is None:
+            return
+        self.sync_pace()
+        while True:
+            try:
+                role, index, ops, report, logs, dropped = self.status.get_nowait()
+            except queue.Empty:
+                return
+            workers = self.producer_threads if role == "producer" else self.consumer_threads
+            worker = workers[index - 1]
+            worker.apply_report(ops, report)
+            if dropped:
+                self.add_log(f"……{worker.name}省略{dropped}条日志……", "black")
+            for text, color in logs:
+                self.add_log(text, color)
+
+    def sync_pace(self):
+        """1×时每个工作进程每模拟秒完成一次操作；不限速时尽快运行"""
+        self.pace.value = 0.0 if SIM_CLOCK.unthrottled else SIM_CLOCK.speed
+
+    def on_mode_changed(self):
+        """进程之间只能共享 multiprocessing.Semaphore"""
+        process_mode = self.mode_combo.currentData() == "process"
+        if process_mode:
+            self.primitive_combo.setCurrentIndex(sync_primitives.SEMAPHORE_PRIMITIVES.index("mp_semaphore"))
+        self.primitive_combo.setEnabled(not process_mode)
+
+    @property
+    def worker_threads(self):
+        return self.producer_threads + self.consumer_threads
+
+    def update_ops_label(self):
+        """实测生产/消费速率与竞争指标（每秒取样）"""
+        produced = self.produce_meter.sample(sum(t.ops for t in self.producer_threads))
+        consumed = self.consume_meter.sample(sum(t.ops for t in self.consumer_threads))
+        self.ops_label.setText(f"实测：生产 {produced:.0f} 次/秒  消费 {consumed:.0f} 次/秒")
+        self.update_contention_label()
+
+    def contention_totals(self):
+        now = time.perf_counter_ns()
+        stats = [t.stats.blocked_until(now) for t in self.worker_threads]
+        blocked = {which: sum(s[which] for s in stats) for which in ("empty", "full", "mutex")}
+        return now, blocked, sum(t.stats.acquisitions for t in self.worker_threads)
+
+    def update_contention_label(self):
+        """阻塞时间占比（占全部线程时间）、P操作速率与互斥锁持有时间分位数"""
+        for thread in self.worker_threads:
+            thread.stats.drain_holds_into(self.hold_hist)
+        now, blocked, acquisitions = self.contention_totals()
+        base = self.contention_base
+        self.contention_base = (now, blocked, acquisitions)
+        if base is None or now <= base[0]:
+            return
+        elapsed = now - base[0]
+        thread_ns = elapsed * max(len(self.worker_threads), 1)
+        shares = "  ".join(
+            f"{which} {(blocked[which] - base[1][which]) * 100 / thread_ns:.1f}%" for which in blocked
+        )
+        text = f"竞争：P操作 {(acquisitions - base[2]) * 1e9 / elapsed:,.0f} 次/秒  阻塞时间占比 {shares}"
+        if self.hold_hist.total:
+            p50, p99 = self.hold_hist.percentiles((50, 99)) / 1000
+            text += f"  mutex持有 P50 {p50:,.1f}µs  P99 {p99:,.1f}µs"
+        self.contention_label.setText(text)
+
+    def setup_timeline(self, names):
+        """创建时间线坐标轴（每个线程一行）与持有时间分布，之后只更新数据"""
+        self.timeline_figure.clear()
+        self.timeline_ax = self.timeline_figure.add_subplot(1, 4, (1, 3))
+        self.hold_ax = self.timeline_figure.add_subplot(1, 4, 4)
+        ax = self.timeline_ax
+        self.timeline_bars = PolyCollection([], linewidths=0)
+        ax.add_collection(self.timeline_bars)
+        ax.set_xlim(-TIMELINE_SECONDS, 0)
+        ax.set_ylim(-0.5, max(len(names), 1) - 0.5)
+        ax.set_yticks(range(len(names)))
+        ax.set_yticklabels(names, fontsize=7)
+        ax.invert_yaxis()
+        ax.set_xlabel("秒（相对当前）", fontsize=8)
+        ax.tick_params(labelsize=7)
+        ax.legend(handles=[patches.Patch(color=c, label=k) for k, c in TIMELINE_COLORS.items()],
+                  fontsize=6, ncol=5, loc="lower left", bbox_to_anchor=(0, 1.0), frameon=False)
+        self.hold_line = self.hold_ax.step([], [], where="post", color=TIMELINE_COLORS["持有mutex"])[0]
+        self.hold_ax.set_xscale("log")
+        self.hold_ax.xaxis.set_minor_formatter(FuncFormatter(lambda value, pos: ""))
+        self.hold_ax.set_xlabel("mutex持有时间（µs）", fontsize=8)
+        self.hold_ax.tick_params(labelsize=7)
+        self.timeline_figure.tight_layout()
+        self.bucket_low, self.bucket_width = ipc_transport.LatencyHistogram.bucket_bounds()
+        self.timeline_canvas.draw_idle()
+
+    def update_timeline(self):
+        """按帧重绘时间线：各线程最近 TIMELINE_SECONDS 秒的片段合成一个多边形集合"""
+        now = time.perf_counter_ns()
+        horizon = now - TIMELINE_SECONDS * 10**9
+        verts, colors = [], []
+        for row, thread in enumerate(self.worker_threads):
+            for state, start, end in thread.stats.recent_segments(now):
+                if end < horizon:
+                    continue
+                x0, x1 = (max(start, horizon) - now) / 1e9, (end - now) / 1e9
+                verts.append(((x0, row - 0.4), (x0, row + 0.4), (x1, row + 0.4), (x1, row - 0.4)))
+                colors.append(TIMELINE_COLORS[state])
+        self.timeline_bars.set_verts(verts)
+        self.timeline_bars.set_facecolor(colors)
+        counts = self.hold_hist.counts
+        if counts.any():
+            nonzero = np.flatnonzero(counts)
+            lo, hi = max(nonzero[0], 1), nonzero[-1] + 1
+            edges = np.append(self.bucket_low[lo:hi], self.bucket_low[hi - 1] + self.bucket_width[hi - 1]) / 1000
+            # 桶宽随数值增长，按宽度归一化为密度
+            density = counts[lo:hi] / self.bucket_width[lo:hi]
+            self.hold_line.set_data(edges, np.append(density, density[-1]))
+            self.hold_ax.set_xlim(edges[0], edges[-1])
+            self.hold_ax.set_ylim(0, density.max() * 1.1)
+        self.timeline_canvas.draw_idle()
+
     def start_sync(self):
         """启动信号量模拟（Windows线程安全）"""
-        if self.producer_thread and self.producer_thread.isRunning():
+        if self.stop_timer.isActive() or any(t.isRunning() for t in self.worker_threads):
             self.add_log("同步模拟已在运行！", "black")
             return
-        
+        if self.bench_thread and self.bench_thread.isRunning():
+            self.add_log("请等待基准测试结束！", "P")
+            return
+
+        # 读取配置并按缓冲区大小重建信号量（上次停止时信号量可能停在任意值）
+        self.num_producers = self.producer_spin.value()
+        self.num_consumers = self.consumer_spin.value()
+        if self.buffer_spin.value() != self.buffer_size:
+            self.buffer_size = self.buffer_spin.value()
+            self.setup_buffer_view()
+        self.on_mode_changed()
+        primitive = self.primitive_combo.currentData()
+        self.empty, self.full, self.mutex = sync_primitives.make_semaphores(primitive, self.buffer_size)
+
         # 重置信号量和缓冲区
         self.empty_val = self.buffer_size
         self.full_val = 0
@@ -804,38 +2376,120 @@ class SemaphoreSync(QWidget):
         self.update_sem_labels(self.empty_val, self.full_val, self.mutex_val)
         self.update_buffer(self.buffer)
 
-        # 创建线程（Windows multiprocessing适配）
-        self.producer_thread = SemaphoreProducerThread(
-            self.empty, self.full, self.mutex, self.buffer_size
-        )
-        self.consumer_thread = SemaphoreConsumerThread(
-            self.empty, self.full, self.mutex, self.buffer_size
+        self.seen_versions = (0, 0)
+        self.run_mode = self.mode_combo.currentData()
+        if self.run_mode == "process":
+            # 创建工作进程：共享信号量与 shared_memory 环形缓冲区，计量与日志经状态队列汇报
+            try:
+                self.ring = sync_primitives.ShmRingBuffer(self.buffer_size, multiprocessing.Lock())
+            except OSError as e:
+                self.add_log(f"创建共享内存失败：{e}", "P")
+                return
+            self.status = multiprocessing.Queue()
+            self.stop_event = multiprocessing.Event()
+            self.pace = multiprocessing.Value("d", 0.0, lock=False)
+            self.sync_pace()
+            self.start_gate = sync_primitives.StartGate(self.num_producers + self.num_consumers)
+            sems = (self.empty, self.full, self.mutex)
+            args = (sems, self.ring, self.pace, self.stop_event, self.status, self.start_gate)
+            self.producer_threads = [SemaphoreProcessWorker("producer", i + 1, *args)
+                                     for i in range(self.num_producers)]
+            self.consumer_threads = [SemaphoreProcessWorker("consumer", i + 1, *args)
+                                     for i in range(self.num_consumers)]
+        else:
+            # 创建线程（Windows multiprocessing适配），全部线程读写同一个环形缓冲区
+            self.ring = SharedRingBuffer(self.buffer_size)
+            args = (self.empty, self.full, self.mutex, self.ring)
+            self.producer_threads = [SemaphoreProducerThread(i + 1, *args) for i in range(self.num_producers)]
+            self.consumer_threads = [SemaphoreConsumerThread(i + 1, *args) for i in range(self.num_consumers)]
+        self.hold_hist = ipc_transport.LatencyHistogram()
+        self.contention_base = None
+        self.setup_timeline([t.name for t in self.worker_threads])
+
+        # 启动线程与界面取样（图形+文字联动更新）
+        for thread in self.worker_threads:
+            thread.start()
+        self.run_started = time.perf_counter()
+        self.refresh_timer.start()
+        self.produce_meter = RateMeter()
+        self.consume_meter = RateMeter()
+        self.update_ops_label()
+        self.ops_timer.start()
+        self.timeline_timer.start()
+        self.set_config_enabled(False)
+        self.add_log(
+            f"启动生产者-消费者信号量同步模拟（{self.num_producers}个生产者，{self.num_consumers}个消费者，"
+            f"缓冲区{self.buffer_size}，{sync_primitives.PRIMITIVE_NAMES[primitive]}，"
+            f"{self.mode_combo.currentText()}）", "black"
         )
 
-        # 绑定信号槽（图形+文字联动更新）
-        self.producer_thread.log_signal.connect(self.add_log)
-        self.producer_thread.sem_update_signal.connect(self.update_sem_labels)
-        self.producer_thread.buffer_signal.connect(self.update_buffer)
-        self.consumer_thread.log_signal.connect(self.add_log)
-        self.consumer_thread.sem_update_signal.connect(self.update_sem_labels)
-        self.consumer_thread.buffer_signal.connect(self.update_buffer)
-
-        # 启动线程
-        self.producer_thread.start()
-        self.consumer_thread.start()
-        self.add_log("启动生产者-消费者信号量同步模拟（图形+文字联动）", "black")
-
     def stop_sync(self):
-        """停止信号量模拟（Windows线程安全）"""
-        if not self.producer_thread or not self.producer_thread.isRunning():
+        """停止信号量模拟（Windows线程安全）：通知停止后由 stop_timer 等待退出，界面不阻塞"""
+        if self.stop_timer.isActive():
+            return
+        if not any(t.isRunning() for t in self.worker_threads):
             self.add_log("同步模拟未运行！", "black")
             return
-        
-        # 停止线程
-        self.producer_thread.stop()
-        self.consumer_thread.stop()
-        self.producer_thread.wait()
-        self.consumer_thread.wait()
+
+        self.stop_requested = time.perf_counter()
+        self.stop_escalation = 0
+        for thread in self.worker_threads:
+            thread.stop()
+        if self.start_gate is not None:
+            self.start_gate.abort()  # 放行尚在等待其他进程就绪的工作进程
+        self.start_btn.setEnabled(False)
+        self.stop_btn.setEnabled(False)
+        self.stop_timer.start()
+
+    def poll_stop(self):
+        """进程模式下边等待边取走汇报（避免子进程因状态队列写满而无法退出）；
+
+        进程超过 JOIN_TIMEOUT 仍未退出则terminate，再超时则kill
+        """
+        self.drain_status()
+        running = [t for t in self.worker_threads if t.isRunning()]
+        if running:
+            level = int((time.perf_counter() - self.stop_requested) // ipc_transport.JOIN_TIMEOUT)
+            if self.run_mode == "process" and level > self.stop_escalation and self.stop_escalation < 2:
+                self.stop_escalation += 1
+                self.add_log(f"{len(running)}个工作进程未在{ipc_transport.JOIN_TIMEOUT:g}秒内退出，已强制终止", "P")
+                for worker in running:
+                    worker.terminate(force=self.stop_escalation == 2)
+            return
+        self.stop_timer.stop()
+        for thread in self.worker_threads:
+            thread.wait()
+        self.start_btn.setEnabled(True)
+        self.stop_btn.setEnabled(True)
+        self.finish_stop()
+
+    def finish_stop(self):
+        """全部工作线程/进程退出后：输出本次平均吞吐量并重置状态"""
+        if self.run_mode == "process":
+            elapsed = self.start_gate.elapsed(self.stop_requested)
+        else:
+            elapsed = self.stop_requested - self.run_started
+        self.refresh_timer.stop()
+        self.ops_timer.stop()
+        self.timeline_timer.stop()
+        self.refresh_from_state()  # 取走剩余日志
+        self.update_contention_label()
+        self.update_timeline()
+        self.set_config_enabled(True)
+        produced = sum(t.ops for t in self.producer_threads)
+        consumed = sum(t.ops for t in self.consumer_threads)
+        mode_name = self.mode_combo.itemText(self.mode_combo.findData(self.run_mode))
+        if elapsed:
+            self.add_log(
+                f"{mode_name}模式本次平均：生产 {produced / elapsed:,.0f} 次/秒  "
+                f"消费 {consumed / elapsed:,.0f} 次/秒（{elapsed:.1f} 秒）", "black"
+            )
+        else:
+            self.add_log(f"{mode_name}模式：工作进程尚未全部就绪即停止，不计算平均吞吐量", "black")
+        if self.run_mode == "process":
+            self.ring.close()
+            self.ring = SharedRingBuffer(self.buffer_size)
+            self.status = self.stop_event = self.pace = self.start_gate = None
 
         # 重置状态（图形+文字）
         self.empty_val = self.buffer_size
@@ -847,7 +2501,439 @@ class SemaphoreSync(QWidget):
 
         self.add_log("停止信号量同步模拟，已重置信号量和缓冲区状态", "black")
 
+    def set_config_enabled(self, enabled):
+        for widget in (self.producer_spin, self.consumer_spin, self.buffer_spin, self.mode_combo,
+                       self.bench_btn):
+            widget.setEnabled(enabled)
+        self.primitive_combo.setEnabled(enabled and self.mode_combo.currentData() == "thread")
+
+    def toggle_benchmark(self):
+        """启动/停止同步原语基准测试（各同步方式 × 1:1 与当前生产者:消费者配置，不限速）"""
+        if self.bench_thread and self.bench_thread.isRunning():
+            self.bench_thread.stop()
+            self.bench_btn.setEnabled(False)
+            self.add_log("基准测试将在当前用例完成后停止", "P")
+            return
+        configs = [(1, 1)]
+        if (self.producer_spin.value(), self.consumer_spin.value()) != (1, 1):
+            configs.append((self.producer_spin.value(), self.consumer_spin.value()))
+        self.bench_thread = SyncBenchmarkThread(configs, self.buffer_spin.value())
+        self.bench_thread.row_signal.connect(self.on_bench_row)
+        self.bench_thread.result_signal.connect(self.on_bench_finished)
+        self.bench_thread.error_signal.connect(self.on_bench_error)
+        self.bench_thread.start()
+        self.start_btn.setEnabled(False)
+        self.bench_btn.setText("停止基准测试")
+        self.add_log(
+            f"开始同步原语基准测试：{'/'.join(sync_primitives.PRIMITIVE_NAMES[k] for k in sync_primitives.PRIMITIVES)}，"
+            f"线程配置{'、'.join(f'{p}:{c}' for p, c in configs)}，缓冲区{self.buffer_spin.value()}，"
+            f"每例{sync_primitives.DEFAULT_ITEMS:,}次", "black"
+        )
+
+    def on_bench_row(self, row):
+        self.add_log(
+            f"[{sync_primitives.PRIMITIVE_NAMES[row['primitive']]}] {row['producers']}:{row['consumers']}："
+            f"{row['ops_per_sec']:,.0f} 次/秒  P50 {row['p50_us']:,.1f}µs  P99 {row['p99_us']:,.1f}µs", "black"
+        )
+
+    def on_bench_finished(self, rows):
+        """改选实测最快的信号量实现作为演示默认值"""
+        self.finish_benchmark()
+        best = sync_primitives.cheapest(rows)
+        if best is None:
+            self.add_log("基准测试已停止", "black")
+            return
+        self.primitive_combo.setCurrentIndex(sync_primitives.SEMAPHORE_PRIMITIVES.index(best))
+        self.on_mode_changed()
+        fastest = max(rows, key=lambda r: r["ops_per_sec"])
+        self.add_log(
+            f"基准测试完成：信号量实现中 {sync_primitives.PRIMITIVE_NAMES[best]} 最快，已选为演示默认；"
+            f"全部方式中最快为 {sync_primitives.PRIMITIVE_NAMES[fastest['primitive']]}"
+            f"（{fastest['producers']}:{fastest['consumers']}，{fastest['ops_per_sec']:,.0f} 次/秒）", "V"
+        )
+
+    def on_bench_error(self, message):
+        self.finish_benchmark()
+        self.add_log(f"基准测试失败：{message}", "P")
+
+    def finish_benchmark(self):
+        self.bench_btn.setText("运行同步原语基准测试")
+        self.bench_btn.setEnabled(True)
+        self.start_btn.setEnabled(True)
+
 # ======================== 模块4：CPU调度算法展示与比较 ========================
+# 甘特图前5个进程沿用固定配色，其余按黄金分割色相生成（任意进程数颜色均可区分）
+GANTT_BASE_COLORS = ["#FF6347", "#32CD32", "#4169E1", "#FFD700", "#9370DB"]
+
+def gantt_colors(n):
+    """生成n个进程的RGBA颜色表（按进程下标索引）"""
+    colors = np.empty((n, 4))
+    base = min(n, len(GANTT_BASE_COLORS))
+    colors[:base] = mcolors.to_rgba_array(GANTT_BASE_COLORS[:base])
+    if n > base:
+        k = np.arange(n - base)
+        hsv = np.column_stack([
+            (k * 0.618033988749895 + 0.1) % 1.0,  # 色相
+            0.55 + 0.35 * (k % 3) / 2,             # 饱和度在3档间交替
+            0.95 - 0.25 * (k % 2),                 # 明度在2档间交替
+        ])
+        colors[base:, :3] = mcolors.hsv_to_rgb(hsv)
+        colors[base:, 3] = 1.0
+    return colors
+
+def gantt_busy_grid(start, finish, rows, x0, x1, n_bins, row_lo, row_hi, n_row_bins):
+    """片段在(行组, 时间箱)网格上的精确忙碌时间（全部向量化，O(片段数)）
+
+    每个片段拆成首箱/尾箱的部分覆盖与中间整箱（差分数组），用bincount累加。
+    """
+    start = np.clip(start, x0, x1)
+    finish = np.clip(finish, x0, x1)
+    keep = (finish > start) & (rows >= row_lo) & (rows <= row_hi)
+    start, finish, rows = start[keep], finish[keep], rows[keep]
+    width = (x1 - x0) / n_bins
+    rb = ((rows - row_lo) * (n_row_bins / (row_hi - row_lo))).astype(np.int64)
+    np.clip(rb, 0, n_row_bins - 1, out=rb)
+    ks = np.minimum(((start - x0) / width).astype(np.int64), n_bins - 1)
+    kf = np.minimum(((finish - x0) / width).astype(np.int64), n_bins - 1)
+
+    cells = n_row_bins * n_bins
+    base = rb * n_bins
+    same = ks == kf
+    busy = np.bincount(base[same] + ks[same], (finish - start)[same], minlength=cells)
+    span = ~same
+    head = x0 + (ks[span] + 1) * width - start[span]
+    tail = finish[span] - (x0 + kf[span] * width)
+    busy += np.bincount(base[span] + ks[span], head, minlength=cells)
+    busy += np.bincount(base[span] + kf[span], tail, minlength=cells)
+    full = span & (kf > ks + 1)
+    if full.any():
+        diff_base = rb[full] * (n_bins + 1)
+        diff = np.bincount(diff_base + ks[full] + 1, minlength=n_row_bins * (n_bins + 1))
+        diff -= np.bincount(diff_base + kf[full], minlength=n_row_bins * (n_bins + 1))
+        covered = np.cumsum(diff.reshape(n_row_bins, n_bins + 1), axis=1)[:, :n_bins]
+        busy += covered.ravel() * width
+    return busy.reshape(n_row_bins, n_bins)
+
+
+class _ViewportHook(Artist):
+    """不绘制任何内容的辅助图元：在每次重绘开始时回调视图刷新（位于最底层）"""
+
+    def __init__(self, callback):
+        super().__init__()
+        self.callback = callback
+        self.set_zorder(-1e9)
+
+    def draw(self, renderer):
+        self.callback()
+
+
+class GanttIndex:
+    """甘特图的片段索引（与坐标轴无关，可在后台线程构建）
+
+    片段按开始时间排序；片段超过 pyramid_min 时另建按行有序索引与占用率金字塔（二维前缀和）。
+    """
+    pyramid_min = 200000        # 片段超过该数量时预计算占用率金字塔与按行索引
+    pyramid_bins = 4096         # 金字塔时间方向分箱数
+    pyramid_rows = 1024         # 金字塔进程方向分组数
+
+    def __init__(self, result):
+        self.n_rows = len(result.workload)
+        start = result.seg_start.astype(np.float64)
+        finish = result.seg_finish.astype(np.float64)
+        rows = result.seg_index
+        # 单CPU调度的片段本就按开始时间有序，无序时才排序
+        if len(start) > 1 and np.any(start[1:] < start[:-1]):
+            order = np.argsort(start, kind="stable")
+            start, finish, rows = start[order], finish[order], rows[order]
+        self.start, self.finish, self.rows = start, finish, rows
+        # 二分查找时向前回溯的最大片段长度（保证跨越左边界的长片段不被漏掉）
+        self.max_duration = float((finish - start).max()) if len(start) else 0.0
+        self.time_range = (float(start.min()), float(finish.max())) if len(start) else (0.0, 1.0)
+        self.row_range = (-0.5, self.n_rows - 0.5)
+        self.row_order = self.rows_sorted = None
+        self.sat = self.sat_cell = None
+        if len(start) > self.pyramid_min:
+            self._build_indexes()
+
+    def _build_indexes(self):
+        """大规模结果：按行有序索引 + 全局占用率金字塔（二维前缀和）"""
+        # 片段已按开始时间有序，按行稳定排序后即为(行, 开始时间)有序
+        self.row_order = np.argsort(self.rows, kind="stable")
+        self.rows_sorted = self.rows[self.row_order]
+
+        (t0, t1), (r0, r1) = self.time_range, self.row_range
+        n_bins = self.pyramid_bins
+        n_groups = min(self.n_rows, self.pyramid_rows)
+        busy = gantt_busy_grid(self.start, self.finish, self.rows,
+                               t0, t1, n_bins, r0, r1, n_groups)
+        self.sat = np.zeros((n_groups + 1, n_bins + 1))
+        np.cumsum(np.cumsum(busy, axis=0), axis=1, out=self.sat[1:, 1:])
+        self.sat_cell = ((t1 - t0) / n_bins, (r1 - r0) / n_groups)
+
+
+class GanttView:
+    """可缩放/平移的甘特图视图（视口裁剪 + 多级细节）
+
+    片段按开始时间排序后二分查找，只处理与可见时间窗相交的片段：
+    可见片段不多时逐片段绘制（PolyCollection+时间标注），
+    否则按像素分箱绘制每行（组）的CPU占用率图像。
+    所有图元只创建一次，每次重绘前按当前坐标范围原地更新。
+    滚轮缩放时间轴（按住Ctrl缩放进程轴），左键拖动平移。
+    缩小到全局视图时直接由预计算的占用率金字塔（二维前缀和）插值得到图像，
+    与片段数量无关；其余情况在按时间/按行两种有序索引中选候选更少的一种裁剪。
+    """
+    detail_limit = 20000        # 候选片段不超过该数量时逐片段绘制
+    label_limit = 200           # 可见片段不超过该数量时才标注时间
+    label_min_px = 40           # 片段宽度（像素）小于该值时不标注
+    edge_limit = 2000           # 可见片段超过该数量时不描边
+    bin_px = 2                  # 占用率分箱的像素宽度
+    row_px = 3                  # 占用率分箱的像素高度
+    zoom_step = 1.25            # 每格滚轮的缩放倍数
+
+    def __init__(self, ax, result, index=None):
+        """index: 预先构建的 GanttIndex（大规模结果在后台线程构建），省略时就地构建"""
+        self.ax = ax
+        self.result = result
+        if index is None:
+            index = GanttIndex(result)
+        self.n_rows = index.n_rows
+        self.colors = gantt_colors(self.n_rows)
+        self.start, self.finish, self.rows = index.start, index.finish, index.rows
+        self.max_duration = index.max_duration
+        self.time_range = index.time_range
+        self.row_range = index.row_range
+        self.row_order, self.rows_sorted = index.row_order, index.rows_sorted
+        self.sat, self.sat_cell = index.sat, index.sat_cell
+        self.last_update_ms = 0.0
+        self._cache_key = None
+        self._pan = None
+
+        self.bars = PolyCollection([], alpha=0.8, linewidths=1)
+        ax.add_collection(self.bars)
+        self.image = ax.imshow(
+            np.zeros((1, 1, 4)), aspect="auto", origin="lower",
+            interpolation="nearest", extent=(0, 1, 0, 1), visible=False
+        )
+        self.labels = [
+            ax.text(0, 0, "", ha='center', va='center', fontsize=9,
+                    fontweight='bold', clip_on=True, visible=False)
+            for _ in range(self.label_limit)
+        ]
+        ax.add_artist(_ViewportHook(self.update))
+        ax.set_xlim(*self.time_range)
+        ax.set_ylim(-0.6, self.n_rows - 0.4)
+
+        canvas = ax.figure.canvas
+        self._cids = [
+            canvas.mpl_connect("scroll_event", self.on_scroll),
+            canvas.mpl_connect("button_press_event", self.on_press),
+            canvas.mpl_connect("motion_notify_event", self.on_motion),
+            canvas.mpl_connect("button_release_event", self.on_release),
+        ]
+
+    def disconnect(self):
+        """解除画布事件绑定（重新绘图前调用）"""
+        canvas = self.ax.figure.canvas
+        for cid in self._cids:
+            canvas.mpl_disconnect(cid)
+        self._cids = []
+
+    # -------- 视口刷新 --------
+    def visible_range(self, x0, x1):
+        """与时间窗[x0, x1]相交的候选片段区间 [lo, hi)（二分查找）"""
+        lo = np.searchsorted(self.start, x0 - self.max_duration, side="left")
+        hi = np.searchsorted(self.start, x1, side="left")
+        return lo, hi
+
+    def candidates(self, x0, x1, y0, y1):
+        """按时间索引或按行索引（取候选更少者）取出可能可见的片段"""
+        lo, hi = self.visible_range(x0, x1)
+        if self.row_order is not None:
+            r_lo = np.searchsorted(self.rows_sorted, y0 - 0.5, side="left")
+            r_hi = np.searchsorted(self.rows_sorted, y1 + 0.5, side="right")
+            if r_hi - r_lo < hi - lo:
+                idx = self.row_order[r_lo:r_hi]
+                return self.start[idx], self.finish[idx], self.rows[idx]
+        return self.start[lo:hi], self.finish[lo:hi], self.rows[lo:hi]
+
+    def update(self):
+        """按当前坐标范围与画布尺寸更新图元（范围未变化时跳过）"""
+        ax = self.ax
+        (x0, x1), (y0, y1) = ax.get_xlim(), ax.get_ylim()
+        bbox = ax.get_window_extent()
+        key = (x0, x1, y0, y1, int(bbox.width), int(bbox.height))
+        if key == self._cache_key:
+            return
+        self._cache_key = key
+        t = time.perf_counter()
+
+        n_bins = max(int(bbox.width / self.bin_px), 1)
+        row_lo, row_hi = max(y0, self.row_range[0]), min(y1, self.row_range[1])
+        n_row_bins = max(min(int(bbox.height / self.row_px), int(np.ceil(row_hi - row_lo))), 1)
+        if self.sat is not None and row_hi > row_lo and \
+                (x1 - x0) / n_bins >= 0.5 * self.sat_cell[0] and \
+                (row_hi - row_lo) / n_row_bins >= 0.5 * self.sat_cell[1]:
+            # 视图分箱不比金字塔细：直接插值，与片段数无关
+            busy = self._pyramid_busy(x0, x1, n_bins, row_lo, row_hi, n_row_bins)
+            self._show_bins(busy, x0, x1, n_bins, row_lo, row_hi)
+        else:
+            start, finish, rows = self.candidates(x0, x1, y0, y1)
+            if len(start) <= self.detail_limit:
+                self._update_detail(start, finish, rows, x0, x1, y0, y1, bbox)
+            elif row_hi > row_lo:
+                busy = gantt_busy_grid(start, finish, rows,
+                                       x0, x1, n_bins, row_lo, row_hi, n_row_bins)
+                self._show_bins(busy, x0, x1, n_bins, row_lo, row_hi)
+        self.last_update_ms = (time.perf_counter() - t) * 1000
+
+    def _pyramid_busy(self, x0, x1, n_bins, row_lo, row_hi, n_row_bins):
+        """由二维前缀和双线性插值得到视图各分箱的忙碌时间（假设金字塔格内均匀）"""
+        (t0, _), (r0, _) = self.time_range, self.row_range
+        cell_t, cell_r = self.sat_cell
+        n_groups, n_base = self.sat.shape[0] - 1, self.sat.shape[1] - 1
+        u = np.clip((np.linspace(x0, x1, n_bins + 1) - t0) / cell_t, 0, n_base)
+        v = np.clip((np.linspace(row_lo, row_hi, n_row_bins + 1) - r0) / cell_r, 0, n_groups)
+        iu = np.minimum(u.astype(np.int64), n_base - 1)
+        iv = np.minimum(v.astype(np.int64), n_groups - 1)
+        fu, fv = u - iu, (v - iv)[:, None]
+        lower, upper = self.sat[iv], self.sat[iv + 1]
+        lower = lower[:, iu] + (lower[:, iu + 1] - lower[:, iu]) * fu
+        upper = upper[:, iu] + (upper[:, iu + 1] - upper[:, iu]) * fu
+        cumulative = lower + (upper - lower) * fv
+        return np.diff(np.diff(cumulative, axis=0), axis=1)
+
+    def _update_detail(self, start, finish, rows, x0, x1, y0, y1, bbox):
+        """逐片段绘制可见片段，并在片段足够宽时标注时间"""
+        keep = (finish > x0) & (start < x1) & (rows >= y0 - 0.5) & (rows <= y1 + 0.5)
+        start, finish, rows = start[keep], finish[keep], rows[keep]
+        verts = np.stack([
+            np.column_stack([start, rows - 0.4]), np.column_stack([start, rows + 0.4]),
+            np.column_stack([finish, rows + 0.4]), np.column_stack([finish, rows - 0.4]),
+        ], axis=1)
+        self.bars.set_verts(verts)
+        self.bars.set_facecolor(self.colors[rows])
+        self.bars.set_edgecolor("black" if len(rows) <= self.edge_limit else "none")
+        self.bars.set_visible(True)
+        self.image.set_visible(False)
+
+        # 时间标注：片段像素宽度足够容纳文字、行高足够时才标注
+        used = 0
+        px_per_time = bbox.width / max(x1 - x0, 1e-12)
+        px_per_row = bbox.height / max(y1 - y0, 1e-12)
+        if len(rows) <= self.label_limit and px_per_row >= 12:
+            time_type = self.result.seg_start.dtype.type
+            for s, f, r in zip(start.tolist(), finish.tolist(), rows.tolist()):
+                if (f - s) * px_per_time < self.label_min_px:
+                    continue
+                label = self.labels[used]
+                # 标注沿用原始时间类型（整数负载显示为“0-2”）
+                label.set_text(f"{time_type(s).item()}-{time_type(f).item()}")
+                label.set_position((s + (f - s) / 2, r))
+                label.set_visible(True)
+                used += 1
+        for label in self.labels[used:]:
+            if label.get_visible():
+                label.set_visible(False)
+
+    def _show_bins(self, busy, x0, x1, n_bins, row_lo, row_hi):
+        """把(行组, 时间箱)忙碌时间绘制为占用率图像：颜色取行组中间行，透明度表示占用率"""
+        n_row_bins = busy.shape[0]
+        occupancy = np.clip(busy * (n_bins / (x1 - x0)), 0, 1)
+        row_step = (row_hi - row_lo) / n_row_bins
+        center_rows = np.clip(
+            np.round(row_lo + (np.arange(n_row_bins) + 0.5) * row_step).astype(np.int64),
+            0, self.n_rows - 1
+        )
+        rgba = np.empty((n_row_bins, n_bins, 4))
+        rgba[..., :3] = self.colors[center_rows, None, :3]
+        rgba[..., 3] = np.where(occupancy > 1e-9, 0.2 + 0.7 * occupancy, 0.0)
+        self.image.set_data(rgba)
+        self.image.set_extent((x0, x1, row_lo, row_hi))
+        self.image.set_visible(True)
+        self.bars.set_visible(False)
+        for label in self.labels:
+            if label.get_visible():
+                label.set_visible(False)
+
+    # -------- 鼠标缩放/平移 --------
+    def _toolbar_busy(self):
+        toolbar = getattr(self.ax.figure.canvas, "toolbar", None)
+        return bool(toolbar is not None and toolbar.mode)
+
+    def on_scroll(self, event):
+        """滚轮以鼠标位置为中心缩放时间轴（Ctrl+滚轮缩放进程轴）"""
+        if event.inaxes is not self.ax:
+            return
+        factor = self.zoom_step ** (-event.step)
+        if event.key == "control":
+            y0, y1 = self.ax.get_ylim()
+            self.ax.set_ylim(event.ydata - (event.ydata - y0) * factor,
+                             event.ydata + (y1 - event.ydata) * factor)
+        else:
+            x0, x1 = self.ax.get_xlim()
+            self.ax.set_xlim(event.xdata - (event.xdata - x0) * factor,
+                             event.xdata + (x1 - event.xdata) * factor)
+        self.ax.figure.canvas.draw_idle()
+
+    def on_press(self, event):
+        if event.inaxes is not self.ax or event.button != 1 or self._toolbar_busy():
+            return
+        self._pan = (event.x, event.y, self.ax.get_xlim(), self.ax.get_ylim())
+
+    def on_motion(self, event):
+        """左键拖动平移（按像素位移换算为数据坐标位移）"""
+        if self._pan is None or event.x is None:
+            return
+        px, py, (x0, x1), (y0, y1) = self._pan
+        bbox = self.ax.get_window_extent()
+        dx = (event.x - px) * (x1 - x0) / bbox.width
+        dy = (event.y - py) * (y1 - y0) / bbox.height
+        self.ax.set_xlim(x0 - dx, x1 - dx)
+        self.ax.set_ylim(y0 - dy, y1 - dy)
+        self.ax.figure.canvas.draw_idle()
+
+    def on_release(self, event):
+        self._pan = None
+
+
+class CompareThread(QThread):
+    """批量对比线程（在后台把各算法配置分发到进程池，避免阻塞界面）"""
+    result_signal = pyqtSignal(list)  # 每种配置的指标字典列表
+    error_signal = pyqtSignal(str)
+
+    def __init__(self, workload, quanta, parent=None):
+        super().__init__(parent)
+        self.workload = workload
+        self.quanta = quanta
+
+    def run(self):
+        try:
+            rows = scheduler_engine.compare(self.workload, quanta=self.quanta)
+        except Exception as e:
+            self.error_signal.emit(str(e))
+            return
+        self.result_signal.emit(rows)
+
+class ScheduleThread(QThread):
+    """单算法调度线程（调度计算与甘特图索引构建放到后台，大规模负载下界面不卡顿）"""
+    result_signal = pyqtSignal(object, object, object)  # 调度结果, 汇总指标, 甘特图索引
+    error_signal = pyqtSignal(str)
+
+    def __init__(self, algo, workload, parent=None):
+        super().__init__(parent)
+        self.algo = algo
+        self.workload = workload
+
+    def run(self):
+        try:
+            result = scheduler_engine.schedule(self.algo, self.workload)
+            summary = result.summary()
+            index = GanttIndex(result)
+        except Exception as e:
+            self.error_signal.emit(str(e))
+            return
+        self.result_signal.emit(result, summary, index)
+
 class CPUScheduler(QWidget):
     def __init__(self):
         super().__init__()
@@ -859,6 +2945,19 @@ class CPUScheduler(QWidget):
             ("P3", 2, 2, 2),
             ("P4", 4, 4, 4)
         ]
+        self.workload = scheduler_engine.Workload.from_tuples(self.processes)
+        # 结果文本中逐条列出片段/进程的上限
+        self.max_listed = 50
+        # 当前甘特图视图（GanttView）
+        self.gantt_view = None
+        # 批量对比时RR的时间片扫描范围
+        self.rr_quanta = (1, 2, 4, 8)
+        self.compare_thread = None
+        self.schedule_thread = None
+        # 最近一次调度结果（供导出）
+        self.last_result = None
+        # 随机负载的种子（每次生成递增）
+        self.generate_seed = 0
 
     def init_ui(self):
         layout = QVBoxLayout()
@@ -871,18 +2970,48 @@ class CPUScheduler(QWidget):
         self.rr_btn.clicked.connect(lambda: self.run_scheduler("RR"))
         self.sjf_btn = QPushButton("SJF（最短作业优先）")
         self.sjf_btn.clicked.connect(lambda: self.run_scheduler("SJF"))
+        self.srtf_btn = QPushButton("SRTF（最短剩余时间优先）")
+        self.srtf_btn.clicked.connect(lambda: self.run_scheduler("SRTF"))
+        self.priority_btn = QPushButton("优先级调度（数值小优先）")
+        self.priority_btn.clicked.connect(lambda: self.run_scheduler("PRIORITY"))
         btn_layout.addWidget(self.fcfs_btn)
         btn_layout.addWidget(self.rr_btn)
         btn_layout.addWidget(self.sjf_btn)
+        btn_layout.addWidget(self.srtf_btn)
+        btn_layout.addWidget(self.priority_btn)
         layout.addLayout(btn_layout)
 
-        # 甘特图展示区（Windows绘图适配）
+        # 批量对比 + 负载轨迹导入/结果导出
+        tool_layout = QHBoxLayout()
+        self.compare_btn = QPushButton("全部算法对比（含RR时间片扫描，多核并行）")
+        self.compare_btn.clicked.connect(self.start_compare)
+        self.import_btn = QPushButton("导入负载轨迹（CSV/JSONL/BIN）")
+        self.import_btn.clicked.connect(self.import_workload)
+        self.export_btn = QPushButton("导出甘特图片段与指标")
+        self.export_btn.clicked.connect(self.export_result)
+        self.generate_size = QSpinBox()
+        self.generate_size.setRange(10, 1000000)
+        self.generate_size.setSingleStep(1000)
+        self.generate_size.setValue(1000)
+        self.generate_size.setPrefix("进程数：")
+        self.generate_btn = QPushButton("生成随机负载")
+        self.generate_btn.clicked.connect(self.generate_workload)
+        tool_layout.addWidget(self.compare_btn)
+        tool_layout.addWidget(self.import_btn)
+        tool_layout.addWidget(self.export_btn)
+        tool_layout.addWidget(self.generate_size)
+        tool_layout.addWidget(self.generate_btn)
+        layout.addLayout(tool_layout)
+
+        # 甘特图展示区（Windows绘图适配，工具栏支持缩放/平移）
         self.figure = plt.Figure(figsize=(10, 4), dpi=100)
         self.canvas = FigureCanvas(self.figure)
+        self.toolbar = NavigationToolbar(self.canvas, self)
+        layout.addWidget(self.toolbar)
         layout.addWidget(self.canvas)
 
         # 调度结果展示
-        self.result_label = QLabel("<b>调度性能指标（平均等待时间/平均周转时间）</b>")
+        self.result_label = QLabel("<b>调度性能指标（平均/分位数等待时间、响应时间、周转时间）</b>")
         self.result_text = QTextEdit()
         self.result_text.setReadOnly(True)
         layout.addWidget(self.result_label)
@@ -890,182 +3019,197 @@ class CPUScheduler(QWidget):
 
         self.setLayout(layout)
 
-    def fcfs(self):
-        """FCFS调度算法实现"""
-        # 按到达时间排序
-        sorted_procs = sorted(self.processes, key=lambda x: x[1])
-        current_time = 0
-        wait_times = []
-        turnaround_times = []
-        gantt_data = []
-
-        for p in sorted_procs:
-            pid, arr_time, exe_time, pri = p
-            # 进程开始时间 = 最大(当前时间, 到达时间)
-            start_time = max(current_time, arr_time)
-            # 等待时间 = 开始时间 - 到达时间
-            wait_time = start_time - arr_time
-            # 周转时间 = 完成时间 - 到达时间
-            finish_time = start_time + exe_time
-            turnaround_time = finish_time - arr_time
-
-            wait_times.append(wait_time)
-            turnaround_times.append(turnaround_time)
-            gantt_data.append((pid, start_time, finish_time))
-            current_time = finish_time
-
-        # 计算平均指标
-        avg_wait = sum(wait_times) / len(wait_times)
-        avg_turnaround = sum(turnaround_times) / len(turnaround_times)
-        return gantt_data, avg_wait, avg_turnaround
-
-    def rr(self):
-        """RR调度算法实现（时间片=2，Windows兼容）"""
-        time_slice = 2
-        # 进程副本：(pid, 到达时间, 总执行时间, 优先级, 剩余执行时间)
-        procs = [(pid, arr, exe, pri, exe) for pid, arr, exe, pri in self.processes]
-        current_time = 0
-        ready_queue = []
-        wait_times = {p[0]: 0 for p in self.processes}  # 每个进程的等待时间
-        turnaround_times = {}
-        gantt_data = []
-        completed = []
-
-        while len(completed) < len(self.processes):
-            # 把到达的进程加入就绪队列
-            for p in procs:
-                pid, arr, exe, pri, rem = p
-                if arr <= current_time and pid not in [x[0] for x in ready_queue] and pid not in completed:
-                    ready_queue.append(p)
-
-            if not ready_queue:
-                current_time += 1
-                continue
-
-            # 调度就绪队列首个进程
-            current_proc = ready_queue.pop(0)
-            pid, arr, exe, pri, rem = current_proc
-            # 实际运行时间 = 最小(时间片, 剩余时间)
-            run_time = min(time_slice, rem)
-            start_time = current_time
-            current_time += run_time
-            rem -= run_time
-
-            # 记录甘特图数据
-            gantt_data.append((pid, start_time, current_time))
-
-            # 更新就绪队列中其他进程的等待时间
-            for q in ready_queue:
-                qid = q[0]
-                wait_times[qid] += run_time
-
-            # 进程完成/未完成处理
-            if rem == 0:
-                completed.append(pid)
-                turnaround_times[pid] = current_time - arr
-            else:
-                ready_queue.append((pid, arr, exe, pri, rem))
-
-        # 计算平均指标
-        avg_wait = sum(wait_times.values()) / len(wait_times)
-        avg_turnaround = sum(turnaround_times.values()) / len(turnaround_times)
-        return gantt_data, avg_wait, avg_turnaround
-
-    def sjf(self):
-        """SJF（最短作业优先）调度算法实现"""
-        procs = [(pid, arr, exe, pri) for pid, arr, exe, pri in self.processes]
-        current_time = 0
-        wait_times = []
-        turnaround_times = []
-        gantt_data = []
-        completed = []
-
-        while len(completed) < len(procs):
-            # 筛选已到达且未完成的进程
-            available = [p for p in procs if p[1] <= current_time and p[0] not in completed]
-            if not available:
-                current_time += 1
-                continue
-
-            # 按执行时间升序排序（最短优先）
-            available_sorted = sorted(available, key=lambda x: x[2])
-            p = available_sorted[0]
-            pid, arr_time, exe_time, pri = p
-
-            # 计算时间指标
-            start_time = max(current_time, arr_time)
-            wait_time = start_time - arr_time
-            finish_time = start_time + exe_time
-            turnaround_time = finish_time - arr_time
-
-            wait_times.append(wait_time)
-            turnaround_times.append(turnaround_time)
-            gantt_data.append((pid, start_time, finish_time))
-
-            # 更新状态
-            completed.append(pid)
-            current_time = finish_time
-
-        # 计算平均指标
-        avg_wait = sum(wait_times) / len(wait_times)
-        avg_turnaround = sum(turnaround_times) / len(turnaround_times)
-        return gantt_data, avg_wait, avg_turnaround
-
-    def plot_gantt(self, gantt_data, algo_name):
-        """绘制调度甘特图（Windows适配）"""
+    def plot_gantt(self, result, index=None):
+        """绘制调度甘特图（视口裁剪+多级细节，支持滚轮缩放/拖动平移）"""
+        self.clear_gantt_view()
         self.figure.clear()
         ax = self.figure.add_subplot(111)
-        
-        # 进程颜色映射
-        colors = {
-            "P1": "#FF6347", "P2": "#32CD32", "P3": "#4169E1", 
-            "P4": "#FFD700", "P5": "#9370DB"
-        }
-        # 绘制甘特图（Windows兼容）
-        for pid, start, finish in gantt_data:
-            ax.barh(
-                pid, finish - start, left=start, 
-                color=colors.get(pid, "#808080"), 
-                edgecolor="black", alpha=0.8
-            )
-            # 标注时间范围（Windows字体）
-            ax.text(start + (finish - start)/2, pid, f"{start}-{finish}", 
-                   ha='center', va='center', fontsize=9, fontweight='bold')
+        self.gantt_view = GanttView(ax, result, index)
+
+        # 纵轴：整数行号显示为进程ID，刻度数量由定位器自动控制
+        ax.yaxis.set_major_locator(MaxNLocator(nbins=20, integer=True))
+        ax.yaxis.set_major_formatter(FuncFormatter(
+            lambda y, _: result.workload.name(int(y))
+            if float(y).is_integer() and 0 <= y < len(result.workload) else ""
+        ))
 
         # 中文标签配置（Windows字体）
         ax.set_xlabel("时间（秒）", fontsize=12, fontweight='bold')
         ax.set_ylabel("进程ID", fontsize=12, fontweight='bold')
-        ax.set_title(f"{algo_name} 调度算法甘特图", fontsize=14, fontweight="bold")
+        ax.set_title(f"{result.algo} 调度算法甘特图（滚轮缩放/拖动平移）", fontsize=14, fontweight="bold")
         ax.grid(axis="x", linestyle="--", alpha=0.7)
         # 强制刷新画布（Windows关键）
         self.canvas.draw()
         self.canvas.flush_events()
 
+    def clear_gantt_view(self):
+        """解除旧甘特图视图的鼠标事件绑定"""
+        if self.gantt_view is not None:
+            self.gantt_view.disconnect()
+            self.gantt_view = None
+
     def run_scheduler(self, algo):
         """执行指定调度算法并展示结果（Windows兼容）"""
-        if algo == "FCFS":
-            gantt_data, avg_wait, avg_turn = self.fcfs()
-        elif algo == "RR":
-            gantt_data, avg_wait, avg_turn = self.rr()
-        elif algo == "SJF":
-            gantt_data, avg_wait, avg_turn = self.sjf()
-        else:
+        if algo not in scheduler_engine.ALGORITHMS:
+            return
+        if self.schedule_thread and self.schedule_thread.isRunning():
             return
+        # 调度计算交给无GUI依赖的调度引擎，在后台线程运行
+        self.set_algo_buttons_enabled(False)
+        self.result_text.setText(f"正在运行{algo}调度（{len(self.workload)}个进程）……")
+        self.schedule_thread = ScheduleThread(algo, self.workload)
+        self.schedule_thread.result_signal.connect(self.on_schedule_finished)
+        self.schedule_thread.error_signal.connect(self.on_schedule_error)
+        self.schedule_thread.start()
+
+    def set_algo_buttons_enabled(self, enabled):
+        for btn in (self.fcfs_btn, self.rr_btn, self.sjf_btn, self.srtf_btn, self.priority_btn):
+            btn.setEnabled(enabled)
+
+    def on_schedule_error(self, message):
+        self.set_algo_buttons_enabled(True)
+        self.result_text.setText(f"调度失败：{message}")
+
+    def on_schedule_finished(self, result, summary, index):
+        """调度完成回调：绘制甘特图并展示指标"""
+        self.set_algo_buttons_enabled(True)
+        self.last_result = result
+        algo, workload = result.algo, result.workload
 
         # 绘制甘特图
-        self.plot_gantt(gantt_data, algo)
-        # 展示结果
+        self.plot_gantt(result, index)
+        # 展示结果（大规模负载只显示片段/进程数量）
+        if len(result.seg_index) <= self.max_listed:
+            gantt_text = f"{result.gantt_data}"
+        else:
+            gantt_text = f"共{len(result.seg_index)}个片段（过多不逐条显示，可导出查看）"
+        if len(workload) <= self.max_listed:
+            process_text = f"{[(pid, f'到达={arr}', f'执行={exe}', f'优先级={pri}') for pid, arr, exe, pri in workload.to_tuples()]}"
+        else:
+            process_text = f"共{len(workload)}个进程"
         result_text = f"""
         {algo} 调度结果：
-        ├─ 甘特图数据：{gantt_data}
-        ├─ 平均等待时间：{avg_wait:.2f} 秒
-        └─ 平均周转时间：{avg_turn:.2f} 秒
+        ├─ 甘特图数据：{gantt_text}
+        ├─ 平均等待时间：{summary['avg_wait']:.2f} 秒
+        ├─ 等待时间分位数：P50={summary['p50_wait']:.2f} / P95={summary['p95_wait']:.2f} / P99={summary['p99_wait']:.2f} 秒
+        ├─ 平均响应时间：{summary['avg_response']:.2f} 秒
+        └─ 平均周转时间：{summary['avg_turnaround']:.2f} 秒
         
         进程原始参数：
-        {[(pid, f'到达={arr}', f'执行={exe}', f'优先级={pri}') for pid, arr, exe, pri in self.processes]}
+        {process_text}
         """
         self.result_text.setText(result_text)
 
+    def import_workload(self):
+        """从轨迹文件导入负载（替换预设进程）"""
+        path, _ = QFileDialog.getOpenFileName(
+            self, "导入负载轨迹", "", "负载轨迹 (*.csv *.jsonl *.bin *.trace);;所有文件 (*)"
+        )
+        if not path:
+            return
+        try:
+            workload = scheduler_io.load_workload(path)
+            if not len(workload):
+                raise ValueError("文件中没有进程记录")
+        except (OSError, ValueError) as e:
+            self.result_text.setText(f"导入失败：{e}")
+            return
+        self.workload = workload
+        self.last_result = None
+        self.result_text.setText(f"已导入负载：{os.path.basename(path)}，共{len(workload)}个进程")
+
+    def generate_workload(self):
+        """按当前进程数生成随机负载（泊松到达+指数执行时间，种子递增保证可复现）"""
+        self.generate_seed += 1
+        n = self.generate_size.value()
+        self.workload = scheduler_workload.generate_workload(n, seed=self.generate_seed)
+        self.last_result = None
+        self.result_text.setText(f"已生成随机负载：{n}个进程（种子={self.generate_seed}）")
+
+    def export_result(self):
+        """导出最近一次调度的甘特图片段，逐进程指标写入同目录 *_metrics 文件"""
+        if self.last_result is None:
+            self.result_text.setText("请先运行一次调度算法再导出！")
+            return
+        path, _ = QFileDialog.getSaveFileName(
+            self, "导出甘特图片段", f"{self.last_result.algo}_segments.csv",
+            "CSV (*.csv);;JSONL (*.jsonl);;列式二进制 (*.bin)"
+        )
+        if not path:
+            return
+        stem, ext = os.path.splitext(path)
+        metrics_path = f"{stem}_metrics{ext}"
+        try:
+            scheduler_io.save_segments(self.last_result, path)
+            scheduler_io.save_process_metrics(self.last_result, metrics_path)
+        except (OSError, ValueError) as e:
+            self.result_text.setText(f"导出失败：{e}")
+            return
+        self.result_text.append(f"\n已导出：{path}\n已导出：{metrics_path}")
+
+    def start_compare(self):
+        """启动批量对比（后台线程 + 进程池）"""
+        if self.compare_thread and self.compare_thread.isRunning():
+            return
+        self.compare_btn.setEnabled(False)
+        self.result_text.setText("正在并行运行全部调度算法……")
+        self.compare_thread = CompareThread(self.workload, self.rr_quanta)
+        self.compare_thread.result_signal.connect(self.on_compare_finished)
+        self.compare_thread.error_signal.connect(self.on_compare_error)
+        self.compare_thread.start()
+
+    def on_compare_finished(self, rows):
+        """对比完成回调：指标表格 + 分组柱状图"""
+        self.compare_btn.setEnabled(True)
+        self.plot_compare(rows)
+        self.result_text.setText(
+            f"全部算法对比结果（进程数={len(self.workload)}）：\n"
+            + scheduler_engine.format_compare_table(rows)
+        )
+
+    def on_compare_error(self, message):
+        self.compare_btn.setEnabled(True)
+        self.result_text.setText(f"批量对比失败：{message}")
+
+    def plot_compare(self, rows):
+        """绘制对比分组柱状图（左：时间指标，右：吞吐量/CPU利用率）"""
+        self.clear_gantt_view()
+        self.figure.clear()
+        ax_time = self.figure.add_subplot(1, 3, (1, 2))
+        ax_rate = self.figure.add_subplot(1, 3, 3)
+        labels = [row["label"] for row in rows]
+        x = range(len(rows))
+
+        time_metrics = [m for m in scheduler_engine.COMPARE_METRICS
+                        if m[0] not in ("throughput", "cpu_utilization")]
+        width = 0.8 / len(time_metrics)
+        for k, (key, name) in enumerate(time_metrics):
+            offset = (k - (len(time_metrics) - 1) / 2) * width
+            ax_time.bar([i + offset for i in x], [row[key] for row in rows],
+                        width=width, label=name, edgecolor="black", alpha=0.8)
+        ax_time.set_xticks(list(x))
+        ax_time.set_xticklabels(labels, rotation=30, fontsize=8)
+        ax_time.set_ylabel("时间（秒）", fontsize=10, fontweight='bold')
+        ax_time.set_title("各算法时间指标对比", fontsize=12, fontweight="bold")
+        ax_time.legend(fontsize=8)
+        ax_time.grid(axis="y", linestyle="--", alpha=0.7)
+
+        ax_rate.bar([i - 0.2 for i in x], [row["throughput"] for row in rows],
+                    width=0.4, label="吞吐量", color="#4169E1", edgecolor="black")
+        ax_util = ax_rate.twinx()
+        ax_util.bar([i + 0.2 for i in x], [row["cpu_utilization"] * 100 for row in rows],
+                    width=0.4, label="CPU利用率(%)", color="#32CD32", edgecolor="black")
+        ax_util.set_ylim(0, 105)
+        ax_rate.set_xticks(list(x))
+        ax_rate.set_xticklabels(labels, rotation=30, fontsize=8)
+        ax_rate.set_title("吞吐量 / CPU利用率", fontsize=12, fontweight="bold")
+        ax_rate.legend(loc="upper left", fontsize=8)
+        ax_util.legend(loc="upper right", fontsize=8)
+
+        self.figure.tight_layout()
+        self.canvas.draw()
+        self.canvas.flush_events()
+
 # ======================== 主程序：整合所有模块（Windows核心适配） ========================
 def main():
     # Windows高DPI适配（解决界面/图形模糊）
@@ -1086,12 +3230,13 @@ def main():
     # 标签页整合4个核心模块
     tab_widget = QTabWidget()
     tab_widget.addTab(ProcessManagement(), "1. 进程/线程创建与管理")
-    tab_widget.addTab(IPCVisualization(), "2. 进程间通信（管道IPC）")
+    tab_widget.addTab(IPCVisualization(), "2. 进程间通信（IPC）")
     tab_widget.addTab(SemaphoreSync(), "3. 信号量同步（生产者-消费者）")
-    tab_widget.addTab(CPUScheduler(), "4. CPU调度算法（FCFS/RR/SJF）")
+    tab_widget.addTab(CPUScheduler(), "4. CPU调度算法（FCFS/RR/SJF/SRTF/优先级）")
 
-    # 主布局
+    # 主布局（全局模拟速度控件作用于所有模块）
     main_layout = QVBoxLayout()
+    main_layout.addWidget(SpeedControl(SIM_CLOCK))
     main_layout.addWidget(tab_widget)
     main_window.setLayout(main_layout)
 
@@ -0,0 +1,458 @@
+"""CPU调度引擎（无Qt/Matplotlib依赖，可独立导入）
+
+负载以列式数组存储（到达时间/执行时间/优先级），调度结果只记录进程下标，
+可直接回放10^5~10^6级别的进程轨迹；CPUScheduler界面仅作为本模块的展示端。
+"""
+import heapq
+import os
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+# ======================== 负载（列式存储） ========================
+def _as_time_array(values):
+    """时间列：整数输入保持int64（甘特图标签与原版一致），否则转float64"""
+    arr = np.asarray(values)
+    if arr.dtype.kind in "biu":
+        return arr.astype(np.int64, copy=False)
+    return arr.astype(np.float64, copy=False)
+
+
+class Workload:
+    """进程负载：arrival/burst/priority 三列等长数组，names可选（默认P1..Pn）"""
+
+    def __init__(self, arrival, burst, priority=None, names=None):
+        self.arrival = _as_time_array(arrival).ravel()
+        self.burst = _as_time_array(burst).ravel()
+        if self.arrival.dtype != self.burst.dtype:
+            # 整数与小数混用时统一为float64，保证调度结果时间列类型一致
+            self.arrival = self.arrival.astype(np.float64)
+            self.burst = self.burst.astype(np.float64)
+        n = len(self.arrival)
+        if priority is None:
+            priority = np.zeros(n, dtype=np.int64)
+        self.priority = np.asarray(priority, dtype=np.int64).ravel()
+        self.names = list(names) if names is not None else None
+
+        if len(self.burst) != n or len(self.priority) != n:
+            raise ValueError("arrival/burst/priority 长度不一致")
+        if self.names is not None and len(self.names) != n:
+            raise ValueError("names 长度与进程数不一致")
+        if n and not (np.isfinite(self.arrival).all() and np.isfinite(self.burst).all()):
+            raise ValueError("到达时间和执行时间必须为有限数值（不能为NaN/inf）")
+        if n and self.burst.min() <= 0:
+            raise ValueError("执行时间必须大于0")
+
+    @classmethod
+    def from_tuples(cls, processes):
+        """由 [(进程ID, 到达时间, 执行时间, 优先级)] 构造（兼容界面预设数据）"""
+        names = [p[0] for p in processes]
+        arrival = [p[1] for p in processes]
+        burst = [p[2] for p in processes]
+        priority = [p[3] for p in processes]
+        return cls(arrival, burst, priority, names)
+
+    def __len__(self):
+        return len(self.arrival)
+
+    @property
+    def time_dtype(self):
+        """时间列类型（int64或float64）"""
+        return self.arrival.dtype
+
+    def name(self, idx):
+        """进程下标 → 进程ID"""
+        if self.names is not None:
+            return self.names[idx]
+        return f"P{idx + 1}"
+
+    def to_tuples(self):
+        """转回 [(进程ID, 到达时间, 执行时间, 优先级)]（仅用于小规模展示）"""
+        return [
+            (self.name(i), arr, exe, pri)
+            for i, (arr, exe, pri) in enumerate(zip(
+                self.arrival.tolist(), self.burst.tolist(), self.priority.tolist()
+            ))
+        ]
+
+
+# ======================== 调度结果（列式NumPy数组） ========================
+def _segment_buffers(workload, float_time=False):
+    """调度循环中追加甘特图片段用的紧凑缓冲区（array.array，每项8字节）
+
+    float_time: 整数负载配合小数时间片等情况下强制使用float64时间列。
+    """
+    time_code = "q" if workload.time_dtype == np.int64 and not float_time else "d"
+    return array("q"), array(time_code), array(time_code)
+
+
+def _as_column(values, dtype):
+    """list/array.array/ndarray → NumPy列（array.array按自身类型零拷贝）"""
+    if isinstance(values, array):
+        dtype = np.int64 if values.typecode == "q" else np.float64
+        return np.frombuffer(values, dtype=dtype) if len(values) else np.empty(0, dtype)
+    return np.asarray(values, dtype=dtype)
+
+
+class ScheduleResult:
+    """调度结果（列式存储）
+
+    片段列：seg_index/seg_start/seg_finish（进程下标, 开始, 结束）
+    进程列：arrival/burst/first_run/completion（按进程下标对齐）
+    所有指标均由这些列向量化计算。
+    """
+
+    def __init__(self, algo, workload, seg_index, seg_start, seg_finish, completion):
+        self.algo = algo
+        self.workload = workload
+        self.seg_index = _as_column(seg_index, np.int64)
+        self.seg_start = _as_column(seg_start, workload.time_dtype)
+        time_dtype = self.seg_start.dtype
+        self.seg_finish = _as_column(seg_finish, time_dtype)
+        self.arrival = workload.arrival
+        self.burst = workload.burst
+        self.completion = _as_column(completion, time_dtype)
+        # 每个进程的首个片段即首次运行时刻（片段按时间顺序产生）
+        first_seg = np.unique(self.seg_index, return_index=True)[1]
+        self.first_run = np.empty(len(workload), dtype=time_dtype)
+        self.first_run[self.seg_index[first_seg]] = self.seg_start[first_seg]
+
+    @property
+    def gantt_data(self):
+        """[(进程ID, 开始时间, 结束时间)]，与原界面甘特图格式一致（仅用于小规模展示）"""
+        name = self.workload.name
+        return [
+            (name(i), s, f)
+            for i, s, f in zip(
+                self.seg_index.tolist(), self.seg_start.tolist(), self.seg_finish.tolist()
+            )
+        ]
+
+    @property
+    def turnaround_times(self):
+        return self.completion - self.arrival
+
+    @property
+    def wait_times(self):
+        # 等待时间 = 周转时间 - 执行时间（无IO阻塞时对所有算法成立）
+        return self.completion - self.arrival - self.burst
+
+    @property
+    def response_times(self):
+        return self.first_run - self.arrival
+
+    @property
+    def avg_wait(self):
+        return float(self.wait_times.mean())
+
+    @property
+    def avg_turnaround(self):
+        return float(self.turnaround_times.mean())
+
+    def wait_percentiles(self, percentiles=(50, 95, 99)):
+        """等待时间分位数 {"p50": .., "p95": .., "p99": ..}"""
+        values = np.percentile(self.wait_times, percentiles)
+        return {f"p{p:g}": float(v) for p, v in zip(percentiles, values)}
+
+    def per_process(self):
+        """逐进程指标（按进程下标对齐的列字典）"""
+        return {
+            "arrival": self.arrival,
+            "burst": self.burst,
+            "first_run": self.first_run,
+            "completion": self.completion,
+            "wait": self.wait_times,
+            "turnaround": self.turnaround_times,
+            "response": self.response_times,
+            "slices": np.bincount(self.seg_index, minlength=len(self.workload)),
+        }
+
+    def summary(self):
+        """汇总指标：平均等待/周转/响应时间、等待分位数、吞吐量、CPU利用率"""
+        n = len(self.workload)
+        # 时间跨度：首个进程到达 → 最后一个进程完成
+        makespan = float(self.completion.max() - self.arrival.min())
+        busy = float((self.seg_finish - self.seg_start).sum())
+        summary = {
+            "avg_wait": self.avg_wait,
+            "avg_turnaround": self.avg_turnaround,
+            "avg_response": float(self.response_times.mean()),
+        }
+        summary.update({f"{k}_wait": v for k, v in self.wait_percentiles().items()})
+        summary.update({
+            "throughput": n / makespan,
+            "cpu_utilization": busy / makespan,
+            "makespan": makespan,
+        })
+        return summary
+
+
+# ======================== 调度算法 ========================
+def fcfs(workload):
+    """FCFS：按到达时间稳定排序后整体向量化计算
+
+    finish[i] = max(finish[i-1], arrival[i]) + burst[i] 展开为
+    cumsum(burst)[i] + max(0, max_{j<=i}(arrival[j] - cumsum(burst)[j-1]))
+    """
+    order = np.argsort(workload.arrival, kind="stable")
+    arrival = workload.arrival[order]
+    burst = workload.burst[order]
+    done_work = np.cumsum(burst)
+    # 第i个进程开始前已完成的执行时间总和
+    prev_work = done_work - burst
+    idle_shift = np.maximum.accumulate(np.maximum(arrival - prev_work, 0))
+    finish = done_work + idle_shift
+    start = finish - burst
+
+    completion = np.empty_like(finish)
+    completion[order] = finish
+    return ScheduleResult("FCFS", workload, order, start, finish, completion)
+
+
+def rr(workload, time_slice=2):
+    """RR调度算法实现（时间片默认2，事件驱动）
+
+    到达游标按到达时间推进，就绪队列用deque（进程在队列中的唯一性由流程保证，
+    无需成员检查），空闲时直接跳到下一个到达时刻；复杂度 O(n log n + 片段数)。
+    """
+    if time_slice <= 0:
+        raise ValueError("时间片必须大于0")
+    float_time = not float(time_slice).is_integer()
+    if not float_time:
+        time_slice = int(time_slice)
+    arrival = workload.arrival.tolist()
+    remaining = workload.burst.tolist()
+    n = len(arrival)
+    # 到达游标：按到达时间稳定排序的进程下标
+    arrival_order = np.argsort(workload.arrival, kind="stable").tolist()
+    cursor = 0
+    current_time = 0
+    ready_queue = deque()
+    completion = [0] * n
+    seg_index, seg_start, seg_finish = _segment_buffers(workload, float_time)
+    done = 0
+
+    while done < n:
+        # 把到达的进程加入就绪队列（排在刚被抢占的进程之后，同批按输入顺序）
+        if cursor < n and arrival[arrival_order[cursor]] <= current_time:
+            end = cursor + 1
+            while end < n and arrival[arrival_order[end]] <= current_time:
+                end += 1
+            batch = arrival_order[cursor:end]
+            if len(batch) > 1:
+                batch.sort()
+            ready_queue.extend(batch)
+            cursor = end
+
+        if not ready_queue:
+            # CPU空闲：直接跳到下一个进程到达
+            current_time = max(current_time, arrival[arrival_order[cursor]])
+            continue
+
+        # 调度就绪队列首个进程
+        i = ready_queue.popleft()
+        rem = remaining[i]
+        start_time = current_time
+        seg_index.append(i)
+        seg_start.append(start_time)
+        if rem <= time_slice:
+            # 本片内完成
+            current_time += rem
+            completion[i] = current_time
+            done += 1
+        else:
+            current_time += time_slice
+            remaining[i] = rem - time_slice
+            ready_queue.append(i)
+        seg_finish.append(current_time)
+
+    return ScheduleResult("RR", workload, seg_index, seg_start, seg_finish, completion)
+
+
+def _heap_schedule(algo, workload, keys, preemptive):
+    """基于最小堆的通用事件循环（SJF/SRTF/优先级共用）
+
+    keys: 每个进程的排序键列表（越小越先调度，同键按输入顺序）；
+          传入None表示以剩余执行时间为键（SRTF）。
+    preemptive: 为True时在每个到达时刻检查是否有更小键的进程可抢占。
+    到达游标 + 堆使复杂度为 O(n log n)，空闲时直接跳到下一个到达时刻。
+    """
+    arrival = workload.arrival.tolist()
+    remaining = workload.burst.tolist()
+    if keys is None:
+        # 剩余时间只在进程运行时变化，堆中条目的键始终有效
+        keys = remaining
+    n = len(arrival)
+    arrival_order = np.argsort(workload.arrival, kind="stable").tolist()
+    cursor = 0
+    current_time = 0
+    heap = []
+    completion = [0] * n
+    seg_index, seg_start, seg_finish = _segment_buffers(workload)
+    running = -1
+    run_start = 0
+    done = 0
+
+    while done < n:
+        # 把到达的进程压入堆
+        while cursor < n and arrival[arrival_order[cursor]] <= current_time:
+            i = arrival_order[cursor]
+            heapq.heappush(heap, (keys[i], i))
+            cursor += 1
+
+        if running < 0:
+            if not heap:
+                # CPU空闲：直接跳到下一个进程到达
+                current_time = arrival[arrival_order[cursor]]
+                continue
+            running = heapq.heappop(heap)[1]
+            run_start = current_time
+        elif heap and heap[0][0] < keys[running]:
+            # 抢占：当前片段结束，运行进程放回堆
+            seg_index.append(running)
+            seg_start.append(run_start)
+            seg_finish.append(current_time)
+            heapq.heappush(heap, (keys[running], running))
+            running = heapq.heappop(heap)[1]
+            run_start = current_time
+
+        # 运行到完成，或（抢占式）运行到下一个到达时刻
+        finish_time = current_time + remaining[running]
+        if preemptive and cursor < n and arrival[arrival_order[cursor]] < finish_time:
+            next_arrival = arrival[arrival_order[cursor]]
+            remaining[running] -= next_arrival - current_time
+            current_time = next_arrival
+            continue
+
+        current_time = finish_time
+        remaining[running] = 0
+        seg_index.append(running)
+        seg_start.append(run_start)
+        seg_finish.append(current_time)
+        completion[running] = current_time
+        running = -1
+        done += 1
+
+    return ScheduleResult(algo, workload, seg_index, seg_start, seg_finish, completion)
+
+
+def sjf(workload):
+    """SJF（最短作业优先，非抢占）"""
+    return _heap_schedule("SJF", workload, workload.burst.tolist(), preemptive=False)
+
+
+def srtf(workload):
+    """SRTF（最短剩余时间优先，抢占式SJF）"""
+    return _heap_schedule("SRTF", workload, None, preemptive=True)
+
+
+def priority(workload, preemptive=False):
+    """优先级调度（使用第4列优先级，数值越小越优先）"""
+    return _heap_schedule(
+        "PRIORITY", workload, workload.priority.tolist(), preemptive=preemptive
+    )
+
+
+# 算法注册表：名称 → 调度函数(workload, **options)
+ALGORITHMS = {
+    "FCFS": fcfs,
+    "RR": rr,
+    "SJF": sjf,
+    "SRTF": srtf,
+    "PRIORITY": priority,
+}
+
+
+def schedule(algo, workload, **options):
+    """按名称执行调度算法"""
+    try:
+        func = ALGORITHMS[algo]
+    except KeyError:
+        raise ValueError(f"未知调度算法：{algo}") from None
+    if not len(workload):
+        raise ValueError("负载为空")
+    return func(workload, **options)
+
+
+# ======================== 批量对比（多进程并行） ========================
+# 对比表/图中展示的指标：(键, 中文名)
+COMPARE_METRICS = [
+    ("avg_wait", "平均等待时间"),
+    ("avg_turnaround", "平均周转时间"),
+    ("avg_response", "平均响应时间"),
+    ("p95_wait", "P95等待时间"),
+    ("p99_wait", "P99等待时间"),
+    ("throughput", "吞吐量（个/秒）"),
+    ("cpu_utilization", "CPU利用率"),
+]
+
+# 工作进程中的负载（由进程池initializer设置一次，避免每个任务重复序列化）
+_worker_workload = None
+
+
+def _init_compare_worker(workload):
+    global _worker_workload
+    _worker_workload = workload
+
+
+def _compare_task(job):
+    label, algo, options = job
+    result = schedule(algo, _worker_workload, **options)
+    return dict(label=label, algo=algo, options=options, **result.summary())
+
+
+def compare_jobs(algos=None, quanta=(1, 2, 4, 8)):
+    """生成对比任务列表 [(标签, 算法, 参数)]：RR按时间片展开扫描"""
+    jobs = []
+    for algo in algos or ALGORITHMS:
+        if algo == "RR":
+            jobs.extend((f"RR(q={q})", "RR", {"time_slice": q}) for q in quanta)
+        else:
+            jobs.append((algo, algo, {}))
+    return jobs
+
+
+def compare(workload, algos=None, quanta=(1, 2, 4, 8), max_workers=None):
+    """同一负载上并行运行全部算法（及RR时间片扫描），返回每种配置的指标字典列表
+
+    各配置相互独立，通过进程池分发到多个CPU核；max_workers=1时在当前进程顺序执行。
+    """
+    if not len(workload):
+        raise ValueError("负载为空")
+    jobs = compare_jobs(algos, quanta)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(jobs))
+
+    if max_workers <= 1:
+        _init_compare_worker(workload)
+        try:
+            return [_compare_task(job) for job in jobs]
+        finally:
+            _init_compare_worker(None)
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_compare_worker,
+        initargs=(workload,),
+    ) as pool:
+        # map保持任务顺序
+        return list(pool.map(_compare_task, jobs))
+
+
+def format_compare_table(rows):
+    """对比结果格式化为制表符分隔的文本表格"""
+    header = ["配置"] + [label for _, label in COMPARE_METRICS]
+    lines = ["\t".join(header)]
+    for row in rows:
+        cells = [row["label"]]
+        for key, _ in COMPARE_METRICS:
+            if key == "cpu_utilization":
+                cells.append(f"{row[key] * 100:.1f}%")
+            else:
+                cells.append(f"{row[key]:.3f}")
+        lines.append("\t".join(cells))
+    return "\n".join(lines)
@@ -0,0 +1,319 @@
+"""调度负载与结果的文件读写（无Qt/Matplotlib依赖）
+
+支持三种格式（按扩展名识别）：
+  .csv   表头 pid,arrival,burst,priority（pid/priority可省略），逐行流式解析
+  .jsonl 每行一个对象 {"pid":..,"arrival":..,"burst":..,"priority":..}
+  .bin   列式二进制（struct-of-arrays），np.memmap 直接映射，百万级轨迹无需解析即可打开
+
+二进制格式（小端）：
+  头部  magic(8B "CPUTRACE") | version(u32) | 列数(u32) | 行数(u64)
+  列目录 每列 名称(16B, ASCII补0) | 类型码(8B, "q"=int64 / "d"=float64)
+  数据  各列依次连续存放，起始位置按8字节对齐
+"""
+import csv
+import json
+import os
+import struct
+from array import array
+
+import numpy as np
+
+from scheduler_engine import Workload
+
+BIN_MAGIC = b"CPUTRACE"
+BIN_VERSION = 1
+_HEADER = struct.Struct("<8sIIQ")
+_COLUMN = struct.Struct("<16s8s")
+_DTYPES = {"q": np.dtype("<i8"), "d": np.dtype("<f8")}
+
+# 每次从NumPy列转换为Python对象写出的行数（控制导出时的内存峰值）
+_CHUNK = 1 << 16
+
+FORMATS = ("csv", "jsonl", "bin")
+
+
+def detect_format(path, fmt=None):
+    """由参数或扩展名确定文件格式"""
+    if fmt is None:
+        fmt = os.path.splitext(path)[1].lstrip(".").lower()
+        if fmt == "trace":
+            fmt = "bin"
+    if fmt not in FORMATS:
+        raise ValueError(f"不支持的文件格式：{fmt}（可选：{', '.join(FORMATS)}）")
+    return fmt
+
+
+# ======================== 列式二进制（memmap） ========================
+def _pack_column(name, code):
+    """列目录项：列名须为不超过16字节的ASCII"""
+    if code not in _DTYPES:
+        raise ValueError(f"不支持的列类型码：{code!r}（可选：{', '.join(_DTYPES)}）")
+    try:
+        raw = name.encode("ascii")
+    except UnicodeEncodeError:
+        raise ValueError(f"列名只能包含ASCII字符：{name!r}") from None
+    if len(raw) > _COLUMN.size - 8:
+        raise ValueError(f"列名不能超过{_COLUMN.size - 8}字节：{name!r}")
+    return _COLUMN.pack(raw, code.encode("ascii"))
+
+
+def write_columns(path, columns):
+    """写列式二进制文件：columns为 {列名: 一维数组}，各列等长"""
+    names = list(columns)
+    arrays = []
+    for name in names:
+        col = np.asarray(columns[name]).ravel()
+        code = "q" if col.dtype.kind in "biu" else "d"
+        arrays.append((name, code, col.astype(_DTYPES[code], copy=False)))
+    rows = len(arrays[0][2]) if arrays else 0
+    if any(len(col) != rows for _, _, col in arrays):
+        raise ValueError("各列长度不一致")
+    directory = b"".join(_pack_column(name, code) for name, code, _ in arrays)
+
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(BIN_MAGIC, BIN_VERSION, len(arrays), rows))
+        f.write(directory)
+        for _, _, col in arrays:
+            col.tofile(f)
+
+
+def create_columns(path, dtypes, rows):
+    """预分配列式二进制文件并以可写memmap打开：dtypes为 {列名: "q"/"d"}
+
+    用于生成器等按块直接写盘的场景，避免先在内存中构造完整数组。
+    """
+    directory = b"".join(_pack_column(name, code) for name, code in dtypes.items())
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(BIN_MAGIC, BIN_VERSION, len(dtypes), rows))
+        f.write(directory)
+        data_size = sum(rows * _DTYPES[code].itemsize for code in dtypes.values())
+        if data_size:
+            f.truncate(f.tell() + data_size)
+    return read_columns(path, mode="r+")
+
+
+def read_columns(path, mode="r"):
+    """以memmap方式打开列式二进制文件，返回 {列名: np.memmap}（不读入内存）"""
+    with open(path, "rb") as f:
+        head = f.read(_HEADER.size)
+        if len(head) < _HEADER.size:
+            raise ValueError(f"文件过短，不是有效的轨迹文件：{path}")
+        magic, version, ncols, rows = _HEADER.unpack(head)
+        if magic != BIN_MAGIC:
+            raise ValueError(f"不是有效的轨迹文件：{path}")
+        if version != BIN_VERSION:
+            raise ValueError(f"不支持的轨迹文件版本：{version}")
+        directory = []
+        for _ in range(ncols):
+            entry = f.read(_COLUMN.size)
+            if len(entry) != _COLUMN.size:
+                raise ValueError(f"列目录不完整，文件已截断：{path}")
+            directory.append(_COLUMN.unpack(entry))
+
+    offset = _HEADER.size + ncols * _COLUMN.size
+    columns = {}
+    for raw_name, raw_code in directory:
+        try:
+            name = raw_name.rstrip(b"\0").decode("ascii")
+            dtype = _DTYPES.get(raw_code.rstrip(b"\0").decode("ascii"))
+        except UnicodeDecodeError:
+            dtype = None
+        if dtype is None:
+            raise ValueError(f"列目录中存在无效的列名或类型码{raw_code!r}：{path}")
+        if rows:
+            columns[name] = np.memmap(path, dtype=dtype, mode=mode, offset=offset, shape=(rows,))
+        else:
+            columns[name] = np.empty(0, dtype=dtype)
+        offset += rows * dtype.itemsize
+    return columns
+
+
+# ======================== 流式文本读写 ========================
+def _time_column(values):
+    """文本解析得到的float列：全部为整数时还原为int64"""
+    col = np.frombuffer(values, dtype=np.float64) if len(values) else np.empty(0)
+    if np.isfinite(col).all() and np.all(np.mod(col, 1) == 0):
+        return col.astype(np.int64)
+    return col.copy()
+
+
+def _collect(path, records):
+    """把 (行号, pid, arrival, burst, priority) 记录流累积进紧凑数组（不保留逐进程元组）"""
+    arrival, burst, priority = array("d"), array("d"), array("q")
+    names = []
+    has_names = None
+    for line_no, pid, arr, exe, pri in records:
+        try:
+            arrival.append(float(arr))
+            burst.append(float(exe))
+            priority.append(int(float(pri or 0)))
+        except (TypeError, ValueError, OverflowError) as e:
+            raise ValueError(f"{path} 第{line_no}行数值无效：{e}") from None
+        named = pid not in (None, "")
+        if has_names is None:
+            has_names = named
+        elif named != has_names:
+            raise ValueError(f"{path} 第{line_no}行{'缺少' if has_names else '含有'}pid，"
+                             f"pid须在所有行都给出或都省略")
+        if has_names:
+            names.append(str(pid))
+    return Workload(
+        _time_column(arrival), _time_column(burst),
+        np.frombuffer(priority, dtype=np.int64) if len(priority) else None,
+        names if has_names else None,
+    )
+
+
+def _iter_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = [h.strip() for h in next(reader, [])]
+        missing = {"arrival", "burst"} - set(header)
+        if missing:
+            raise ValueError(f"CSV缺少列：{', '.join(sorted(missing))}")
+        arr_col, exe_col = header.index("arrival"), header.index("burst")
+        pid_col = header.index("pid") if "pid" in header else None
+        pri_col = header.index("priority") if "priority" in header else None
+        width = max(arr_col, exe_col, pid_col or 0, pri_col or 0) + 1
+        for row in reader:
+            if not row:
+                continue
+            if len(row) < width:
+                raise ValueError(f"{path} 第{reader.line_num}行只有{len(row)}列，至少需要{width}列")
+            yield (
+                reader.line_num,
+                row[pid_col] if pid_col is not None else None,
+                row[arr_col], row[exe_col],
+                row[pri_col] if pri_col is not None else None,
+            )
+
+
+def _iter_jsonl(path):
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rec = json.loads(line)
+                if not isinstance(rec, dict):
+                    raise ValueError("应为JSON对象")
+                record = (line_no, rec.get("pid"), rec["arrival"], rec["burst"], rec.get("priority"))
+            except (ValueError, KeyError) as e:
+                raise ValueError(f"{path} 第{line_no}行不是有效的进程记录：{e}") from None
+            yield record
+
+
+def _write_text(path, fmt, columns):
+    """按块把 {列名: 数组} 写成CSV/JSONL（逐行，不一次性展开全部数据）"""
+    names = list(columns)
+    rows = len(next(iter(columns.values()))) if columns else 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f) if fmt == "csv" else None
+        if writer:
+            writer.writerow(names)
+        for start in range(0, rows, _CHUNK):
+            chunk = [
+                col[start:start + _CHUNK] if isinstance(col, list)
+                else col[start:start + _CHUNK].tolist()
+                for col in columns.values()
+            ]
+            if writer:
+                writer.writerows(zip(*chunk))
+            else:
+                f.writelines(
+                    json.dumps(dict(zip(names, row)), ensure_ascii=False) + "\n"
+                    for row in zip(*chunk)
+                )
+
+
+def _write(path, fmt, columns):
+    fmt = detect_format(path, fmt)
+    if fmt == "bin":
+        write_columns(path, columns)
+    else:
+        _write_text(path, fmt, columns)
+
+
+# ======================== 负载导入/导出 ========================
+def load_workload(path, fmt=None):
+    """从CSV/JSONL/二进制轨迹文件加载负载（二进制为memmap，打开即用）"""
+    fmt = detect_format(path, fmt)
+    if fmt == "bin":
+        cols = read_columns(path)
+        missing = {"arrival", "burst"} - set(cols)
+        if missing:
+            raise ValueError(f"{path} 不是负载轨迹文件（缺少列：{', '.join(sorted(missing))}）")
+        return Workload(cols["arrival"], cols["burst"], cols.get("priority"))
+    records = _iter_csv(path) if fmt == "csv" else _iter_jsonl(path)
+    return _collect(path, records)
+
+
+def save_workload(workload, path, fmt=None):
+    """保存负载（二进制格式不保存进程名，加载后默认为P1..Pn）"""
+    fmt = detect_format(path, fmt)
+    columns = {}
+    if fmt != "bin":
+        columns["pid"] = workload.names or [workload.name(i) for i in range(len(workload))]
+    columns.update(arrival=workload.arrival, burst=workload.burst, priority=workload.priority)
+    _write(path, fmt, columns)
+
+
+# ======================== 调度结果导出 ========================
+def save_segments(result, path, fmt=None):
+    """导出甘特图片段：index(进程下标), start, finish"""
+    _write(path, fmt, {
+        "index": result.seg_index,
+        "start": result.seg_start,
+        "finish": result.seg_finish,
+    })
+
+
+def save_process_metrics(result, path, fmt=None):
+    """导出逐进程指标（到达/执行/首次运行/完成/等待/周转/响应/时间片数）"""
+    _write(path, fmt, {"index": np.arange(len(result.workload)), **result.per_process()})
+
+
+def save_summary(rows, path, fmt=None):
+    """导出汇总指标行（如 compare() 的返回值，或 [dict(label=..., **result.summary())]）"""
+    fmt = detect_format(path, fmt)
+    if fmt == "bin":
+        raise ValueError("汇总指标仅支持CSV/JSONL格式")
+    keys = [k for k in rows[0] if k != "options"] if rows else []
+    _write_text(path, fmt, {k: [row[k] for row in rows] for k in keys})
+
+
+# ======================== 命令行：无界面回放轨迹 ========================
+def main(argv=None):
+    import argparse
+
+    import scheduler_engine
+
+    parser = argparse.ArgumentParser(description="无界面回放调度负载轨迹")
+    parser.add_argument("trace", help="负载轨迹文件（.csv/.jsonl/.bin）")
+    parser.add_argument("--algo", default="FCFS", choices=list(scheduler_engine.ALGORITHMS))
+    parser.add_argument("--quantum", type=float, default=2, help="RR时间片")
+    parser.add_argument("--segments", help="导出甘特图片段的路径")
+    parser.add_argument("--metrics", help="导出逐进程指标的路径")
+    parser.add_argument("--compare", help="运行全部算法对比并把汇总指标写入该路径（csv/jsonl）")
+    args = parser.parse_args(argv)
+
+    workload = load_workload(args.trace)
+    if args.compare:
+        rows = scheduler_engine.compare(workload)
+        save_summary(rows, args.compare)
+        print(scheduler_engine.format_compare_table(rows))
+        return
+
+    options = {"time_slice": args.quantum} if args.algo == "RR" else {}
+    result = scheduler_engine.schedule(args.algo, workload, **options)
+    if args.segments:
+        save_segments(result, args.segments)
+    if args.metrics:
+        save_process_metrics(result, args.metrics)
+    for key, value in result.summary().items():
+        print(f"{key}\t{value:.6g}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""可复现的合成调度负载生成器（无Qt/Matplotlib依赖）
+
+按随机种子从给定分布按块生成到达时间/执行时间/优先级三列，直接写入
+Workload的NumPy列或列式二进制轨迹文件（memmap），不构造逐进程元组，
+可生成10^7级别的负载用于调度算法压测。
+"""
+import numpy as np
+
+import scheduler_io
+from scheduler_engine import Workload
+
+# 每块生成的进程数：同一种子、同一块大小下，内存生成与写盘生成结果完全一致
+CHUNK_SIZE = 1 << 20
+
+ARRIVAL_DISTS = ("poisson", "uniform", "batch")
+BURST_DISTS = ("exponential", "pareto", "bimodal", "uniform")
+
+
+class WorkloadSpec:
+    """负载分布参数
+
+    arrival: poisson（指数间隔，速率arrival_rate）/ uniform（均匀分布在[0, span]）/
+             batch（全部在0时刻到达）
+    arrival_rate: 泊松到达速率；为None时按 load / 平均执行时间 推导（load为CPU负载率）
+    burst: exponential / pareto（形状pareto_shape，均值burst_mean）/
+           bimodal（短作业均值burst_mean，以long_fraction概率取长作业均值long_burst_mean）/
+           uniform（[1, 2*burst_mean-1]）
+    priority_weights: 优先级0..k-1的抽样权重（数值越小越优先）
+    integer: 为True时时间取整（到达向下取整，执行时间向上取整且至少为1）
+    """
+
+    def __init__(self, arrival="poisson", arrival_rate=None, load=0.9,
+                 burst="exponential", burst_mean=5.0, burst_max=None,
+                 pareto_shape=1.5, long_burst_mean=50.0, long_fraction=0.1,
+                 priority_weights=(0.25, 0.25, 0.25, 0.25), integer=True):
+        if arrival not in ARRIVAL_DISTS:
+            raise ValueError(f"未知到达分布：{arrival}（可选：{', '.join(ARRIVAL_DISTS)}）")
+        if burst not in BURST_DISTS:
+            raise ValueError(f"未知执行时间分布：{burst}（可选：{', '.join(BURST_DISTS)}）")
+        if burst_mean <= 0 or long_burst_mean <= 0:
+            raise ValueError("平均执行时间必须大于0")
+        if burst == "pareto" and pareto_shape <= 1:
+            raise ValueError("Pareto形状参数必须大于1（否则均值不存在）")
+        if not 0 <= long_fraction <= 1:
+            raise ValueError("long_fraction 必须在[0, 1]之间")
+        if arrival_rate is None and load <= 0:
+            raise ValueError("load 必须大于0")
+        if arrival_rate is not None and arrival_rate <= 0:
+            raise ValueError("arrival_rate 必须大于0")
+        weights = np.asarray(priority_weights, dtype=np.float64)
+        if weights.ndim != 1 or not len(weights) or weights.min() < 0 or weights.sum() <= 0:
+            raise ValueError("priority_weights 必须是非负且和大于0的权重序列")
+
+        self.arrival = arrival
+        self.load = load
+        self.burst = burst
+        self.burst_mean = burst_mean
+        self.burst_max = burst_max
+        self.pareto_shape = pareto_shape
+        self.long_burst_mean = long_burst_mean
+        self.long_fraction = long_fraction
+        self.priority_weights = weights / weights.sum()
+        self.integer = integer
+        self.arrival_rate = load / self.mean_burst if arrival_rate is None else arrival_rate
+
+    @property
+    def mean_burst(self):
+        """执行时间分布的理论均值"""
+        if self.burst == "bimodal":
+            return ((1 - self.long_fraction) * self.burst_mean
+                    + self.long_fraction * self.long_burst_mean)
+        return self.burst_mean
+
+    @property
+    def time_code(self):
+        return "q" if self.integer else "d"
+
+
+def _bursts(rng, spec, size):
+    if spec.burst == "exponential":
+        burst = rng.exponential(spec.burst_mean, size)
+    elif spec.burst == "pareto":
+        # rng.pareto为Lomax分布，+1后乘尺度得到经典Pareto；尺度按均值反推
+        scale = spec.burst_mean * (spec.pareto_shape - 1) / spec.pareto_shape
+        burst = (rng.pareto(spec.pareto_shape, size) + 1) * scale
+    elif spec.burst == "bimodal":
+        means = np.where(rng.random(size) < spec.long_fraction,
+                         spec.long_burst_mean, spec.burst_mean)
+        burst = rng.exponential(1.0, size) * means
+    else:
+        burst = rng.uniform(1, max(2 * spec.burst_mean - 1, 1), size)
+    if spec.burst_max is not None:
+        np.minimum(burst, spec.burst_max, out=burst)
+    if spec.integer:
+        return np.maximum(np.ceil(burst), 1).astype(np.int64)
+    # 执行时间必须为正
+    return np.maximum(burst, 1e-9)
+
+
+def iter_chunks(n, spec=None, seed=None, chunk_size=CHUNK_SIZE):
+    """按块生成 (arrival, burst, priority) 三列，到达时间跨块保持单调递增"""
+    spec = spec or WorkloadSpec()
+    rng = np.random.default_rng(seed)
+    span = n / spec.arrival_rate
+    last_arrival = 0.0
+    for start in range(0, n, chunk_size):
+        size = min(chunk_size, n - start)
+        if spec.arrival == "poisson":
+            arrival = last_arrival + np.cumsum(rng.exponential(1 / spec.arrival_rate, size))
+            last_arrival = float(arrival[-1])
+        elif spec.arrival == "uniform":
+            # 块内排序 + 块间按区间分段，整体仍为[0, span]上的有序均匀分布
+            lo, hi = span * start / n, span * (start + size) / n
+            arrival = np.sort(rng.uniform(lo, hi, size))
+        else:
+            arrival = np.zeros(size)
+        if spec.integer:
+            arrival = np.floor(arrival).astype(np.int64)
+        burst = _bursts(rng, spec, size)
+        priority = rng.choice(len(spec.priority_weights), size, p=spec.priority_weights)
+        yield arrival, burst, priority.astype(np.int64)
+
+
+def generate_workload(n, spec=None, seed=None, chunk_size=CHUNK_SIZE):
+    """在内存中生成n个进程的负载（预分配列，按块填充）"""
+    spec = spec or WorkloadSpec()
+    dtype = np.int64 if spec.integer else np.float64
+    arrival = np.empty(n, dtype=dtype)
+    burst = np.empty(n, dtype=dtype)
+    priority = np.empty(n, dtype=np.int64)
+    pos = 0
+    for arr, exe, pri in iter_chunks(n, spec, seed, chunk_size):
+        end = pos + len(arr)
+        arrival[pos:end], burst[pos:end], priority[pos:end] = arr, exe, pri
+        pos = end
+    return Workload(arrival, burst, priority)
+
+
+def generate_trace(path, n, spec=None, seed=None, chunk_size=CHUNK_SIZE):
+    """直接把n个进程的负载按块写入列式二进制轨迹文件（内存占用与n无关）"""
+    spec = spec or WorkloadSpec()
+    code = spec.time_code
+    cols = scheduler_io.create_columns(
+        path, {"arrival": code, "burst": code, "priority": "q"}, n
+    )
+    pos = 0
+    for arr, exe, pri in iter_chunks(n, spec, seed, chunk_size):
+        end = pos + len(arr)
+        cols["arrival"][pos:end] = arr
+        cols["burst"][pos:end] = exe
+        cols["priority"][pos:end] = pri
+        pos = end
+    for col in cols.values():
+        if isinstance(col, np.memmap):
+            col.flush()
+    return path
+
+
+# ======================== 命令行：生成轨迹文件 ========================
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="生成可复现的合成调度负载轨迹")
+    parser.add_argument("output", help="输出路径（.bin直接按块写盘；.csv/.jsonl先在内存生成）")
+    parser.add_argument("-n", "--count", type=int, default=100000, help="进程数")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--arrival", default="poisson", choices=ARRIVAL_DISTS)
+    parser.add_argument("--load", type=float, default=0.9, help="CPU负载率（决定泊松到达速率）")
+    parser.add_argument("--burst", default="exponential", choices=BURST_DISTS)
+    parser.add_argument("--burst-mean", type=float, default=5.0)
+    parser.add_argument("--float-time", action="store_true", help="不对时间取整")
+    args = parser.parse_args(argv)
+
+    spec = WorkloadSpec(arrival=args.arrival, load=args.load, burst=args.burst,
+                        burst_mean=args.burst_mean, integer=not args.float_time)
+    if scheduler_io.detect_format(args.output) == "bin":
+        generate_trace(args.output, args.count, spec, args.seed)
+    else:
+        scheduler_io.save_workload(generate_workload(args.count, spec, args.seed), args.output)
+    print(f"已生成 {args.count} 个进程 → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
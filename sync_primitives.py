@@ -0,0 +1,643 @@
+"""有界缓冲区同步原语与基准测试（无Qt/Matplotlib依赖）
+
+同一个生产者-消费者有界缓冲区负载，分别用五种同步方式实现：
+  mp_semaphore      multiprocessing.Semaphore（内核信号量，可跨进程）× empty/full/mutex + 列表环
+  thread_semaphore  threading.Semaphore × empty/full + threading.Lock 作mutex + 列表环
+  condition         threading.Condition（一把锁、非空/非满两个条件变量）+ deque
+  queue             queue.Queue(maxsize)
+  deque             collections.deque（append/popleft在GIL下原子；满/空时让出CPU轮询）
+
+基准测试不限速运行：每个生产者写入定量的时间戳（perf_counter_ns），消费者取出时计算
+入队到出队的延迟并计入 LatencyHistogram；结果为每秒完成的条数与延迟分位数。
+
+信号量演示的一次P/V流程（produce_one/consume_one）与计量（WorkerStats）由线程模式和
+进程模式共用；进程模式的工作进程（worker_main）共享 multiprocessing.Semaphore 与
+shared_memory 环形缓冲区（ShmRingBuffer），计量与日志经状态队列定期汇报给界面。
+"""
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from collections import deque
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from ipc_transport import LatencyHistogram
+
+PRIMITIVES = ("mp_semaphore", "thread_semaphore", "condition", "queue", "deque")
+PRIMITIVE_NAMES = {
+    "mp_semaphore": "multiprocessing.Semaphore",
+    "thread_semaphore": "threading.Semaphore",
+    "condition": "threading.Condition",
+    "queue": "queue.Queue",
+    "deque": "collections.deque",
+}
+# 能提供 empty/full/mutex 三个信号量（P/V语义）的实现，可用于信号量演示
+SEMAPHORE_PRIMITIVES = ("mp_semaphore", "thread_semaphore")
+# 线程内演示的默认实现：基准测试中 multiprocessing.Semaphore（C实现的sem_t）明显快于
+# 纯Python实现的 threading.Semaphore；界面运行基准测试后会改选实测最快者
+DEFAULT_PRIMITIVE = "mp_semaphore"
+
+
+def make_semaphores(kind, size):
+    """创建演示用的 (empty, full, mutex)，acquire 均支持 timeout 参数"""
+    if kind == "mp_semaphore":
+        return multiprocessing.Semaphore(size), multiprocessing.Semaphore(0), multiprocessing.Semaphore(1)
+    if kind == "thread_semaphore":
+        return threading.Semaphore(size), threading.Semaphore(0), threading.Lock()
+    raise ValueError(f"不是信号量实现：{kind}")
+
+
+class SemaphoreBuffer:
+    """经典三信号量有界缓冲区"""
+
+    def __init__(self, kind, size):
+        self.empty, self.full, self.mutex = make_semaphores(kind, size)
+        self.slots = [None] * size
+        self.size = size
+        self.in_idx = self.out_idx = 0
+
+    def put(self, item):
+        self.empty.acquire()
+        self.mutex.acquire()
+        self.slots[self.in_idx] = item
+        self.in_idx = (self.in_idx + 1) % self.size
+        self.mutex.release()
+        self.full.release()
+
+    def get(self):
+        self.full.acquire()
+        self.mutex.acquire()
+        item = self.slots[self.out_idx]
+        self.out_idx = (self.out_idx + 1) % self.size
+        self.mutex.release()
+        self.empty.release()
+        return item
+
+
+class ConditionBuffer:
+    """一把锁 + 非空/非满条件变量，只唤醒需要的一方"""
+
+    def __init__(self, size):
+        self.items = deque()
+        self.size = size
+        lock = threading.Lock()
+        self.not_empty = threading.Condition(lock)
+        self.not_full = threading.Condition(lock)
+
+    def put(self, item):
+        with self.not_full:
+            while len(self.items) >= self.size:
+                self.not_full.wait()
+            self.items.append(item)
+            self.not_empty.notify()
+
+    def get(self):
+        with self.not_empty:
+            while not self.items:
+                self.not_empty.wait()
+            item = self.items.popleft()
+            self.not_full.notify()
+            return item
+
+
+class QueueBuffer:
+    def __init__(self, size):
+        self.queue = queue.Queue(size)
+        self.put = self.queue.put
+        self.get = self.queue.get
+
+
+class DequeBuffer:
+    """无锁deque：append/popleft本身原子，满/空时 sleep(0) 让出CPU
+
+    长度检查与append之间不加锁，多个生产者时容量可能短暂超出至多（生产者数-1）。
+    """
+
+    def __init__(self, size):
+        self.items = deque()
+        self.size = size
+
+    def put(self, item):
+        while len(self.items) >= self.size:
+            time.sleep(0)
+        self.items.append(item)
+
+    def get(self):
+        while True:
+            try:
+                return self.items.popleft()
+            except IndexError:
+                time.sleep(0)
+
+
+def make_buffer(kind, size):
+    if kind in SEMAPHORE_PRIMITIVES:
+        return SemaphoreBuffer(kind, size)
+    if kind == "condition":
+        return ConditionBuffer(size)
+    if kind == "queue":
+        return QueueBuffer(size)
+    if kind == "deque":
+        return DequeBuffer(size)
+    raise ValueError(f"未知的同步方式：{kind}")
+
+
+# ======================== 一次P/V流程与计量（线程/进程模式共用） ========================
+def acquire_while(sem, running, poll=0.1):
+    """P操作：阻塞期间定期检查running()，停止时放弃等待并返回False"""
+    while not sem.acquire(timeout=poll):
+        if not running():
+            return False
+    return True
+
+
+class WorkerStats:
+    """单个生产者/消费者的竞争计量（只由该工作线程/进程写入，界面按帧读取）
+
+    blocked_ns：在 empty/full/mutex 上的累计阻塞时间（ns）；acquisitions：成功的P操作次数；
+    hold_samples：互斥锁持有时间（ns，待界面取走计入直方图）；
+    segments：时间线片段 (状态, 开始ns, 结束ns)，只保留最近 max_segments 段；
+    current：正在进行的状态 (状态, 开始ns)，使长时间阻塞在结束前就能显示和计入。
+    进程模式下工作进程用 report() 打包增量，界面进程中同名的 WorkerStats 用 apply() 合并。
+    """
+
+    def __init__(self, name, max_segments=1000):
+        self.name = name
+        self.blocked_ns = {"empty": 0, "full": 0, "mutex": 0}
+        self.acquisitions = 0
+        self.hold_samples = deque(maxlen=100000)
+        self.hold_counts = None  # apply() 合并来的持有时间直方图计数（待取走）
+        self.segments = deque(maxlen=max_segments)
+        self.segment_count = 0
+        self.reported_segments = 0
+        self.current = None
+
+    def add_segment(self, state, start, end):
+        self.segments.append((state, start, end))
+        self.segment_count += 1
+
+    def acquire(self, sem, which, running):
+        """计时的P操作：阻塞时间计入which，停止时放弃等待并返回False"""
+        start = time.perf_counter_ns()
+        self.current = ("等待" + which, start)
+        acquired = acquire_while(sem, running)
+        end = time.perf_counter_ns()
+        self.current = None
+        self.blocked_ns[which] += end - start
+        self.add_segment("等待" + which, start, end)
+        if acquired:
+            self.acquisitions += 1
+        return acquired
+
+    def held(self, start, end):
+        """记录一次互斥锁持有区间"""
+        self.hold_samples.append(end - start)
+        self.add_segment("持有mutex", start, end)
+
+    def idle(self, sleep):
+        """调用sleep()并记为休眠片段"""
+        start = time.perf_counter_ns()
+        self.current = ("休眠", start)
+        sleep()
+        self.current = None
+        self.add_segment("休眠", start, time.perf_counter_ns())
+
+    def blocked_until(self, now):
+        """截至now的累计阻塞时间（含正在进行的等待）"""
+        blocked = dict(self.blocked_ns)
+        current = self.current
+        if current and current[0].startswith("等待"):
+            blocked[current[0][2:]] += max(now - current[1], 0)
+        return blocked
+
+    def recent_segments(self, now):
+        """已结束的片段加上正在进行的状态（截至now）"""
+        segments = list(self.segments)
+        current = self.current
+        if current:
+            segments.append((current[0], current[1], now))
+        return segments
+
+    def drain_holds(self):
+        samples = []
+        while self.hold_samples:
+            samples.append(self.hold_samples.popleft())
+        return samples
+
+    def drain_holds_into(self, hist):
+        """把尚未取走的持有时间计入直方图hist"""
+        samples = self.drain_holds()
+        if samples:
+            hist.record(samples)
+        if self.hold_counts is not None:
+            hist.add(self.hold_counts)
+            self.hold_counts = None
+
+    def report(self):
+        """自上次汇报以来的增量：(累计阻塞ns, P操作次数, 持有时间直方图(非零下标, 计数), 新片段, 当前状态)"""
+        samples = self.drain_holds()
+        counts = LatencyHistogram.bucket_counts(samples) if samples else np.zeros(0, dtype=np.int64)
+        nonzero = np.flatnonzero(counts)
+        new = min(self.segment_count - self.reported_segments, len(self.segments))
+        segments = list(self.segments)[len(self.segments) - new:]
+        self.reported_segments = self.segment_count
+        return dict(self.blocked_ns), self.acquisitions, (nonzero, counts[nonzero]), segments, self.current
+
+    def apply(self, report):
+        """合并工作进程 report() 的结果"""
+        self.blocked_ns, self.acquisitions, (nonzero, counts), segments, self.current = report
+        if len(nonzero):
+            if self.hold_counts is None:
+                self.hold_counts = np.zeros(LatencyHistogram.SIZE, dtype=np.int64)
+            self.hold_counts[nonzero] += counts
+        for segment in segments:
+            self.add_segment(*segment)
+
+
+def produce_one(name, item, sems, ring, stats, running, log):
+    """生产者的一次完整流程 P(empty) → P(mutex) → 写入 → V(mutex) → V(full)，停止时返回False
+
+    ring 上的计数器在P之后、V之前调整，显示值不会低于0。
+    """
+    empty, full, mutex = sems
+    # P(empty)：申请空缓冲区（停止时不再无限等待）
+    if not stats.acquire(empty, "empty", running):
+        return False
+    log(f"{name}P(empty) → empty={ring.adjust('empty', -1)}", "P")
+
+    # P(mutex)：申请互斥锁
+    if not stats.acquire(mutex, "mutex", running):
+        ring.adjust("empty", 1)
+        empty.release()
+        return False
+    held = time.perf_counter_ns()
+    log(f"{name}P(mutex) → mutex={ring.adjust('mutex', -1)}", "P")
+
+    # 写入缓冲区
+    slot = ring.put(item)
+    log(f"{name}写入缓冲区[{slot}]：{ring.label(item)}", "black")
+
+    # V(mutex)：释放互斥锁
+    mutex_val = ring.adjust("mutex", 1)
+    mutex.release()
+    stats.held(held, time.perf_counter_ns())
+    log(f"{name}V(mutex) → mutex={mutex_val}", "V")
+
+    # V(full)：释放满缓冲区
+    full_val = ring.adjust("full", 1)
+    full.release()
+    log(f"{name}V(full) → full={full_val}", "V")
+    return True
+
+
+def consume_one(name, sems, ring, stats, running, log):
+    """消费者的一次完整流程 P(full) → P(mutex) → 读取 → V(mutex) → V(empty)，停止时返回False"""
+    empty, full, mutex = sems
+    # P(full)：申请满缓冲区（停止时不再无限等待）
+    if not stats.acquire(full, "full", running):
+        return False
+    log(f"{name}P(full) → full={ring.adjust('full', -1)}", "P")
+
+    # P(mutex)：申请互斥锁
+    if not stats.acquire(mutex, "mutex", running):
+        ring.adjust("full", 1)
+        full.release()
+        return False
+    held = time.perf_counter_ns()
+    log(f"{name}P(mutex) → mutex={ring.adjust('mutex', -1)}", "P")
+
+    # 从缓冲区读取数据
+    slot, item = ring.get()
+    log(f"{name}读取缓冲区[{slot}]：{ring.label(item)}", "black")
+
+    # V(mutex)：释放互斥锁
+    mutex_val = ring.adjust("mutex", 1)
+    mutex.release()
+    stats.held(held, time.perf_counter_ns())
+    log(f"{name}V(mutex) → mutex={mutex_val}", "V")
+
+    # V(empty)：释放空缓冲区
+    empty_val = ring.adjust("empty", 1)
+    empty.release()
+    log(f"{name}V(empty) → empty={empty_val}", "V")
+    return True
+
+
+# ======================== 基准测试 ========================
+DEFAULT_CONFIGS = ((1, 1), (4, 4))   # (生产者数, 消费者数)
+DEFAULT_BUFFER_SIZE = 5
+DEFAULT_ITEMS = 100000
+
+
+def run_case(kind, producers, consumers, size=DEFAULT_BUFFER_SIZE, items=DEFAULT_ITEMS):
+    """运行一个用例，返回结果行
+
+    共写入 items 条（按生产者均分）；生产者全部结束后放入 consumers 个 None 作结束标记。
+    """
+    if producers < 1 or consumers < 1:
+        raise ValueError(f"生产者和消费者数须至少为1：{producers}x{consumers}")
+    if size < 1:
+        raise ValueError(f"缓冲区大小须至少为1：{size}")
+    buf = make_buffer(kind, size)
+    quota = [items // producers + (i < items % producers) for i in range(producers)]
+    latencies = [[] for _ in range(consumers)]
+
+    def produce(n):
+        put, clock = buf.put, time.perf_counter_ns
+        for _ in range(n):
+            put(clock())
+
+    def consume(out):
+        get, clock, append = buf.get, time.perf_counter_ns, out.append
+        while True:
+            item = get()
+            if item is None:
+                break
+            append(clock() - item)
+
+    producer_threads = [threading.Thread(target=produce, args=(n,), daemon=True) for n in quota]
+    consumer_threads = [threading.Thread(target=consume, args=(out,), daemon=True) for out in latencies]
+    start = time.perf_counter()
+    for t in consumer_threads + producer_threads:
+        t.start()
+    for t in producer_threads:
+        t.join()
+    for _ in consumer_threads:
+        buf.put(None)
+    for t in consumer_threads:
+        t.join()
+    seconds = time.perf_counter() - start
+
+    hist = LatencyHistogram()
+    for out in latencies:
+        hist.record(np.asarray(out, dtype=np.int64))
+    p50, p99 = hist.percentiles((50, 99)) / 1000
+    return dict(primitive=kind, producers=producers, consumers=consumers, buffer_size=size,
+                items=items, seconds=seconds, ops_per_sec=items / seconds, p50_us=p50, p99_us=p99)
+
+
+def run_benchmark(primitives=PRIMITIVES, configs=DEFAULT_CONFIGS, size=DEFAULT_BUFFER_SIZE,
+                  items=DEFAULT_ITEMS, progress=None, should_stop=None):
+    """依次运行每种同步方式 × 每种线程配置，返回结果行列表
+
+    progress(行) 在每个用例完成时回调；should_stop() 为True时在当前用例结束后停止。
+    """
+    rows = []
+    for kind in primitives:
+        for producers, consumers in configs:
+            if should_stop is not None and should_stop():
+                return rows
+            row = run_case(kind, producers, consumers, size, items)
+            rows.append(row)
+            if progress is not None:
+                progress(row)
+    return rows
+
+
+def cheapest(rows, candidates=SEMAPHORE_PRIMITIVES):
+    """candidates 中各配置吞吐量几何平均最高者"""
+    scores = {}
+    for r in rows:
+        if r["primitive"] in candidates:
+            scores.setdefault(r["primitive"], []).append(np.log(r["ops_per_sec"]))
+    return max(scores, key=lambda kind: np.mean(scores[kind])) if scores else None
+
+
+def format_benchmark_table(rows):
+    """基准结果转制表符分隔的文本表格"""
+    lines = ["同步方式\t生产者\t消费者\t缓冲区\t次/秒\tP50延迟µs\tP99延迟µs"]
+    for r in rows:
+        lines.append(
+            f"{PRIMITIVE_NAMES[r['primitive']]}\t{r['producers']}\t{r['consumers']}\t{r['buffer_size']}\t"
+            f"{r['ops_per_sec']:.0f}\t{r['p50_us']:.1f}\t{r['p99_us']:.1f}"
+        )
+    return "\n".join(lines)
+
+
+# ======================== 进程模式：工作进程 + 共享内存环形缓冲区 ========================
+ROLE_NAMES = {"producer": "生产者", "consumer": "消费者"}
+REPORT_INTERVAL = 0.1  # 工作进程汇报间隔（秒）
+REPORT_LOGS = 50       # 每次汇报最多附带的日志条数，更早的只计数
+RING_HEADER = 8        # 头部int64字段数
+_IN, _OUT, _EMPTY, _FULL, _MUTEX, _SEM_VERSION, _BUFFER_VERSION = range(7)
+_COUNTERS = {"empty": _EMPTY, "full": _FULL, "mutex": _MUTEX}
+
+
+def item_code(index, count):
+    """数据编号：生产者序号(高32位) | 第几个(低32位)，0表示空槽"""
+    return index << 32 | count
+
+
+class ShmRingBuffer:
+    """跨进程共享的有界环形缓冲区（shared_memory），接口与线程模式的环形缓冲区一致
+
+    头部为 int64 计数器：读写下标、empty/full/mutex 显示值、两个版本号；其后 size 个 int64 槽位
+    存放数据编号（item_code，0为空）。槽位与读写下标只在持有mutex信号量时修改；计数器的增减与
+    snapshot() 的读取在 lock（multiprocessing.Lock）内完成。父进程创建并负责 release()，
+    子进程按名称挂接（与父进程共用资源跟踪器，不重复注册）。
+    """
+
+    def __init__(self, size, lock, name=None):
+        self.size = size
+        self.lock = lock
+        # 记录创建进程号：fork 出的子进程继承同一对象，只有创建进程才unlink
+        self.owner_pid = os.getpid() if name is None else None
+        nbytes = (RING_HEADER + size) * 8
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+        words = np.ndarray(RING_HEADER + size, dtype=np.int64, buffer=self.shm.buf)
+        self.header, self.slots = words[:RING_HEADER], words[RING_HEADER:]
+        if name is None:
+            words[:] = 0
+            self.header[_EMPTY], self.header[_MUTEX] = size, 1
+
+    def __getstate__(self):
+        return self.size, self.lock, self.name
+
+    def __setstate__(self, state):
+        size, lock, name = state
+        self.__init__(size, lock, name)
+
+    def adjust(self, which, delta):
+        """跟踪一次P/V操作，返回信号量的新值"""
+        with self.lock:
+            self.header[_COUNTERS[which]] += delta
+            self.header[_SEM_VERSION] += 1
+            return int(self.header[_COUNTERS[which]])
+
+    def put(self, item):
+        """写入下一个空槽位（调用方持有mutex），返回槽位下标"""
+        index = int(self.header[_IN])
+        self.slots[index] = item
+        self.header[_IN] = (index + 1) % self.size
+        self.header[_BUFFER_VERSION] += 1
+        return index
+
+    def get(self):
+        """取出下一个满槽位（调用方持有mutex），返回 (槽位下标, 数据编号)"""
+        index = int(self.header[_OUT])
+        item = int(self.slots[index])
+        self.slots[index] = 0
+        self.header[_OUT] = (index + 1) % self.size
+        self.header[_BUFFER_VERSION] += 1
+        return index, item
+
+    @staticmethod
+    def label(item):
+        return f"Item-{item >> 32}.{item & 0xFFFFFFFF}"
+
+    def snapshot(self):
+        """取样：(信号量版本, (empty, full, mutex), 缓冲区版本, 缓冲区副本, 日志, 丢弃条数)；
+
+        日志经状态队列汇报（丢弃条数随汇报给出），这里为空
+        """
+        with self.lock:
+            sem_version = int(self.header[_SEM_VERSION])
+            sems = tuple(int(v) for v in self.header[_EMPTY:_MUTEX + 1])
+        buffer_version = int(self.header[_BUFFER_VERSION])
+        buffer = [self.label(v) if v else None for v in self.slots.tolist()]
+        return sem_version, sems, buffer_version, buffer, [], 0
+
+    def close(self):
+        """释放视图后关闭；创建方同时unlink"""
+        self.header = self.slots = None
+        self.shm.close()
+        if self.owner_pid == os.getpid():
+            self.shm.unlink()
+
+
+def pace_sleep(pace, running):
+    """休眠一个模拟秒：pace.value 为倍速（0为不限速），分段睡眠以便及时响应停止与倍速调整"""
+    remaining = 1.0
+    while remaining > 0 and running():
+        rate = pace.value
+        if rate <= 0:
+            return
+        step = min(remaining / rate, 0.05)
+        time.sleep(step)
+        remaining -= step * rate
+
+
+class StartGate:
+    """进程模式的就绪栅栏：全部工作进程启动完毕后同时开始，并记录开始时刻
+
+    spawn 子进程要重新导入主模块（Qt/Matplotlib）才进入工作循环，耗时可达数秒；
+    平均吞吐量从 started 起算，不计启动时间。停止时 abort() 放行仍在等待的进程。
+    """
+
+    def __init__(self, parties):
+        self.barrier = multiprocessing.Barrier(parties)
+        self.started = multiprocessing.Value("d", 0.0)
+
+    def wait(self):
+        try:
+            if self.barrier.wait() == 0:
+                self.started.value = time.perf_counter()
+        except threading.BrokenBarrierError:
+            pass  # 已停止
+
+    def abort(self):
+        self.barrier.abort()
+
+    def elapsed(self, until):
+        """开始至 until（perf_counter 时刻）的秒数；尚未全部就绪时为None"""
+        started = self.started.value
+        return until - started if started else None
+
+
+def worker_main(role, index, sems, ring, pace, stop, status, gate):
+    """生产者/消费者进程：在 gate 处等齐后执行与线程模式相同的P/V流程，直到 stop 置位
+
+    每 REPORT_INTERVAL 秒（阻塞等待期间也照常）向 status 汇报一次：
+      (角色, 序号, 完成次数, WorkerStats.report(), 新日志列表, 省略日志数)
+    """
+    name = ROLE_NAMES[role] + str(index)
+    stats = WorkerStats(name)
+    logs = deque(maxlen=REPORT_LOGS)
+    dropped = ops = count = 0
+    last_report = time.perf_counter()
+
+    def log(text, color="black"):
+        nonlocal dropped
+        if len(logs) == logs.maxlen:
+            dropped += 1
+        logs.append((text, color))
+
+    def send_report():
+        nonlocal dropped, last_report
+        status.put((role, index, ops, stats.report(), list(logs), dropped))
+        logs.clear()
+        dropped = 0
+        last_report = time.perf_counter()
+
+    def running():
+        if time.perf_counter() - last_report >= REPORT_INTERVAL:
+            send_report()
+        return not stop.is_set()
+
+    try:
+        gate.wait()
+        while running():
+            if role == "producer":
+                count += 1
+                done = produce_one(name, item_code(index, count), sems, ring, stats, running, log)
+            else:
+                done = consume_one(name, sems, ring, stats, running, log)
+            if not done:
+                break
+            ops += 1
+            stats.idle(lambda: pace_sleep(pace, running))
+    finally:
+        send_report()
+        ring.close()
+
+
+# ======================== 命令行：无界面基准测试 ========================
+def main(argv=None):
+    import argparse
+    import csv
+
+    def config(text):
+        try:
+            producers, consumers = (int(n) for n in text.lower().split("x"))
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"线程配置应形如 生产者数x消费者数：{text}") from None
+        if producers < 1 or consumers < 1:
+            raise argparse.ArgumentTypeError(f"生产者和消费者数须至少为1：{text}")
+        return producers, consumers
+
+    def positive(text):
+        value = int(text)
+        if value < 1:
+            raise argparse.ArgumentTypeError(f"须至少为1：{value}")
+        return value
+
+    parser = argparse.ArgumentParser(description="有界缓冲区同步原语基准测试（信号量/条件变量/队列/deque）")
+    parser.add_argument("--primitives", nargs="+", default=list(PRIMITIVES), choices=PRIMITIVES)
+    parser.add_argument("--configs", nargs="+", type=config, default=list(DEFAULT_CONFIGS),
+                        help="线程配置，形如 生产者数x消费者数")
+    parser.add_argument("--buffer-size", type=positive, default=DEFAULT_BUFFER_SIZE)
+    parser.add_argument("--items", type=positive, default=DEFAULT_ITEMS, help="每个用例传递的条数")
+    parser.add_argument("--csv", help="把结果写入该CSV文件")
+    args = parser.parse_args(argv)
+
+    rows = run_benchmark(args.primitives, args.configs, args.buffer_size, args.items)
+    print(format_benchmark_table(rows))
+    fastest = cheapest(rows)
+    if fastest is not None:
+        print(f"最快的信号量实现：{PRIMITIVE_NAMES[fastest]}")
+    if args.csv and rows:
+        with open(args.csv, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    main()